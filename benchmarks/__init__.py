@@ -0,0 +1,5 @@
+"""
+Educational Platform - Benchmarks Package
+"""
+
+# This file makes the benchmarks directory a Python package
@@ -0,0 +1,109 @@
+"""
+Benchmark: building lesson cards with per-widget stylesheets (the old
+LessonCard behaviour) versus the shared application stylesheet.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.card_creation --cards 500
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout, QFrame
+from src.models.database import LessonSummary
+from src.utils.theme import APP_STYLESHEET, DASHBOARD_STYLE
+from src.views.lesson_card import LessonCard
+
+# Sheets LessonCard used to install on every card and its image container
+LEGACY_CARD_STYLE = """
+    QFrame {
+        background-color: #313244;
+        border-radius: 10px;
+    }
+    QFrame:hover {
+        background-color: #45475a;
+    }
+    QLabel {
+        color: #cdd6f4;
+    }
+    QLabel#titleLabel {
+        color: #89b4fa;
+        font-weight: bold;
+    }
+"""
+LEGACY_IMAGE_STYLE = """
+    QFrame {
+        background-color: #1e1e2e;
+        border-top-left-radius: 10px;
+        border-top-right-radius: 10px;
+        border-bottom-left-radius: 0px;
+        border-bottom-right-radius: 0px;
+    }
+"""
+
+
+def make_lessons(count: int):
+    return [LessonSummary(
+        id=i,
+        title=f"Lesson {i}",
+        title_ar=f"الدرس {i}",
+        summary="Lorem ipsum dolor sit amet. " * 3,
+        summary_ar="نص تجريبي للوصف. " * 3,
+        image_path="",
+        created_by=1,
+        creator_name="teacher",
+        created_at=datetime.now()
+    ) for i in range(count)]
+
+
+def build_cards(app: QApplication, lessons, per_widget_sheets: bool) -> float:
+    """Create, lay out and polish one card per lesson; return elapsed seconds."""
+    window = QMainWindow()
+    window.setObjectName("dashboardWindow")
+    if per_widget_sheets:
+        # Dashboards also used to carry their own copy of the theme
+        window.setStyleSheet(DASHBOARD_STYLE)
+    container = QWidget()
+    grid = QGridLayout(container)
+    window.setCentralWidget(container)
+    window.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    for i, lesson in enumerate(lessons):
+        card = LessonCard(lesson, "en")
+        if per_widget_sheets:
+            card.setStyleSheet(LEGACY_CARD_STYLE)
+            card.findChild(QFrame, "lessonCardImage").setStyleSheet(LEGACY_IMAGE_STYLE)
+        grid.addWidget(card, i // 3, i % 3)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setStyle('Fusion')
+    lessons = make_lessons(args.cards)
+
+    results = {}
+    for label, per_widget in (("per-widget sheets", True), ("application sheet", False)):
+        app.setStyleSheet("" if per_widget else APP_STYLESHEET)
+        results[label] = min(build_cards(app, lessons, per_widget) for _ in range(args.repeat))
+
+    for label, elapsed in results.items():
+        print(f"{label:>18}: {elapsed * 1000:8.1f} ms for {args.cards} cards "
+              f"({elapsed / args.cards * 1e6:.0f} us/card)")
+
+
+if __name__ == '__main__':
+    main()
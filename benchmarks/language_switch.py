@@ -0,0 +1,122 @@
+"""
+Benchmark: switching the UI language on a teacher dashboard with many cards.
+
+Compares the old approach (walk findChildren() and compare visible texts)
+with the translation catalog, which only touches registered widgets, then
+checks through Database.query_count that a full Dashboard.update_language
+round trip runs no queries and rebuilds no cards.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.language_switch --cards 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from PyQt6.QtWidgets import QApplication, QLabel, QPushButton
+from src.models.database import Database, Lesson
+from src.utils.futures import wait_for_results
+from src.utils.navigation import NavigationManager
+from src.utils.theme import apply_theme
+
+LEGACY_LABELS = {"Available Lessons": "الدروس المتاحة"}
+LEGACY_BUTTONS = {"Edit Lesson": "تعديل الدرس", "Add Lesson": "إضافة درس", "Logout": "تسجيل الخروج"}
+
+
+def create_database(path: str, cards: int):
+    db = Database(path)
+    teacher = db.add_user("bench_teacher", "Teacher123!", "teacher", "en")
+    for i in range(cards):
+        db.add_lesson(Lesson(
+            id=0,
+            title=f"Lesson {i}",
+            title_ar=f"الدرس {i}",
+            description="Lorem ipsum dolor sit amet. " * 8,
+            description_ar="نص تجريبي للوصف. " * 8,
+            image_path="",
+            video_path="",
+            created_by=teacher.id,
+            created_at=datetime.now()
+        ))
+    return db, teacher
+
+
+def legacy_switch(window, to_arabic: bool):
+    """The findChildren text scan the dashboards used before the catalog."""
+    labels = LEGACY_LABELS if to_arabic else {v: k for k, v in LEGACY_LABELS.items()}
+    buttons = LEGACY_BUTTONS if to_arabic else {v: k for k, v in LEGACY_BUTTONS.items()}
+    for widget in window.findChildren(QLabel):
+        text = widget.text()
+        if text in labels:
+            widget.setText(labels[text])
+    for button in window.findChildren(QPushButton):
+        text = button.text()
+        if text in buttons:
+            button.setText(buttons[text])
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setStyle('Fusion')
+    apply_theme(app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, teacher = create_database(os.path.join(tmp, "bench.db"), args.cards)
+        NavigationManager._db = db
+        # Import here so the dashboard picks up the benchmark database
+        from src.views.teacher_dashboard import TeacherDashboard
+        window = TeacherDashboard(db, teacher)
+        window.show()
+        wait_for_results()
+        app.processEvents()
+
+        def legacy_round_trip():
+            legacy_switch(window, True)
+            legacy_switch(window, False)
+
+        def catalog_round_trip():
+            window.translations.set_language("ar")
+            window.translations.set_language("en")
+
+        legacy = timed(legacy_round_trip, args.repeat) / 2
+        catalog = timed(catalog_round_trip, args.repeat) / 2
+
+        print(f"widgets in window: {len(window.findChildren(QLabel)) + len(window.findChildren(QPushButton))}, "
+              f"registered: {len(window.translations)}")
+        print(f"  findChildren scan: {legacy * 1000:8.2f} ms per switch")
+        print(f"translation catalog: {catalog * 1000:8.2f} ms per switch")
+
+        cards_before = list(window.lesson_cards.values())
+        queries_before = db.query_count
+        full = timed(lambda: (window.update_language("العربية"), window.update_language("English")), args.repeat) / 2
+        queries = db.query_count - queries_before
+        rebuilt = sum(1 for old, new in zip(cards_before, window.lesson_cards.values()) if old is not new)
+        print(f"    update_language: {full * 1000:8.2f} ms per switch "
+              f"({queries} queries, {rebuilt} cards rebuilt)")
+
+        # What update_language used to do on top of the text scan
+        reload = timed(lambda: (window.load_lessons(), wait_for_results()), 1)
+        print(f"  reload and rebuild: {reload * 1000:8.2f} ms (previous update_language behaviour)")
+        window.close()
+        if queries or rebuilt:
+            sys.exit("language switch should not query the database or rebuild cards")
+
+
+if __name__ == '__main__':
+    main()
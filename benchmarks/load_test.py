@@ -0,0 +1,273 @@
+"""
+Benchmark: many students and teachers using the platform at once.
+
+Each simulated user logs in (verify_user), browses pages of lesson
+summaries, opens lessons (get_lesson) and, for teachers, saves an edit to
+one of their own lessons (update_lesson), over and over until the time is
+up. Users run either directly against Database, from threads in this
+process (or in several processes sharing the file, like desktop instances
+in a lab), or through RemoteDatabase against a `main.py --serve` catalog
+server. Reports throughput, latency percentiles per operation and errors,
+with "database is locked" failures counted separately.
+
+Run from the repository root:
+    python -m benchmarks.load_test --students 40 --teachers 4 --duration 20
+    python -m benchmarks.load_test --processes 4
+    python -m benchmarks.load_test --server
+    python -m benchmarks.load_test --server-url http://127.0.0.1:8765 --skip-seed
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from src.models.database import Database, Lesson, User
+
+OPERATIONS = ("login", "browse", "open", "edit")
+
+# (operation -> latencies in ms, operation -> errors, lock errors)
+Results = Tuple[Dict[str, List[float]], Dict[str, int], int]
+
+
+class LockErrorCounter(io.TextIOBase):
+    """stdout stand-in counting the "database is locked" errors Database prints."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        if "database is locked" in text:
+            with self._lock:
+                self.count += 1
+            return len(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def seed_user(db: Database, username: str, role: str, language: str) -> User:
+    """Add a load-test user, or return the one a previous run added."""
+    return db.add_user(username, username, role, language) or db.get_user_by_username(username)
+
+
+def seed_database(path: str, students: int, teachers: int, lessons: int):
+    db = Database(path)
+    teacher_ids = [seed_user(db, f"teacher{i}", "teacher", "en").id for i in range(teachers)]
+    for i in range(students):
+        seed_user(db, f"student{i}", "student", "ar")
+    futures = [db.queue_add_lesson(Lesson(
+        id=0,
+        title=f"Lesson {i}",
+        title_ar=f"الدرس {i}",
+        description="Lorem ipsum dolor sit amet. " * 8,
+        description_ar="نص تجريبي للوصف. " * 8,
+        image_path="",
+        video_path="",
+        created_by=teacher_ids[i % teachers],
+        created_at=None,
+    )) for i in range(lessons)]
+    for future in futures:
+        future.result()
+    db.close()
+
+
+def connect(target: str, slow_query_ms: Optional[float]):
+    """A Database for a file path, or a RemoteDatabase for a server URL."""
+    if target.startswith("http://"):
+        from src.models.remote_database import RemoteDatabase
+        return RemoteDatabase(target)
+    db = Database(target)
+    db.instrumentation.slow_threshold_ms = slow_query_ms
+    return db
+
+
+def simulate_user(db, username: str, is_teacher: bool, deadline: float, page_size: int,
+                  pages: int, opens: int, latencies: Dict[str, List[float]], errors: Dict[str, int]):
+    rng = random.Random(username)
+
+    def timed(operation: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            errors[operation] += 1
+            return None
+        latencies[operation].append((time.perf_counter() - start) * 1000)
+        if result is None or result is False:
+            errors[operation] += 1
+        return result
+
+    while time.perf_counter() < deadline:
+        user = timed("login", db.verify_user, username, username)
+        if user is None:
+            continue
+        seen = []
+        for page in range(pages):
+            summaries = timed("browse", db.get_lesson_summaries, limit=page_size, offset=page * page_size)
+            if not summaries:
+                break
+            seen.extend(summary.id for summary in summaries)
+        for lesson_id in rng.sample(seen, min(opens, len(seen))):
+            timed("open", db.get_lesson, lesson_id)
+        if is_teacher:
+            own = db.get_lesson_summaries(teacher_id=user.id, limit=page_size)
+            if own:
+                lesson = db.get_lesson(rng.choice(own).id)
+                if lesson:
+                    lesson.description = f"Edited by {username} at {time.time():.3f}. " + lesson.description[:200]
+                    timed("edit", db.update_lesson, lesson)
+
+
+def run_users(target: str, users: List[Tuple[str, bool]], duration: float, page_size: int,
+              pages: int, opens: int, shared: bool, slow_query_ms: Optional[float]) -> Results:
+    """Run users on threads; shared=True gives them one Database, as inside one app instance."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    counter = LockErrorCounter(sys.stdout)
+    # A RemoteDatabase acts as the user who last logged in on it, so it is never shared
+    shared = shared and not target.startswith("http://")
+    shared_db = connect(target, slow_query_ms) if shared else None
+    databases = [shared_db or connect(target, slow_query_ms) for _ in users]
+    deadline = time.perf_counter() + duration
+    with contextlib.redirect_stdout(counter):
+        threads = [threading.Thread(target=simulate_user, args=(
+            db, username, is_teacher, deadline, page_size, pages, opens, latencies, errors))
+            for db, (username, is_teacher) in zip(databases, users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for db in {id(db): db for db in databases}.values():
+            db.close()
+    return dict(latencies), dict(errors), counter.count
+
+
+def run_worker(args: tuple) -> Results:
+    return run_users(*args)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def report(results: List[Results], elapsed: float):
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock_errors = 0
+    for worker_latencies, worker_errors, worker_locks in results:
+        for operation, values in worker_latencies.items():
+            latencies[operation].extend(values)
+        for operation, count in worker_errors.items():
+            errors[operation] += count
+        lock_errors += worker_locks
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} operations in {elapsed:.1f} s: {total / elapsed:.0f} ops/s")
+    print(f"{'operation':>10} {'count':>8} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for operation in OPERATIONS:
+        values = sorted(latencies.get(operation, []))
+        if not values:
+            continue
+        print(f"{operation:>10} {len(values):>8} {len(values) / elapsed:>8.0f} "
+              f"{percentile(values, 0.5):>8.2f} {percentile(values, 0.95):>8.2f} "
+              f"{percentile(values, 0.99):>8.2f} {values[-1]:>8.2f} {errors.get(operation, 0):>7}")
+    print(f"'database is locked' errors: {lock_errors}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str) -> Tuple[subprocess.Popen, str]:
+    """Run `main.py --serve` on db_path and wait until it accepts connections."""
+    port = free_port()
+    main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    process = subprocess.Popen([sys.executable, main, "--serve", f"127.0.0.1:{port}", "--db", db_path],
+                               stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("catalog server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--teachers", type=int, default=4)
+    parser.add_argument("--lessons", type=int, default=500, help="lessons to seed")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--page-size", type=int, default=24)
+    parser.add_argument("--pages", type=int, default=3, help="summary pages browsed per session")
+    parser.add_argument("--opens", type=int, default=3, help="lessons opened per session")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="spread users over this many processes, each with its own Database")
+    parser.add_argument("--shared", action="store_true",
+                        help="users in a process share one Database instead of one each (not with a server)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", help="use this existing database file instead of a seeded temporary one; "
+                                     "it is never seeded, so it needs users teacherN/studentN (password = username)")
+    target.add_argument("--server", action="store_true", help="start a catalog server and go through it")
+    target.add_argument("--server-url", help="go through an already running catalog server")
+    parser.add_argument("--slow-query-ms", type=float, default=None,
+                        help="log direct-mode statements slower than this (default: never)")
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="the target already has users teacherN/studentN (password = username); "
+                             "implied by --db and --server-url")
+    args = parser.parse_args()
+
+    users = [(f"teacher{i}", True) for i in range(args.teachers)]
+    users += [(f"student{i}", False) for i in range(args.students)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "load.db")
+        # Fake users and lessons only ever go into the temporary database
+        if not args.skip_seed and not args.server_url and not args.db:
+            seed_database(db_path, args.students, args.teachers, args.lessons)
+
+        server: Optional[subprocess.Popen] = None
+        target = args.server_url or db_path
+        if args.server:
+            server, target = start_server(db_path)
+        mode = "server " + target if target.startswith("http://") else f"{args.processes} process(es) on {target}"
+        print(f"{args.students} students, {args.teachers} teachers for {args.duration:.0f} s, {mode}")
+
+        try:
+            # Round-robin, so every process gets a mix of teachers and students
+            shares = [users[i::args.processes] for i in range(args.processes)]
+            jobs = [(target, share, args.duration, args.page_size, args.pages, args.opens, args.shared,
+                     args.slow_query_ms)
+                    for share in shares if share]
+            start = time.perf_counter()
+            if len(jobs) == 1:
+                results = [run_worker(jobs[0])]
+            else:
+                with multiprocessing.Pool(len(jobs)) as pool:
+                    results = pool.map(run_worker, jobs)
+            elapsed = time.perf_counter() - start
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        report(results, elapsed)
+
+
+if __name__ == '__main__':
+    main()
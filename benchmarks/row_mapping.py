@@ -0,0 +1,100 @@
+"""
+Benchmark: mapping lesson rows to records.
+
+Compares the previous get_lessons implementation (plain dataclass, SELECT *,
+nine row lookups and strptime per row) with the slotted records and row
+factories in src.models.database, reporting time and memory per 100k rows.
+
+Run from the repository root:
+    python -m benchmarks.row_mapping --rows 100000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from src.models.database import Database
+
+
+@dataclass
+class LegacyLesson:
+    id: int
+    title: str
+    title_ar: str
+    description: str
+    description_ar: str
+    image_path: str
+    video_path: str
+    created_by: int
+    created_at: datetime
+
+
+def legacy_get_lessons(db_path: str):
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM lessons ORDER BY created_at DESC")
+        return [LegacyLesson(
+            id=row[0],
+            title=row[1],
+            title_ar=row[2],
+            description=row[3],
+            description_ar=row[4],
+            image_path=row[5],
+            video_path=row[6],
+            created_by=row[7],
+            created_at=datetime.strptime(row[8], "%Y-%m-%d %H:%M:%S") if row[8] else None
+        ) for row in cursor.fetchall()]
+
+
+def populate(db: Database, rows: int):
+    start = datetime(2024, 1, 1)
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany(
+            """INSERT INTO lessons
+            (title, title_ar, description, description_ar, image_path, video_path, created_by, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            ((f"Lesson {i}", f"الدرس {i}", "Description " * 10, "وصف " * 10,
+              f"media/images/lesson_{i}.jpg", f"media/videos/lesson_{i}.mp4", 1,
+              # Distinct timestamps: the worst case for the parse cache
+              (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S"))
+             for i in range(rows))
+        )
+
+
+def measure(fn):
+    """Return (seconds, bytes allocated and still held by the result)."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        populate(db, args.rows)
+
+        scale = 100_000 / args.rows
+        for label, fn in (("legacy dataclass", lambda: legacy_get_lessons(db.db_path)),
+                          ("slotted + factory", db.get_lessons)):
+            elapsed, retained = measure(fn)
+            print(f"{label:>18}: {elapsed * scale * 1000:8.1f} ms and "
+                  f"{retained * scale / 2**20:7.1f} MiB per 100k rows "
+                  f"({retained / args.rows:.0f} B/row)")
+
+
+if __name__ == '__main__':
+    main()
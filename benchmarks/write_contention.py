@@ -0,0 +1,118 @@
+"""
+Benchmark: concurrent writers and readers against one database file.
+
+Compares the previous write path (a fresh connection and commit per call,
+rollback journal) with Database's single-writer queue (WAL, one connection,
+bursts grouped into shared transactions), counting "database is locked"
+errors and the number of transactions each needed.
+
+Run from the repository root:
+    python -m benchmarks.write_contention --writers 8 --writes 200 --readers 4
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from src.models.database import Database, Lesson
+
+INSERT = """INSERT INTO lessons
+    (title, title_ar, description, description_ar, image_path, video_path, created_by)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+
+def make_lesson(i: int) -> Lesson:
+    return Lesson(0, f"Lesson {i}", f"الدرس {i}", "Lorem ipsum. " * 20, "نص تجريبي. " * 20,
+                  "", "", 1, None)
+
+
+def run_readers(db: Database, count: int, stop: threading.Event, errors: list):
+    def read():
+        while not stop.is_set():
+            try:
+                db.get_lesson_summaries()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+    threads = [threading.Thread(target=read) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def legacy_writes(path: str, writers: int, writes: int, timeout: float, errors: list):
+    """What add_lesson used to do: connect, insert, commit, per call."""
+    def write(worker: int):
+        for i in range(writes):
+            lesson = make_lesson(worker * writes + i)
+            try:
+                with sqlite3.connect(path, timeout=timeout) as conn:
+                    conn.execute(INSERT, (lesson.title, lesson.title_ar, lesson.description,
+                                          lesson.description_ar, "", "", 1))
+                    conn.commit()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def queued_writes(db: Database, writers: int, writes: int):
+    """Writers hand their inserts to the queue and wait for all results."""
+    def write(worker: int):
+        wait([db.queue_add_lesson(make_lesson(worker * writes + i)) for i in range(writes)])
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def measure(label: str, db: Database, readers: int, run) -> None:
+    stop = threading.Event()
+    read_errors, write_errors = [], []
+    reader_threads = run_readers(db, readers, stop, read_errors)
+    start = time.perf_counter()
+    run(write_errors)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    stored = len(db.get_lesson_summaries())
+    print(f"{label:>16}: {elapsed:7.2f} s, {stored} rows stored, "
+          f"{len(write_errors)} locked writes, {len(read_errors)} locked reads")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="writes per writer")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=0.5,
+                        help="lock timeout in seconds for the legacy connections")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Legacy: same schema, but back in rollback-journal mode
+        legacy_path = os.path.join(tmp, "legacy.db")
+        legacy_db = Database(legacy_path)
+        legacy_db.close()
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        measure("per-call commit", legacy_db, args.readers,
+                lambda errors: legacy_writes(legacy_path, args.writers, args.writes, args.timeout, errors))
+
+        db = Database(os.path.join(tmp, "queued.db"))
+        before = db.writer.transactions
+        measure("write queue", db, args.readers,
+                lambda errors: queued_writes(db, args.writers, args.writes))
+        total = args.writers * args.writes
+        print(f"{'':>16}  {total} writes in {db.writer.transactions - before} transactions")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
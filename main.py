@@ -1,20 +1,94 @@
+import argparse
 import sys
 from PyQt6.QtWidgets import QApplication
 from src.utils.navigation import NavigationManager
+from src.utils.theme import apply_theme
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Educational Platform")
+    parser.add_argument("--query-stats", metavar="PATH",
+                        help="write per-method database timings and slow queries to PATH as JSON on exit")
+    parser.add_argument("--slow-query-ms", type=float, metavar="MS",
+                        help="log statements slower than MS milliseconds with their query plan")
+    parser.add_argument("--db", default="edu_platform.db", metavar="PATH", help="database file")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", metavar="[HOST:]PORT",
+                      help="run headless, serving the database to other instances over HTTP")
+    mode.add_argument("--server", metavar="URL",
+                      help="use the catalog server at URL instead of opening the database file")
+    # Anything else (e.g. -platform) is left for Qt
+    return parser.parse_known_args()
+
+def serve(args):
+    # Import here: the GUI never needs the server
+    from src.models.api_server import CatalogServer
+    from src.models.database import Database
+    from src.utils.file_manager import FileManager
+    from src.utils.media_info import backfill_media_info
+    from src.utils.related_lessons import RelatedLessonsIndex
+    from src.utils.view_aggregator import ViewAggregator
+
+    host, _, port = args.serve.rpartition(":")
+    if host not in ("", "127.0.0.1", "localhost", "::1"):
+        print("Warning: the catalog API is plain HTTP; passwords and session tokens "
+              "are visible to anyone on this network")
+    db = Database(args.db)
+    if args.slow_query_ms is not None:
+        db.instrumentation.slow_threshold_ms = args.slow_query_ms
+    FileManager().submit_probe(backfill_media_info, db)
+    aggregator = ViewAggregator(db)
+    aggregator.start()
+    related = RelatedLessonsIndex(db)
+    related.start()
+    CatalogServer(db, host or "127.0.0.1", int(port)).serve_forever()
+    related.stop()
+    aggregator.stop()
+    db.close()
+    if args.query_stats:
+        db.instrumentation.dump(args.query_stats)
 
 def main():
+    args, qt_args = parse_args()
+    if args.serve:
+        serve(args)
+        return
+
     # Create the application
-    app = QApplication(sys.argv)
-    
+    app = QApplication(sys.argv[:1] + qt_args)
+
     # Set application style
     app.setStyle('Fusion')
-    
+    apply_theme(app)
+
     # Initialize navigation manager and show login window
+    if args.server:
+        from src.models.remote_database import RemoteDatabase
+        NavigationManager.use_database(RemoteDatabase(args.server))
+    else:
+        from src.models.database import Database
+        NavigationManager.use_database(Database(args.db))
     nav_manager = NavigationManager()
+    db = nav_manager.get_database()
+    if args.slow_query_ms is not None and not args.server:
+        db.instrumentation.slow_threshold_ms = args.slow_query_ms
     nav_manager.show_login()
-    
+    if args.server:
+        # Poster frames are extracted from the client's copy of the video,
+        # and listing and updating the lessons needs a teacher's session
+        nav_manager.queue_poster_frames_on_login()
+    else:
+        nav_manager.queue_poster_frames()
+        # serve() runs these three for its clients
+        nav_manager.backfill_media_info()
+        nav_manager.start_view_aggregator()
+        nav_manager.start_related_index()
+    # Let queued database writes finish before the process exits
+    app.aboutToQuit.connect(nav_manager.shutdown)
+    if args.query_stats and not args.server:
+        app.aboutToQuit.connect(lambda: db.instrumentation.dump(args.query_stats))
+
     # Start the application event loop
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,557 @@
+import asyncio
+import json
+import re
+import secrets
+import time
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from src.models.async_database import AsyncDatabase
+from src.models.database import (DUPLICATE_IMAGE_DISTANCE, DUPLICATE_TEXT_THRESHOLD, LESSON_ORDERS, DailyGrowth,
+                                 Database, DeletionResult, DuplicateGroup, Lesson, LessonProgress, LessonSummary,
+                                 LessonViewStats, MediaInfo, PlatformStatistics, TeacherStats, TeacherViewStats,
+                                 User, ViewEvent, parse_timestamp)
+from src.models.response_cache import ResponseCache
+from src.utils.http_server import (MAX_HEADER_BYTES, HttpError, HttpRequest, send_head, send_response,
+                                   serve_connection)
+
+API_PREFIX = "/api"
+DEFAULT_PORT = 8765
+
+# Lesson summaries are served in pages of at most this many rows
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# Catalog responses may be reused, but must be revalidated with the ETag
+CACHE_HEADERS = {**JSON_HEADERS, "Cache-Control": "no-cache"}
+
+# A session token unused for this long, in seconds, has to log in again
+SESSION_TTL = 8 * 3600
+
+# Who may call a route: anyone, any logged-in user, the user whose id is
+# the route's first number (or an admin), teachers and admins, admins only
+PUBLIC, LOGGED_IN, SELF, TEACHER, ADMIN = "public", "logged-in", "self", "teacher", "admin"
+
+@dataclass
+class Session:
+    user_id: int
+    role: str
+    expires: float
+
+def to_json(value: Any) -> Any:
+    """Records (and containers of them) as JSON-ready values.
+
+    Users are sent without their password hash and salt: only the server
+    ever checks passwords.
+    """
+    if isinstance(value, User):
+        return {"id": value.id, "username": value.username, "role": value.role, "language": value.language}
+    if is_dataclass(value):
+        return {f.name: to_json(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (list, tuple, set)):
+        return [to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    return value
+
+def encode(value: Any) -> bytes:
+    return json.dumps(to_json(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def user_from_json(data: Optional[dict]) -> Optional[User]:
+    if not data:
+        return None
+    return User(data["id"], data["username"], "", "", data["role"], data["language"])
+
+def lesson_from_json(data: Optional[dict]) -> Optional[Lesson]:
+    if not data:
+        return None
+    return Lesson(**{**data, "created_at": parse_timestamp(data["created_at"])})
+
+def summary_from_json(data: dict) -> LessonSummary:
+    return LessonSummary(**{**data, "created_at": parse_timestamp(data["created_at"])})
+
+def media_info_from_json(data: Optional[dict]) -> Optional[MediaInfo]:
+    return MediaInfo(**data) if data else None
+
+def deletion_from_json(data: Optional[dict]) -> Optional[DeletionResult]:
+    return DeletionResult(**data) if data else None
+
+def progress_from_json(data: Optional[dict]) -> Optional[LessonProgress]:
+    if not data:
+        return None
+    return LessonProgress(**{**data, "updated_at": parse_timestamp(data.get("updated_at"))})
+
+def statistics_from_json(data: Optional[dict]) -> Optional[PlatformStatistics]:
+    if not data:
+        return None
+    return PlatformStatistics(data["total_users"], data["total_lessons"], data["users_by_role"],
+                              [TeacherStats(**row) for row in data["teachers"]],
+                              [DailyGrowth(**row) for row in data["growth"]])
+
+def view_event_from_json(data: dict) -> ViewEvent:
+    # The server's clock timestamps events
+    return ViewEvent(data["user_id"], data["lesson_id"], data.get("watched_ms", 0))
+
+Handler = Callable[..., Awaitable[Any]]
+
+class CatalogServer:
+    """Serves the Database over a small HTTP/JSON API, for `main.py --serve`.
+
+    One server process owns the SQLite file; desktop clients talk to it
+    through RemoteDatabase instead of opening the file themselves. Reads
+    run on an AsyncDatabase reader pool and writes go through the
+    database's write queue, so the event loop never blocks on SQLite.
+    Every route maps onto an existing Database method; lesson summaries
+    are paginated with limit/offset.
+
+    Lesson GETs are cached: their ETag is the database's catalog_version
+    (plus a per-process epoch), so a client revalidating an unchanged page
+    gets a 304 without any query, and other clients asking for it get the
+    body serialized once. Any committed lesson write bumps the version.
+
+    /api/login answers with a session token, which every other route
+    (except creating a student account) requires as "Authorization:
+    Bearer <token>". Each route names who may call it (see PUBLIC..ADMIN);
+    teachers may only change their own lessons. Traffic is plain HTTP, so
+    tokens and passwords are only as private as the network.
+    """
+
+    def __init__(self, db: Database, host: str = "127.0.0.1", port: int = DEFAULT_PORT, readers: int = 4):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.db_async = AsyncDatabase(db, readers=readers)
+        self.cache = ResponseCache()
+        # A restarted server starts counting versions again; never reuse its ETags
+        self.epoch = secrets.token_hex(4)
+        # token -> Session; lost on restart, so clients log in again
+        self.sessions: Dict[str, Session] = {}
+        self.routes: List[Tuple[str, Pattern, Handler, str]] = [
+            ("POST", r"/login", self.login, PUBLIC),
+            ("POST", r"/logout", self.logout, LOGGED_IN),
+            ("GET", r"/users", self.get_users, ADMIN),
+            # Self-registration; only admins may create other roles
+            ("POST", r"/users", self.add_user, PUBLIC),
+            ("POST", r"/users/delete", self.delete_users, ADMIN),
+            ("GET", r"/users/(\d+)", self.get_user, SELF),
+            ("PUT", r"/users/(\d+)", self.update_user, ADMIN),
+            ("DELETE", r"/users/(\d+)", self.delete_user, ADMIN),
+            ("PUT", r"/users/(\d+)/language", self.update_user_language, SELF),
+            ("GET", r"/users/(\d+)/progress/(\d+)", self.get_progress, SELF),
+            ("GET", r"/users/(\d+)/watched", self.get_watched_lessons, SELF),
+            ("GET", r"/lessons", self.get_lessons, LOGGED_IN),
+            ("POST", r"/lessons", self.add_lesson, TEACHER),
+            ("POST", r"/lessons/delete", self.delete_lessons, TEACHER),
+            ("GET", r"/lessons/without-image", self.get_lessons_without_image, TEACHER),
+            ("GET", r"/lessons/(\d+)", self.get_lesson, LOGGED_IN),
+            ("PUT", r"/lessons/(\d+)", self.update_lesson, TEACHER),
+            ("DELETE", r"/lessons/(\d+)", self.delete_lesson, TEACHER),
+            ("PUT", r"/lessons/(\d+)/image", self.set_poster_image, TEACHER),
+            ("GET", r"/lessons/(\d+)/related", self.get_related_lessons, LOGGED_IN),
+            ("GET", r"/lesson-summaries", self.get_lesson_summaries, LOGGED_IN),
+            ("GET", r"/search", self.search_lessons, LOGGED_IN),
+            ("POST", r"/deletion-preview", self.preview_deletion, TEACHER),
+            ("GET", r"/media-info/unprobed", self.get_unprobed_videos, TEACHER),
+            ("POST", r"/media-info", self.save_media_info, TEACHER),
+            ("POST", r"/progress", self.save_progress, LOGGED_IN),
+            ("POST", r"/view-events", self.log_views, LOGGED_IN),
+            ("GET", r"/analytics/lessons", self.get_lesson_view_stats, ADMIN),
+            ("GET", r"/analytics/teachers", self.get_teacher_view_stats, ADMIN),
+            ("GET", r"/duplicates", self.find_duplicates, ADMIN),
+            ("GET", r"/statistics", self.get_statistics, ADMIN),
+            ("GET", r"/stats", self.query_stats, ADMIN),
+            ("GET", r"/cache-stats", self.cache_stats, ADMIN),
+        ]
+        self.routes = [(method, re.compile(API_PREFIX + path), handler, access)
+                       for method, path, handler, access in self.routes]
+        # GETs whose results only change with catalog_version
+        self.cacheable = {self.get_lessons, self.get_lesson, self.get_lesson_summaries, self.search_lessons,
+                          self.get_related_lessons}
+
+    def serve_forever(self):
+        """Run until interrupted (Ctrl+C)."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.db_async.shutdown()
+
+    async def serve(self):
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        print(f"Serving the catalog API on http://{self.host}:{self.port}{API_PREFIX}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await serve_connection(reader, writer, self._handle_request, "API server")
+
+    async def _handle_request(self, request: HttpRequest, writer: asyncio.StreamWriter):
+        handler, args, access = self._route(request)
+        self._authorize(request, access, args)
+        if handler in self.cacheable:
+            await self._send_cached(request, writer, handler, args)
+            return
+        await send_response(writer, 200, JSON_HEADERS, await self._call(request, handler, args), request.keep_alive)
+
+    async def _send_cached(self, request: HttpRequest, writer: asyncio.StreamWriter, handler: Handler, args: tuple):
+        # Read the version before querying: a write committing meanwhile
+        # bumps it, so a result is never stored under a newer version than its data
+        version = self.db.catalog_version
+        etag = f'"{self.epoch}-{version}"'
+        headers = {**CACHE_HEADERS, "ETag": etag}
+        if etag in request.headers.get("if-none-match", ""):
+            self.cache.count_not_modified()
+            await send_head(writer, 304, headers, request.keep_alive)
+            return
+        key = request.path + "?" + "&".join(f"{name}={value}" for name, value in sorted(request.query.items()))
+        body = self.cache.get(key, version)
+        if body is None:
+            body = await self._call(request, handler, args)
+            self.cache.put(key, version, body)
+        await send_response(writer, 200, headers, body, request.keep_alive)
+
+    async def _call(self, request: HttpRequest, handler: Handler, args: tuple) -> bytes:
+        """Run a route handler and serialize its result."""
+        try:
+            payload = await handler(request, *args)
+        except HttpError:
+            raise
+        except Exception as e:
+            print(f"API server error: {request.method} {request.path}: {e!r}")
+            raise HttpError(500)
+        return encode(payload)
+
+    def _route(self, request: HttpRequest) -> Tuple[Handler, tuple, str]:
+        allowed = []
+        for method, pattern, handler, access in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match:
+                if method == request.method:
+                    return handler, tuple(int(group) for group in match.groups()), access
+                allowed.append(method)
+        if allowed:
+            raise HttpError(405, {"Allow": ", ".join(allowed)})
+        raise HttpError(404)
+
+    def _session(self, request: HttpRequest) -> Optional[Session]:
+        """The live session named by the request's bearer token, extending it; None if there is none."""
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        session = self.sessions.get(token) if scheme.lower() == "bearer" else None
+        if session is None:
+            return None
+        now = time.monotonic()
+        if session.expires < now:
+            del self.sessions[token]
+            return None
+        session.expires = now + SESSION_TTL
+        return session
+
+    def _authorize(self, request: HttpRequest, access: str, args: tuple):
+        """HttpError(401) without a live session, HttpError(403) if its role may not call the route."""
+        if access == PUBLIC:
+            return
+        session = self._session(request)
+        if session is None:
+            raise HttpError(401, {"WWW-Authenticate": "Bearer"})
+        if session.role == "admin":
+            return
+        if (access == ADMIN or (access == TEACHER and session.role != "teacher")
+                or (access == SELF and args[0] != session.user_id)):
+            raise HttpError(403)
+
+    def _start_session(self, user: User) -> str:
+        now = time.monotonic()
+        # Drop expired sessions here rather than on a timer
+        for token in [token for token, session in self.sessions.items() if session.expires < now]:
+            del self.sessions[token]
+        token = secrets.token_urlsafe(32)
+        self.sessions[token] = Session(user.id, user.role, now + SESSION_TTL)
+        return token
+
+    def _end_sessions(self, user_ids: Iterable[int]):
+        """Log out users whose role changed or who were deleted."""
+        user_ids = set(user_ids)
+        for token in [token for token, session in self.sessions.items() if session.user_id in user_ids]:
+            del self.sessions[token]
+
+    async def _check_owner(self, request: HttpRequest, lesson_ids: Iterable[int]):
+        """HttpError(403) unless the caller is an admin or created every one of the lessons."""
+        session = self._session(request)
+        lesson_ids = list(lesson_ids)
+        if session.role == "admin" or not lesson_ids:
+            return
+        lessons = await self._read(self.db.get_lesson_summaries, lesson_ids=lesson_ids)
+        if any(lesson.created_by != session.user_id for lesson in lessons):
+            raise HttpError(403)
+
+    def _check_user(self, request: HttpRequest, user_ids: Iterable[int]):
+        """HttpError(403) unless the caller is an admin or every id is their own."""
+        session = self._session(request)
+        if session.role != "admin" and any(user_id != session.user_id for user_id in user_ids):
+            raise HttpError(403)
+
+    async def _read(self, fn: Callable, *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.db_async.read(fn, *args, **kwargs))
+
+    @staticmethod
+    def _int(request: HttpRequest, name: str, default: Optional[int] = None) -> Optional[int]:
+        value = request.query.get(name)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HttpError(400)
+
+    @staticmethod
+    def _ids(request: HttpRequest, name: str) -> Optional[List[int]]:
+        """A comma-separated id list from the query string; None when absent."""
+        if name not in request.query:
+            return None
+        try:
+            return [int(part) for part in request.query[name].split(",") if part]
+        except ValueError:
+            raise HttpError(400)
+
+    @staticmethod
+    def _float(request: HttpRequest, name: str, default: float) -> float:
+        value = request.query.get(name)
+        if not value:
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            raise HttpError(400)
+
+    @staticmethod
+    def _order(request: HttpRequest) -> str:
+        order = request.query.get("order") or "newest"
+        if order not in LESSON_ORDERS:
+            raise HttpError(400)
+        return order
+
+    @staticmethod
+    def _body(request: HttpRequest) -> dict:
+        body = request.json()
+        if not isinstance(body, dict):
+            raise HttpError(400)
+        return body
+
+    @staticmethod
+    def _field(body: dict, name: str) -> str:
+        """A required string field of the request body; HttpError(400) if it is missing or not a string."""
+        value = body.get(name)
+        if not isinstance(value, str):
+            raise HttpError(400)
+        return value
+
+    @staticmethod
+    def _id_list(body: dict, name: str, default: Optional[list] = None) -> List[int]:
+        """A list of ids from the request body; HttpError(400) unless every item is an integer."""
+        value = body.get(name, default)
+        if not isinstance(value, list) or not all(type(item) is int for item in value):
+            raise HttpError(400)
+        return value
+
+    @staticmethod
+    def _decode(decoder: Callable[[dict], Any], data: Any, optional: bool = False) -> Any:
+        """decoder(data) for an object in the request body; HttpError(400) if it does not fit.
+
+        Only the decoding is guarded, so errors raised later by the handler
+        still reach the 500 branch of _call and are logged.
+        """
+        if data is None and optional:
+            return None
+        if not isinstance(data, dict):
+            raise HttpError(400)
+        try:
+            value = decoder(data)
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400)
+        if value is None:
+            # An empty object
+            raise HttpError(400)
+        return value
+
+    def _decode_list(self, decoder: Callable[[dict], Any], body: dict, name: str) -> list:
+        items = body.get(name)
+        if not isinstance(items, list):
+            raise HttpError(400)
+        return [self._decode(decoder, item) for item in items]
+
+    # Users
+    async def login(self, request: HttpRequest) -> Optional[dict]:
+        """{"user": ..., "token": ...}, or null for a wrong username or password."""
+        body = self._body(request)
+        user = await self._read(self.db.verify_user, self._field(body, "username"), self._field(body, "password"))
+        if user is None:
+            return None
+        return {"user": user, "token": self._start_session(user)}
+
+    async def logout(self, request: HttpRequest) -> bool:
+        _, _, token = request.headers["authorization"].partition(" ")
+        self.sessions.pop(token, None)
+        return True
+
+    async def get_users(self, request: HttpRequest) -> Any:
+        if "username" in request.query:
+            return await self._read(self.db.get_user_by_username, request.query["username"])
+        return await self._read(self.db.get_users)
+
+    async def get_user(self, request: HttpRequest, user_id: int) -> Optional[User]:
+        return await self._read(self.db.get_user, user_id)
+
+    async def add_user(self, request: HttpRequest) -> Optional[User]:
+        body = self._body(request)
+        username, password, role, language = (self._field(body, name)
+                                              for name in ("username", "password", "role", "language"))
+        if role != "student":
+            self._authorize(request, ADMIN, ())
+        return await asyncio.wrap_future(self.db.queue_add_user(username, password, role, language))
+
+    async def update_user(self, request: HttpRequest, user_id: int) -> bool:
+        body = self._body(request)
+        updated = await asyncio.wrap_future(self.db.queue_update_user(
+            user_id, self._field(body, "username"), self._field(body, "role"), self._field(body, "language")))
+        if updated:
+            # Sessions carry the role they were started with
+            self._end_sessions([user_id])
+        return updated
+
+    async def update_user_language(self, request: HttpRequest, user_id: int) -> bool:
+        return await asyncio.wrap_future(self.db.queue_update_user_language(
+            user_id, self._field(self._body(request), "language")))
+
+    async def delete_user(self, request: HttpRequest, user_id: int) -> bool:
+        self._end_sessions([user_id])
+        return await asyncio.wrap_future(self.db.queue_delete_user(user_id))
+
+    async def delete_users(self, request: HttpRequest) -> Optional[DeletionResult]:
+        user_ids = self._id_list(self._body(request), "user_ids")
+        self._end_sessions(user_ids)
+        return await asyncio.wrap_future(self.db.queue_delete_users(user_ids))
+
+    # Lessons
+    async def get_lessons(self, request: HttpRequest) -> List[Lesson]:
+        return await self._read(self.db.get_lessons, self._int(request, "teacher_id"),
+                                self._order(request))
+
+    async def get_lesson(self, request: HttpRequest, lesson_id: int) -> Optional[Lesson]:
+        return await self._read(self.db.get_lesson, lesson_id)
+
+    async def get_lesson_summaries(self, request: HttpRequest) -> dict:
+        """One page of summaries: {"items": [...], "next_offset": int or null}."""
+        limit = min(max(self._int(request, "limit", DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        offset = max(self._int(request, "offset", 0), 0)
+        # One row more than asked tells whether another page follows
+        rows = await self._read(self.db.get_lesson_summaries, teacher_id=self._int(request, "teacher_id"),
+                                lesson_ids=self._ids(request, "ids"), limit=limit + 1, offset=offset,
+                                order=self._order(request))
+        return {"items": rows[:limit], "next_offset": offset + limit if len(rows) > limit else None}
+
+    async def search_lessons(self, request: HttpRequest) -> List[LessonSummary]:
+        limit = min(max(self._int(request, "limit", 50), 1), MAX_PAGE_SIZE)
+        return await self._read(self.db.search_lessons, request.query.get("q", ""), limit)
+
+    async def get_related_lessons(self, request: HttpRequest, lesson_id: int) -> List[LessonSummary]:
+        limit = min(max(self._int(request, "limit", 8), 1), MAX_PAGE_SIZE)
+        return await self._read(self.db.get_related_lessons, lesson_id, limit)
+
+    async def add_lesson(self, request: HttpRequest) -> Optional[Lesson]:
+        body = self._body(request)
+        lesson = self._decode(lesson_from_json, body.get("lesson"))
+        media_info = self._decode(media_info_from_json, body.get("media_info"), optional=True)
+        self._check_user(request, [lesson.created_by])
+        return await asyncio.wrap_future(self.db.queue_add_lesson(lesson, media_info))
+
+    async def update_lesson(self, request: HttpRequest, lesson_id: int) -> bool:
+        body = self._body(request)
+        lesson = self._decode(lesson_from_json, body.get("lesson"))
+        lesson.id = lesson_id
+        media_info = self._decode(media_info_from_json, body.get("media_info"), optional=True)
+        await self._check_owner(request, [lesson_id])
+        return await asyncio.wrap_future(self.db.queue_update_lesson(lesson, media_info))
+
+    async def set_poster_image(self, request: HttpRequest, lesson_id: int) -> bool:
+        image_path = self._field(self._body(request), "image_path")
+        await self._check_owner(request, [lesson_id])
+        return await asyncio.wrap_future(self.db.queue_set_poster_image(lesson_id, image_path))
+
+    async def delete_lesson(self, request: HttpRequest, lesson_id: int) -> bool:
+        await self._check_owner(request, [lesson_id])
+        return await asyncio.wrap_future(self.db.queue_delete_lesson(lesson_id))
+
+    async def delete_lessons(self, request: HttpRequest) -> Optional[DeletionResult]:
+        lesson_ids = self._id_list(self._body(request), "lesson_ids")
+        await self._check_owner(request, lesson_ids)
+        return await asyncio.wrap_future(self.db.queue_delete_lessons(lesson_ids))
+
+    async def preview_deletion(self, request: HttpRequest) -> DeletionResult:
+        body = self._body(request)
+        lesson_ids, user_ids = self._id_list(body, "lesson_ids", []), self._id_list(body, "user_ids", [])
+        if user_ids:
+            self._authorize(request, ADMIN, ())
+        await self._check_owner(request, lesson_ids)
+        return await self._read(self.db.preview_deletion, lesson_ids, user_ids)
+
+    async def get_lessons_without_image(self, request: HttpRequest) -> List[Tuple[int, str]]:
+        # A teacher may only set the image of their own lessons
+        session = self._session(request)
+        teacher_id = None if session.role == "admin" else session.user_id
+        return await self._read(self.db.get_lessons_without_image, teacher_id)
+
+    # Media info
+    async def get_unprobed_videos(self, request: HttpRequest) -> List[str]:
+        return await self._read(self.db.get_unprobed_videos)
+
+    async def save_media_info(self, request: HttpRequest) -> bool:
+        infos = self._decode_list(media_info_from_json, self._body(request), "infos")
+        return await asyncio.wrap_future(self.db.queue_save_media_info(infos))
+
+    # Watch progress
+    async def get_progress(self, request: HttpRequest, user_id: int, lesson_id: int) -> Optional[LessonProgress]:
+        return await self._read(self.db.get_progress, user_id, lesson_id)
+
+    async def get_watched_lessons(self, request: HttpRequest, user_id: int) -> List[Tuple[LessonSummary, LessonProgress]]:
+        limit = min(max(self._int(request, "limit", 12), 1), MAX_PAGE_SIZE)
+        return await self._read(self.db.get_watched_lessons, user_id, limit, bool(self._int(request, "in_progress", 0)))
+
+    async def save_progress(self, request: HttpRequest) -> bool:
+        entries = self._decode_list(progress_from_json, self._body(request), "entries")
+        self._check_user(request, [entry.user_id for entry in entries])
+        return await asyncio.wrap_future(self.db.queue_save_progress(entries))
+
+    # View analytics
+    async def log_views(self, request: HttpRequest) -> bool:
+        events = self._decode_list(view_event_from_json, self._body(request), "events")
+        self._check_user(request, [event.user_id for event in events])
+        return await asyncio.wrap_future(self.db.queue_log_views(events))
+
+    async def get_lesson_view_stats(self, request: HttpRequest) -> List[LessonViewStats]:
+        days = max(self._int(request, "days", 30), 1)
+        limit = min(max(self._int(request, "limit", 50), 1), MAX_PAGE_SIZE)
+        return await self._read(self.db.get_lesson_view_stats, days, limit)
+
+    async def get_teacher_view_stats(self, request: HttpRequest) -> List[TeacherViewStats]:
+        return await self._read(self.db.get_teacher_view_stats)
+
+    async def find_duplicates(self, request: HttpRequest) -> List[DuplicateGroup]:
+        text_threshold = self._float(request, "text_threshold", DUPLICATE_TEXT_THRESHOLD)
+        image_distance = self._int(request, "image_distance", DUPLICATE_IMAGE_DISTANCE)
+        return await self._read(self.db.find_duplicates, text_threshold, image_distance)
+
+    async def get_statistics(self, request: HttpRequest) -> PlatformStatistics:
+        days = max(self._int(request, "days", 90), 1)
+        limit = min(max(self._int(request, "limit", 50), 1), MAX_PAGE_SIZE)
+        return await self._read(self.db.get_statistics, days, limit)
+
+    async def query_stats(self, request: HttpRequest) -> dict:
+        return self.db.query_stats()
+
+    async def cache_stats(self, request: HttpRequest) -> dict:
+        return {"catalog_version": self.db.catalog_version, **self.cache.stats()}
@@ -0,0 +1,123 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+from src.models.database import (DUPLICATE_IMAGE_DISTANCE, DUPLICATE_TEXT_THRESHOLD, Database, DeletionResult,
+                                 Lesson, LessonProgress, MediaInfo, ViewEvent)
+from src.utils.file_manager import FileManager
+
+class AsyncDatabase:
+    """Runs Database calls on background threads and returns futures.
+
+    Reads go to a small thread pool; writes call the database's queue_*
+    methods, which put them on its WriteQueue (or, for a RemoteDatabase,
+    its single write thread) and return at once. Use
+    src.utils.futures.deliver to receive results on the GUI thread.
+    """
+
+    def __init__(self, db: Database, readers: int = 2):
+        self.db = db
+        self._read_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+
+    def read(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a read-only callable on the reader pool."""
+        return self._read_pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting reads; the database's close() flushes the writes."""
+        self._read_pool.shutdown(wait=wait)
+
+    # Reads
+    def verify_user(self, username: str, password: str) -> Future:
+        return self.read(self.db.verify_user, username, password)
+
+    def get_users(self) -> Future:
+        return self.read(self.db.get_users)
+
+    def get_user(self, user_id: int) -> Future:
+        return self.read(self.db.get_user, user_id)
+
+    def get_user_by_username(self, username: str) -> Future:
+        return self.read(self.db.get_user_by_username, username)
+
+    def get_lessons(self, teacher_id: Optional[int] = None, order: str = "newest") -> Future:
+        return self.read(self.db.get_lessons, teacher_id, order)
+
+    def get_lesson(self, lesson_id: int) -> Future:
+        return self.read(self.db.get_lesson, lesson_id)
+
+    def preview_deletion(self, lesson_ids: List[int] = (), user_ids: List[int] = ()) -> Future:
+        return self.read(self._preview_deletion, lesson_ids, user_ids)
+
+    def _preview_deletion(self, lesson_ids: List[int], user_ids: List[int]) -> DeletionResult:
+        preview = self.db.preview_deletion(lesson_ids, user_ids)
+        # Stat the media on this thread too, not in the confirmation dialog
+        report = FileManager().remove_media(preview.orphaned_media, dry_run=True)
+        preview.media_files, preview.media_bytes = len(report.files), report.bytes
+        return preview
+
+    def get_lesson_summaries(self, teacher_id: Optional[int] = None,
+                             lesson_ids: Optional[List[int]] = None,
+                             limit: Optional[int] = None, offset: int = 0, order: str = "newest") -> Future:
+        return self.read(self.db.get_lesson_summaries, teacher_id=teacher_id, lesson_ids=lesson_ids,
+                         limit=limit, offset=offset, order=order)
+
+    def search_lessons(self, query: str, limit: int = 50) -> Future:
+        return self.read(self.db.search_lessons, query, limit)
+
+    def get_progress(self, user_id: int, lesson_id: int) -> Future:
+        return self.read(self.db.get_progress, user_id, lesson_id)
+
+    def get_watched_lessons(self, user_id: int, limit: int = 12, in_progress: bool = False) -> Future:
+        return self.read(self.db.get_watched_lessons, user_id, limit, in_progress)
+
+    def get_lesson_view_stats(self, days: int = 30, limit: int = 50) -> Future:
+        return self.read(self.db.get_lesson_view_stats, days, limit)
+
+    def get_teacher_view_stats(self) -> Future:
+        return self.read(self.db.get_teacher_view_stats)
+
+    def get_statistics(self, days: int = 90, limit: int = 50) -> Future:
+        return self.read(self.db.get_statistics, days, limit)
+
+    def get_related_lessons(self, lesson_id: int, limit: int = 8) -> Future:
+        return self.read(self.db.get_related_lessons, lesson_id, limit)
+
+    def find_duplicates(self, text_threshold: float = DUPLICATE_TEXT_THRESHOLD,
+                        image_distance: int = DUPLICATE_IMAGE_DISTANCE) -> Future:
+        return self.read(self.db.find_duplicates, text_threshold, image_distance)
+
+    # Writes
+    def add_user(self, username: str, password: str, role: str, language: str) -> Future:
+        return self.db.queue_add_user(username, password, role, language)
+
+    def update_user(self, user_id: int, username: str, role: str, language: str) -> Future:
+        return self.db.queue_update_user(user_id, username, role, language)
+
+    def delete_user(self, user_id: int) -> Future:
+        return self.db.queue_delete_user(user_id)
+
+    def update_user_language(self, user_id: int, language: str) -> Future:
+        return self.db.queue_update_user_language(user_id, language)
+
+    def add_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        return self.db.queue_add_lesson(lesson, media_info)
+
+    def update_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        return self.db.queue_update_lesson(lesson, media_info)
+
+    def set_poster_image(self, lesson_id: int, image_path: str) -> Future:
+        return self.db.queue_set_poster_image(lesson_id, image_path)
+
+    def delete_lesson(self, lesson_id: int) -> Future:
+        return self.db.queue_delete_lesson(lesson_id)
+
+    def delete_users(self, user_ids: List[int]) -> Future:
+        return self.db.queue_delete_users(user_ids)
+
+    def delete_lessons(self, lesson_ids: List[int]) -> Future:
+        return self.db.queue_delete_lessons(lesson_ids)
+
+    def save_progress(self, entries: List[LessonProgress]) -> Future:
+        return self.db.queue_save_progress(entries)
+
+    def log_views(self, events: List[ViewEvent]) -> Future:
+        return self.db.queue_log_views(events)
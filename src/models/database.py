@@ -1,10 +1,18 @@
+import math
 import sqlite3
-from typing import Optional, List
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from concurrent.futures import Future
+from functools import lru_cache
+from src.models.instrumentation import QueryInstrumentation, TimedConnection
+from src.models.write_queue import WriteQueue
 from src.utils.security import Security
 
-@dataclass
+# Records are slotted: no per-instance __dict__, which matters when a list
+# view holds thousands of them.
+@dataclass(slots=True)
 class User:
     id: int
     username: str
@@ -13,7 +21,7 @@ class User:
     role: str  # 'admin', 'teacher', or 'student'
     language: str = "ar"  # Default to Arabic
 
-@dataclass
+@dataclass(slots=True)
 class Lesson:
     id: int
     title: str
@@ -25,17 +33,308 @@ class Lesson:
     created_by: int
     created_at: datetime
 
+@dataclass(slots=True)
+class LessonSummary:
+    """The columns list views need, with descriptions already truncated."""
+    id: int
+    title: str
+    title_ar: str
+    summary: str
+    summary_ar: str
+    image_path: str
+    created_by: int
+    creator_name: str
+    created_at: datetime
+    # From media_info, when the video has been probed
+    video_duration: Optional[float] = None
+    video_size: Optional[int] = None
+    # Decayed view score; only meaningful compared with other lessons'
+    popularity: float = 0.0
+
+@dataclass(slots=True)
+class MediaInfo:
+    """Container metadata for a media file, read from its headers once."""
+    path: str
+    size: int
+    mtime: float
+    container: str
+    duration: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bitrate: Optional[int] = None
+
+@dataclass(slots=True)
+class LessonProgress:
+    """How far a user has watched a lesson's video, in milliseconds."""
+    user_id: int
+    lesson_id: int
+    position_ms: int
+    duration_ms: int = 0
+    updated_at: Optional[datetime] = None
+
+    @property
+    def in_progress(self) -> bool:
+        """Started but not finished."""
+        return 0 < self.position_ms < self.duration_ms - FINISHED_MARGIN_MS
+
+    @property
+    def fraction(self) -> float:
+        return min(self.position_ms / self.duration_ms, 1.0) if self.duration_ms > 0 else 0.0
+
+@dataclass(slots=True)
+class ViewEvent:
+    """One opening of a lesson, with how much of its video was played."""
+    user_id: int
+    lesson_id: int
+    watched_ms: int = 0
+    created_at: Optional[datetime] = None
+
+@dataclass(slots=True)
+class LessonViewStats:
+    lesson_id: int
+    title: str
+    title_ar: str
+    views: int
+    watched_ms: int
+
+@dataclass(slots=True)
+class TeacherViewStats:
+    teacher_id: int
+    username: str
+    views: int
+    watched_ms: int
+
+@dataclass(slots=True)
+class DuplicateGroup:
+    """Lessons that look like copies of each other.
+
+    kind is 'text' (near-identical titles and descriptions) or 'image'
+    (the same picture under different file names, listed in paths).
+    similarity is the lowest of the pairwise scores that joined the group.
+    """
+    kind: str
+    lesson_ids: List[int]
+    titles: List[str]
+    titles_ar: List[str]
+    similarity: float
+    paths: List[str]
+
+@dataclass(slots=True)
+class TeacherStats:
+    """A lesson author's counters; media_bytes sums the sizes of their lessons' videos."""
+    teacher_id: int
+    username: str
+    lessons: int
+    media_bytes: int
+
+@dataclass(slots=True)
+class DailyGrowth:
+    """Net users and lessons added on one day, and the totals at its end."""
+    day: str
+    users: int
+    lessons: int
+    total_users: int
+    total_lessons: int
+
+@dataclass(slots=True)
+class PlatformStatistics:
+    total_users: int
+    total_lessons: int
+    users_by_role: Dict[str, int]
+    teachers: List[TeacherStats]
+    growth: List[DailyGrowth]
+
+@dataclass(slots=True)
+class DeletionResult:
+    """What a bulk delete removed (or, for a preview, would remove).
+
+    orphaned_media lists image/video paths that no remaining lesson uses;
+    FileManager.remove_media decides which of them may actually be deleted.
+    For a preview from AsyncDatabase, media_files and media_bytes say how
+    many of them it would delete and how much space that frees.
+    """
+    lesson_ids: List[int]
+    user_ids: List[int]
+    orphaned_media: List[str]
+    media_files: int = 0
+    media_bytes: int = 0
+
+# Explicit column lists so row order never depends on SELECT *
+USER_COLUMNS = "id, username, password, salt, role, language"
+LESSON_COLUMNS = ("id, title, title_ar, description, description_ar, "
+                  "image_path, video_path, created_by, created_at")
+
+MEDIA_INFO_COLUMNS = "path, size, mtime, container, duration, width, height, bitrate"
+PROGRESS_COLUMNS = "user_id, lesson_id, position_ms, duration_ms, updated_at"
+
+# A position this close to the end of the video counts as finished
+FINISHED_MARGIN_MS = 5000
+
+# Popularity is a view count in which a view loses half its weight every
+# POPULARITY_HALF_LIFE_DAYS. It is stored as log2 of the sum of
+# 2 ** (half-lives between POPULARITY_EPOCH and each view): decaying every
+# score by the same factor never changes their order, so scores only
+# change when views arrive and the stored values can be indexed. 0 means
+# no views.
+POPULARITY_EPOCH = "2020-01-01"
+POPULARITY_HALF_LIFE_DAYS = 7.0
+
+# Defaults for find_duplicates: lessons whose text shingles have an
+# estimated Jaccard similarity of at least DUPLICATE_TEXT_THRESHOLD are
+# near-identical, and images whose perceptual hashes differ in at most
+# DUPLICATE_IMAGE_DISTANCE of 64 bits are the same picture
+DUPLICATE_TEXT_THRESHOLD = 0.75
+DUPLICATE_IMAGE_DISTANCE = 5
+
+# Lesson list orderings; each has a matching index
+LESSON_ORDERS = {
+    "newest": "l.created_at DESC, l.id DESC",
+    "popular": "l.popularity DESC, l.id DESC",
+}
+
+def _log2_add(a: float, b: float) -> float:
+    """log2(2**a + 2**b) without overflow."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+# Descriptions longer than this are cut to SUMMARY_LENGTH - 3 characters
+# plus "..." by SQLite, so list views never load the full text
+SUMMARY_LENGTH = 100
+
+def _summary_column(column: str) -> str:
+    return (f"CASE WHEN length(l.{column}) > {SUMMARY_LENGTH} "
+            f"THEN substr(l.{column}, 1, {SUMMARY_LENGTH - 3}) || '...' "
+            f"ELSE l.{column} END")
+
+LESSON_SUMMARY_COLUMNS = f"""
+    l.id, l.title, l.title_ar,
+    {_summary_column("description")}, {_summary_column("description_ar")},
+    l.image_path, l.created_by, COALESCE(u.username, ''), l.created_at,
+    m.duration, m.size, l.popularity
+"""
+LESSON_SUMMARY_JOINS = """
+    LEFT JOIN users u ON u.id = l.created_by
+    LEFT JOIN media_info m ON m.path = l.video_path
+"""
+LESSON_SUMMARY_SELECT = f"SELECT {LESSON_SUMMARY_COLUMNS} FROM lessons l {LESSON_SUMMARY_JOINS}"
+
+def _growth_upsert(users: int, lessons: int) -> str:
+    """Trigger statement adding to today's daily_growth row.
+
+    A new day's row starts from the latest row's totals, so every row
+    carries the running totals and reading a range of days never sums.
+    """
+    latest = "(SELECT {} FROM daily_growth ORDER BY day DESC LIMIT 1)"
+    return f"""
+        INSERT INTO daily_growth (day, users, lessons, total_users, total_lessons)
+        VALUES (date('now'), {users}, {lessons},
+                COALESCE({latest.format("total_users")}, 0) + {users},
+                COALESCE({latest.format("total_lessons")}, 0) + {lessons})
+        ON CONFLICT (day) DO UPDATE SET
+            users = users + {users}, lessons = lessons + {lessons},
+            total_users = total_users + {users}, total_lessons = total_lessons + {lessons};
+    """
+
+def _video_size(row: str) -> str:
+    """Size of the video of a trigger's OLD or NEW lesson, 0 if it was never probed."""
+    return f"COALESCE((SELECT size FROM media_info WHERE path = {row}.video_path), 0)"
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a SQLite CURRENT_TIMESTAMP value ('YYYY-MM-DD HH:MM:SS').
+
+    fromisoformat is several times faster than strptime, and rows inserted
+    in bursts share timestamps, so results are memoized.
+    """
+    return datetime.fromisoformat(value) if value else None
+
+def user_row_factory(cursor: sqlite3.Cursor, row: tuple) -> User:
+    """Row factory mapping a USER_COLUMNS row straight to a User."""
+    return User(*row)
+
+def lesson_row_factory(cursor: sqlite3.Cursor, row: tuple) -> Lesson:
+    """Row factory mapping a LESSON_COLUMNS row straight to a Lesson."""
+    return Lesson(*row[:8], parse_timestamp(row[8]))
+
+def lesson_summary_row_factory(cursor: sqlite3.Cursor, row: tuple) -> LessonSummary:
+    """Row factory mapping a LESSON_SUMMARY_SELECT row to a LessonSummary."""
+    return LessonSummary(*row[:8], parse_timestamp(row[8]), *row[9:])
+
+def media_info_row_factory(cursor: sqlite3.Cursor, row: tuple) -> MediaInfo:
+    """Row factory mapping a MEDIA_INFO_COLUMNS row to a MediaInfo."""
+    return MediaInfo(*row)
+
+def progress_row_factory(cursor: sqlite3.Cursor, row: tuple) -> LessonProgress:
+    """Row factory mapping a PROGRESS_COLUMNS row to a LessonProgress."""
+    return LessonProgress(*row[:4], parse_timestamp(row[4]))
+
+def watched_lesson_row_factory(cursor: sqlite3.Cursor, row: tuple) -> Tuple[LessonSummary, LessonProgress]:
+    """Row factory for LESSON_SUMMARY_COLUMNS followed by PROGRESS_COLUMNS."""
+    return lesson_summary_row_factory(cursor, row[:12]), progress_row_factory(cursor, row[12:])
+
 class Database:
     def __init__(self, db_path: str = "edu_platform.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.query_count = 0
+        self._query_count_lock = threading.Lock()
+        # Bumped after every committed write that can change lesson lists;
+        # responses computed at one version stay valid until it changes
+        self.catalog_version = 0
+        self._catalog_lock = threading.Lock()
+        self.instrumentation = QueryInstrumentation(db_path)
+        # Every write goes through this one thread and connection
+        self.writer = WriteQueue(self._connect_writer)
         self.create_tables()
         self.create_default_admin()
+        # Time every public method from here on
+        self.instrumentation.instrument(self, exclude=("close", "query_stats", "logout"))
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a connection to the database; every statement it runs is counted (and timed while the slow log is on)."""
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection, **kwargs)
+        conn.instrumentation = self.instrumentation
+        conn.set_trace_callback(self._count_query)
+        return conn
+
+    def _connect_writer(self) -> sqlite3.Connection:
+        # The writer manages its own transactions. In WAL mode readers never
+        # block it (or each other), and busy_timeout absorbs the rare
+        # checkpoint or external-process lock instead of failing at once.
+        conn = self._connect(isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _submit_catalog_write(self, op: Callable[..., Any], *args, default: Any = None) -> Future:
+        """Queue a write that changes what lesson lists show; bumps catalog_version once committed."""
+        future = self.writer.submit(op, *args, default=default)
+        future.add_done_callback(self._catalog_changed)
+        return future
+
+    def _catalog_changed(self, future: Future):
+        with self._catalog_lock:
+            self.catalog_version += 1
+
+    def _count_query(self, statement: str):
+        with self._query_count_lock:
+            self.query_count += 1
+        self.instrumentation.statement_traced(statement)
+
+    def query_stats(self) -> dict:
+        """Per-method call counts, rows and latencies, plus the slow statement log."""
+        return self.instrumentation.snapshot()
+
+    def logout(self):
+        """Nothing to do: only a catalog server (see RemoteDatabase) keeps sessions."""
+
+    def close(self):
+        """Flush queued writes and stop the writer thread."""
+        self.writer.close()
 
     def create_tables(self):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+        def op(conn: sqlite3.Connection):
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     username TEXT UNIQUE NOT NULL,
@@ -45,7 +344,7 @@ class Database:
                     language TEXT NOT NULL DEFAULT 'ar'
                 )
             """)
-            cursor.execute('''
+            conn.execute('''
                 CREATE TABLE IF NOT EXISTS lessons (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     title TEXT NOT NULL,
@@ -56,239 +355,987 @@ class Database:
                     video_path TEXT NOT NULL,
                     created_by INTEGER NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    popularity REAL NOT NULL DEFAULT 0,
                     FOREIGN KEY (created_by) REFERENCES users (id)
                 )
             ''')
-            self.conn.commit()
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            if "popularity" not in {row[1] for row in conn.execute("PRAGMA table_info(lessons)")}:
+                # Databases created before popularity ranking
+                conn.execute("ALTER TABLE lessons ADD COLUMN popularity REAL NOT NULL DEFAULT 0")
+            # One per LESSON_ORDERS entry, so paging through either is an index scan
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lessons_newest ON lessons (created_at DESC, id DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lessons_popular ON lessons (popularity DESC, id DESC)")
+            # Keyed by path: lessons may share a file, and list views join on video_path
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS media_info (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    container TEXT NOT NULL,
+                    duration REAL,
+                    width INTEGER,
+                    height INTEGER,
+                    bitrate INTEGER
+                )
+            """)
+            # One row per user and lesson, rewritten in place as they watch
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lesson_progress (
+                    user_id INTEGER NOT NULL,
+                    lesson_id INTEGER NOT NULL,
+                    position_ms INTEGER NOT NULL,
+                    duration_ms INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, lesson_id)
+                ) WITHOUT ROWID
+            """)
+            # Covers the per-user "most recent first" lookups entirely, so
+            # they never touch the table or sort, whatever the catalog size
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lesson_progress_recent
+                ON lesson_progress (user_id, updated_at DESC, lesson_id, position_ms, duration_ms)
+            """)
+            # Append-only; ids only grow, so the rollups keep a watermark
+            # instead of marking events as processed
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS view_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    lesson_id INTEGER NOT NULL,
+                    watched_ms INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            # Rollups of view_events, maintained by roll_up_views. Keyed by
+            # day first so "the last N days" is a range scan.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lesson_view_daily (
+                    day TEXT NOT NULL,
+                    lesson_id INTEGER NOT NULL,
+                    views INTEGER NOT NULL,
+                    watched_ms INTEGER NOT NULL,
+                    PRIMARY KEY (day, lesson_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS teacher_view_totals (
+                    teacher_id INTEGER PRIMARY KEY,
+                    views INTEGER NOT NULL,
+                    watched_ms INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    name TEXT PRIMARY KEY,
+                    last_event_id INTEGER NOT NULL
+                )
+            """)
+            # Precomputed by src.utils.related_lessons; a lesson's list is
+            # one primary-key range, already in rank order
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS related_lessons (
+                    lesson_id INTEGER NOT NULL,
+                    rank INTEGER NOT NULL,
+                    related_id INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (lesson_id, rank)
+                ) WITHOUT ROWID
+            """)
+            # Hash of the text each lesson's list was computed from, to spot edits
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS related_sources (
+                    lesson_id INTEGER PRIMARY KEY,
+                    text_hash TEXT NOT NULL
+                )
+            """)
+            # Cached by src.utils.duplicates so a scan only hashes what changed:
+            # MinHash signatures of lesson text, perceptual hashes of image files
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lesson_fingerprints (
+                    lesson_id INTEGER PRIMARY KEY,
+                    text_hash TEXT NOT NULL,
+                    minhash BLOB NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS image_hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    phash TEXT
+                )
+            """)
+            self._create_statistics(conn)
+        self.writer.run(op)
+
+    @staticmethod
+    def _create_statistics(conn: sqlite3.Connection):
+        """Counter tables for the admin statistics, kept current by triggers.
+
+        Every insert, delete or update of users, lessons and media_info
+        adjusts the counters in the same transaction, whichever write path
+        made it, so reading them never touches the counted tables. A
+        database that predates them is counted once, here.
+        """
+        created = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'teacher_stats'").fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_role_counts (
+                role TEXT PRIMARY KEY,
+                users INTEGER NOT NULL
+            )
+        """)
+        # One row per user with lessons; media_bytes sums their lessons'
+        # video sizes from media_info (a video shared by two lessons counts twice)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS teacher_stats (
+                teacher_id INTEGER PRIMARY KEY,
+                lessons INTEGER NOT NULL,
+                media_bytes INTEGER NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_teacher_stats_lessons ON teacher_stats (lessons DESC, teacher_id)")
+        # Net users and lessons added per day, with running totals (see _growth_upsert)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_growth (
+                day TEXT PRIMARY KEY,
+                users INTEGER NOT NULL,
+                lessons INTEGER NOT NULL,
+                total_users INTEGER NOT NULL,
+                total_lessons INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        # Lets the media_info triggers find the lessons using a video
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_lessons_video ON lessons (video_path, created_by)")
+
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS users_stats_insert AFTER INSERT ON users BEGIN
+                INSERT INTO user_role_counts (role, users) VALUES (NEW.role, 1)
+                ON CONFLICT (role) DO UPDATE SET users = users + 1;
+                {_growth_upsert(1, 0)}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS users_stats_delete AFTER DELETE ON users BEGIN
+                UPDATE user_role_counts SET users = users - 1 WHERE role = OLD.role;
+                {_growth_upsert(-1, 0)}
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS users_stats_role AFTER UPDATE OF role ON users
+            WHEN OLD.role IS NOT NEW.role BEGIN
+                UPDATE user_role_counts SET users = users - 1 WHERE role = OLD.role;
+                INSERT INTO user_role_counts (role, users) VALUES (NEW.role, 1)
+                ON CONFLICT (role) DO UPDATE SET users = users + 1;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS lessons_stats_insert AFTER INSERT ON lessons BEGIN
+                INSERT INTO teacher_stats (teacher_id, lessons, media_bytes)
+                VALUES (NEW.created_by, 1, {_video_size("NEW")})
+                ON CONFLICT (teacher_id) DO UPDATE SET
+                    lessons = lessons + 1, media_bytes = media_bytes + excluded.media_bytes;
+                {_growth_upsert(0, 1)}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS lessons_stats_delete AFTER DELETE ON lessons BEGIN
+                UPDATE teacher_stats SET lessons = lessons - 1, media_bytes = media_bytes - {_video_size("OLD")}
+                WHERE teacher_id = OLD.created_by;
+                DELETE FROM teacher_stats WHERE teacher_id = OLD.created_by AND lessons <= 0;
+                {_growth_upsert(0, -1)}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS lessons_stats_update AFTER UPDATE OF video_path, created_by ON lessons
+            WHEN OLD.video_path IS NOT NEW.video_path OR OLD.created_by IS NOT NEW.created_by BEGIN
+                UPDATE teacher_stats SET lessons = lessons - 1, media_bytes = media_bytes - {_video_size("OLD")}
+                WHERE teacher_id = OLD.created_by;
+                INSERT INTO teacher_stats (teacher_id, lessons, media_bytes)
+                VALUES (NEW.created_by, 1, {_video_size("NEW")})
+                ON CONFLICT (teacher_id) DO UPDATE SET
+                    lessons = lessons + 1, media_bytes = media_bytes + excluded.media_bytes;
+                DELETE FROM teacher_stats WHERE teacher_id = OLD.created_by AND lessons <= 0;
+            END
+        """)
+        # A probed size applies to every lesson using that video
+        media_delta = """
+            UPDATE teacher_stats SET media_bytes = media_bytes + {sign} {row}.size * (
+                SELECT COUNT(*) FROM lessons
+                WHERE video_path = {row}.path AND created_by = teacher_stats.teacher_id
+            )
+            WHERE teacher_id IN (SELECT created_by FROM lessons WHERE video_path = {row}.path);
+        """
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS media_info_stats_insert AFTER INSERT ON media_info BEGIN
+                {media_delta.format(sign="", row="NEW")}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS media_info_stats_delete AFTER DELETE ON media_info BEGIN
+                {media_delta.format(sign="-", row="OLD")}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS media_info_stats_update AFTER UPDATE OF path, size ON media_info
+            WHEN OLD.path IS NOT NEW.path OR OLD.size IS NOT NEW.size BEGIN
+                {media_delta.format(sign="-", row="OLD")}
+                {media_delta.format(sign="", row="NEW")}
+            END
+        """)
+
+        if created:
+            conn.execute("INSERT INTO user_role_counts (role, users) SELECT role, COUNT(*) FROM users GROUP BY role")
+            conn.execute("""
+                INSERT INTO teacher_stats (teacher_id, lessons, media_bytes)
+                SELECT l.created_by, COUNT(*), COALESCE(SUM(m.size), 0)
+                FROM lessons l LEFT JOIN media_info m ON m.path = l.video_path
+                GROUP BY l.created_by
+            """)
+            # Lessons are dated by created_at; users have no sign-up date,
+            # so existing ones all count as added today
+            conn.execute("""
+                INSERT INTO daily_growth (day, users, lessons, total_users, total_lessons)
+                SELECT day, users, lessons,
+                       SUM(users) OVER (ORDER BY day), SUM(lessons) OVER (ORDER BY day)
+                FROM (
+                    SELECT day, SUM(users) AS users, SUM(lessons) AS lessons FROM (
+                        SELECT COALESCE(date(created_at), date('now')) AS day, 0 AS users, 1 AS lessons
+                        FROM lessons
+                        UNION ALL
+                        SELECT date('now'), 1, 0 FROM users
+                    )
+                    GROUP BY day
+                )
+            """)
 
     def create_default_admin(self):
         """Create default admin user if it doesn't exist"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE username = 'admin'")
-            if not cursor.fetchone():
+        def op(conn: sqlite3.Connection):
+            if not conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone():
                 salt = Security.generate_salt()
                 hashed_password = Security.hash_password("admin123", salt)
-                cursor.execute("""
+                conn.execute("""
                     INSERT INTO users (username, password, salt, role, language)
                     VALUES (?, ?, ?, ?, ?)
                 """, ("admin", hashed_password, salt, "admin", "ar"))
-                self.conn.commit()
-        except sqlite3.Error as e:
-            print(f"Error creating default admin: {e}")
+        self.writer.run(op)
 
     def verify_user(self, username: str, password: str) -> Optional[User]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-            row = cursor.fetchone()
+            cursor.row_factory = user_row_factory
+            cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE username = ?", (username,))
+            user = cursor.fetchone()
             
-            if row:
-                user = User(*row)
+            if user:
                 if Security.verify_password(password, user.salt, user.password):
                     return user
             return None
 
     def add_user(self, username: str, password: str, role: str, language: str) -> Optional[User]:
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check if username already exists
-                cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-                if cursor.fetchone():
-                    return None
-                
-                salt = Security.generate_salt()
-                hashed_password = Security.hash_password(password, salt)
-                
-                # Insert new user
-                cursor.execute(
-                    "INSERT INTO users (username, password, salt, role, language) VALUES (?, ?, ?, ?, ?)",
-                    (username, hashed_password, salt, role, language)
-                )
-                
-                # Get the newly created user
-                user_id = cursor.lastrowid
-                cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    conn.commit()
-                    return User(*row)
+        return self.queue_add_user(username, password, role, language).result()
+
+    def queue_add_user(self, username: str, password: str, role: str, language: str) -> Future:
+        """Queue add_user on the writer; the future resolves to the new User or None."""
+        def op(conn: sqlite3.Connection) -> Optional[User]:
+            cursor = conn.cursor()
+            
+            # Check if username already exists
+            cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+            if cursor.fetchone():
                 return None
-                
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return None
+            
+            salt = Security.generate_salt()
+            hashed_password = Security.hash_password(password, salt)
+            
+            # Insert new user
+            cursor.execute(
+                "INSERT INTO users (username, password, salt, role, language) VALUES (?, ?, ?, ?, ?)",
+                (username, hashed_password, salt, role, language)
+            )
+            
+            # Get the newly created user
+            user_id = cursor.lastrowid
+            cursor.row_factory = user_row_factory
+            cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
+            return cursor.fetchone()
+        return self.writer.submit(op, default=None)
 
     def update_user(self, user_id: int, username: str, role: str, language: str) -> bool:
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check if the new username is already taken by another user
-                cursor.execute("SELECT id FROM users WHERE username = ? AND id != ?", (username, user_id))
-                if cursor.fetchone():
-                    return False
-                
-                cursor.execute(
-                    "UPDATE users SET username = ?, role = ?, language = ? WHERE id = ?",
-                    (username, role, language, user_id)
-                )
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
+        return self.queue_update_user(user_id, username, role, language).result()
+
+    def queue_update_user(self, user_id: int, username: str, role: str, language: str) -> Future:
+        """Queue update_user on the writer; False if the username is taken."""
+        def op(conn: sqlite3.Connection) -> bool:
+            # Check if the new username is already taken by another user
+            if conn.execute("SELECT id FROM users WHERE username = ? AND id != ?", (username, user_id)).fetchone():
+                return False
+            
+            conn.execute(
+                "UPDATE users SET username = ?, role = ?, language = ? WHERE id = ?",
+                (username, role, language, user_id)
+            )
+            return True
+        return self._submit_catalog_write(op, default=False)
 
     def delete_user(self, user_id: int) -> bool:
+        return self.queue_delete_user(user_id).result()
+
+    def queue_delete_user(self, user_id: int) -> Future:
+        """Queue delete_user (and the user's lessons) on the writer."""
+        def op(conn: sqlite3.Connection) -> bool:
+            self._delete_rows(conn, [], [user_id], dry_run=False)
+            return True
+        return self._submit_catalog_write(op, default=False)
+
+    def delete_users(self, user_ids: Iterable[int]) -> Optional[DeletionResult]:
+        return self.queue_delete_users(user_ids).result()
+
+    def queue_delete_users(self, user_ids: Iterable[int]) -> Future:
+        """Queue deleting many users and all of their lessons in one transaction."""
+        user_ids = list(user_ids)
+        return self._submit_catalog_write(self._delete_rows, [], user_ids, False, default=None)
+
+    def delete_lessons(self, lesson_ids: Iterable[int]) -> Optional[DeletionResult]:
+        return self.queue_delete_lessons(lesson_ids).result()
+
+    def queue_delete_lessons(self, lesson_ids: Iterable[int]) -> Future:
+        """Queue deleting many lessons in one transaction."""
+        lesson_ids = list(lesson_ids)
+        return self._submit_catalog_write(self._delete_rows, lesson_ids, [], False, default=None)
+
+    def preview_deletion(self, lesson_ids: Iterable[int] = (), user_ids: Iterable[int] = ()) -> DeletionResult:
+        """Report what delete_lessons/delete_users would remove, without deleting."""
+        with self._connect() as conn:
+            return self._delete_rows(conn, list(lesson_ids), list(user_ids), dry_run=True)
+
+    @staticmethod
+    def _delete_rows(conn: sqlite3.Connection, lesson_ids: List[int], user_ids: List[int],
+                     dry_run: bool) -> DeletionResult:
+        """Delete lessons and users (with their lessons), returning orphaned media.
+
+        The id sets go into temp tables so any number of ids costs the same
+        few statements. A media path is orphaned when only deleted lessons
+        reference it.
+        """
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS deleting_users (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS deleting_lessons (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS deleting_media (path TEXT PRIMARY KEY)")
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                # First delete all lessons created by this user
-                cursor.execute("DELETE FROM lessons WHERE created_by = ?", (user_id,))
-                # Then delete the user
-                cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
+            conn.executemany("INSERT OR IGNORE INTO temp.deleting_users VALUES (?)", ((i,) for i in user_ids))
+            conn.executemany("INSERT OR IGNORE INTO temp.deleting_lessons VALUES (?)", ((i,) for i in lesson_ids))
+            # A user's lessons go with them
+            conn.execute("""
+                INSERT OR IGNORE INTO temp.deleting_lessons
+                SELECT id FROM lessons WHERE created_by IN (SELECT id FROM temp.deleting_users)
+            """)
+            conn.execute("""
+                INSERT OR IGNORE INTO temp.deleting_media
+                SELECT image_path FROM lessons
+                WHERE id IN (SELECT id FROM temp.deleting_lessons) AND image_path != ''
+                UNION
+                SELECT video_path FROM lessons
+                WHERE id IN (SELECT id FROM temp.deleting_lessons) AND video_path != ''
+            """)
+            
+            deleted_lessons = [row[0] for row in conn.execute(
+                "SELECT id FROM lessons WHERE id IN (SELECT id FROM temp.deleting_lessons) ORDER BY id")]
+            deleted_users = [row[0] for row in conn.execute(
+                "SELECT id FROM users WHERE id IN (SELECT id FROM temp.deleting_users) ORDER BY id")]
+            orphaned = [row[0] for row in conn.execute("""
+                SELECT path FROM temp.deleting_media m
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM lessons l
+                    WHERE l.id NOT IN (SELECT id FROM temp.deleting_lessons)
+                      AND (l.image_path = m.path OR l.video_path = m.path)
+                )
+                ORDER BY path
+            """)]
+            
+            if not dry_run:
+                conn.execute("DELETE FROM lessons WHERE id IN (SELECT id FROM temp.deleting_lessons)")
+                conn.execute("DELETE FROM users WHERE id IN (SELECT id FROM temp.deleting_users)")
+                for table in ("lesson_progress", "view_events"):
+                    conn.execute(f"""
+                        DELETE FROM {table}
+                        WHERE lesson_id IN (SELECT id FROM temp.deleting_lessons)
+                           OR user_id IN (SELECT id FROM temp.deleting_users)
+                    """)
+                conn.execute("DELETE FROM lesson_view_daily WHERE lesson_id IN (SELECT id FROM temp.deleting_lessons)")
+                # Lists pointing at deleted lessons are repaired by the next
+                # related-lessons update, which finds them via related_sources
+                conn.execute("DELETE FROM related_lessons WHERE lesson_id IN (SELECT id FROM temp.deleting_lessons)")
+                conn.execute("DELETE FROM lesson_fingerprints WHERE lesson_id IN (SELECT id FROM temp.deleting_lessons)")
+                conn.execute("DELETE FROM teacher_view_totals WHERE teacher_id IN (SELECT id FROM temp.deleting_users)")
+            return DeletionResult(deleted_lessons, deleted_users, orphaned)
+        finally:
+            conn.execute("DELETE FROM temp.deleting_users")
+            conn.execute("DELETE FROM temp.deleting_lessons")
+            conn.execute("DELETE FROM temp.deleting_media")
 
     def get_users(self) -> List[User]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users ORDER BY username")
-            return [User(*row) for row in cursor.fetchall()]
+            cursor.row_factory = user_row_factory
+            cursor.execute(f"SELECT {USER_COLUMNS} FROM users ORDER BY username")
+            return cursor.fetchall()
 
     def get_user(self, user_id: int) -> Optional[User]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-            row = cursor.fetchone()
-            if row:
-                return User(*row)
-            return None
+            cursor.row_factory = user_row_factory
+            cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
+            return cursor.fetchone()
 
     def update_user_language(self, user_id: int, language: str) -> bool:
         """Update user's language preference"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                UPDATE users SET language = ? WHERE id = ?
-            """, (language, user_id))
-            self.conn.commit()
+        return self.queue_update_user_language(user_id, language).result()
+
+    def queue_update_user_language(self, user_id: int, language: str) -> Future:
+        def op(conn: sqlite3.Connection) -> bool:
+            conn.execute("UPDATE users SET language = ? WHERE id = ?", (language, user_id))
             return True
-        except sqlite3.Error as e:
-            print(f"Error updating user language: {e}")
-            return False
+        return self.writer.submit(op, default=False)
 
-    def add_lesson(self, lesson: Lesson) -> Optional[Lesson]:
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO lessons 
-                    (title, title_ar, description, description_ar, image_path, video_path, created_by)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (lesson.title, lesson.title_ar, lesson.description, lesson.description_ar,
-                     lesson.image_path, lesson.video_path, lesson.created_by)
-                )
-                conn.commit()
-                return Lesson(
-                    id=cursor.lastrowid,
-                    title=lesson.title,
-                    title_ar=lesson.title_ar,
-                    description=lesson.description,
-                    description_ar=lesson.description_ar,
-                    image_path=lesson.image_path,
-                    video_path=lesson.video_path,
-                    created_by=lesson.created_by,
-                    created_at=datetime.now()
-                )
-        except sqlite3.Error:
-            return None
+    def add_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Optional[Lesson]:
+        return self.queue_add_lesson(lesson, media_info).result()
 
-    def update_lesson(self, lesson: Lesson) -> bool:
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """UPDATE lessons SET 
-                    title = ?, title_ar = ?, description = ?, description_ar = ?,
-                    image_path = ?, video_path = ? WHERE id = ?""",
-                    (lesson.title, lesson.title_ar, lesson.description, lesson.description_ar,
-                     lesson.image_path, lesson.video_path, lesson.id)
-                )
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
+    def queue_add_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        """Queue add_lesson on the writer; the future resolves to the stored Lesson or None.
+
+        media_info, if given, is stored in the same transaction.
+        """
+        def op(conn: sqlite3.Connection) -> Lesson:
+            if media_info:
+                self._save_media_info(conn, media_info)
+            cursor = conn.execute(
+                """INSERT INTO lessons 
+                (title, title_ar, description, description_ar, image_path, video_path, created_by)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (lesson.title, lesson.title_ar, lesson.description, lesson.description_ar,
+                 lesson.image_path, lesson.video_path, lesson.created_by)
+            )
+            return Lesson(
+                id=cursor.lastrowid,
+                title=lesson.title,
+                title_ar=lesson.title_ar,
+                description=lesson.description,
+                description_ar=lesson.description_ar,
+                image_path=lesson.image_path,
+                video_path=lesson.video_path,
+                created_by=lesson.created_by,
+                created_at=datetime.now()
+            )
+        return self._submit_catalog_write(op, default=None)
+
+    def update_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> bool:
+        return self.queue_update_lesson(lesson, media_info).result()
+
+    def queue_update_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        def op(conn: sqlite3.Connection) -> bool:
+            if media_info:
+                self._save_media_info(conn, media_info)
+            conn.execute(
+                """UPDATE lessons SET 
+                title = ?, title_ar = ?, description = ?, description_ar = ?,
+                image_path = ?, video_path = ? WHERE id = ?""",
+                (lesson.title, lesson.title_ar, lesson.description, lesson.description_ar,
+                 lesson.image_path, lesson.video_path, lesson.id)
+            )
+            return True
+        return self._submit_catalog_write(op, default=False)
+
+    def set_poster_image(self, lesson_id: int, image_path: str) -> bool:
+        return self.queue_set_poster_image(lesson_id, image_path).result()
+
+    def queue_set_poster_image(self, lesson_id: int, image_path: str) -> Future:
+        """Queue setting an extracted poster frame as the lesson's image.
+
+        Resolves to False if the lesson is gone or has been given an image
+        in the meantime; a teacher's own image always wins.
+        """
+        def op(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "UPDATE lessons SET image_path = ? WHERE id = ? AND (image_path IS NULL OR image_path = '')",
+                (image_path, lesson_id)
+            )
+            return cursor.rowcount > 0
+        return self._submit_catalog_write(op, default=False)
 
     def delete_lesson(self, lesson_id: int) -> bool:
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM lessons WHERE id = ?", (lesson_id,))
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
-
-    def get_lessons(self, teacher_id: Optional[int] = None) -> List[Lesson]:
-        with sqlite3.connect(self.db_path) as conn:
+        return self.queue_delete_lesson(lesson_id).result()
+
+    def queue_delete_lesson(self, lesson_id: int) -> Future:
+        def op(conn: sqlite3.Connection) -> bool:
+            self._delete_rows(conn, [lesson_id], [], dry_run=False)
+            return True
+        return self._submit_catalog_write(op, default=False)
+
+    def get_lessons(self, teacher_id: Optional[int] = None, order: str = "newest") -> List[Lesson]:
+        """Full lessons, newest or most popular (see LESSON_ORDERS) first."""
+        order_by = LESSON_ORDERS[order]
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = lesson_row_factory
             if teacher_id:
-                cursor.execute("""
-                    SELECT * FROM lessons 
+                cursor.execute(f"""
+                    SELECT {LESSON_COLUMNS} FROM lessons l
                     WHERE created_by = ? 
-                    ORDER BY created_at DESC
+                    ORDER BY {order_by}
                 """, (teacher_id,))
             else:
-                cursor.execute("SELECT * FROM lessons ORDER BY created_at DESC")
+                cursor.execute(f"SELECT {LESSON_COLUMNS} FROM lessons l ORDER BY {order_by}")
             
-            return [Lesson(
-                id=row[0],
-                title=row[1],
-                title_ar=row[2],
-                description=row[3],
-                description_ar=row[4],
-                image_path=row[5],
-                video_path=row[6],
-                created_by=row[7],
-                created_at=datetime.strptime(row[8], "%Y-%m-%d %H:%M:%S") if row[8] else None
-            ) for row in cursor.fetchall()]
+            return cursor.fetchall()
 
     def get_lesson(self, lesson_id: int) -> Optional[Lesson]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = lesson_row_factory
+            cursor.execute(f"SELECT {LESSON_COLUMNS} FROM lessons WHERE id = ?", (lesson_id,))
+            return cursor.fetchone()
+
+    def get_lesson_summaries(self, teacher_id: Optional[int] = None,
+                             lesson_ids: Optional[List[int]] = None,
+                             limit: Optional[int] = None, offset: int = 0,
+                             order: str = "newest") -> List[LessonSummary]:
+        """Get list-view summaries, newest or most popular first.
+
+        Only the columns cards and tables show are selected; use get_lesson
+        for the full record. Optionally restrict to one teacher's lessons
+        and/or to specific lesson ids, and page with limit/offset.
+        """
+        order_by = LESSON_ORDERS[order]
+        conditions, params = [], []
+        if teacher_id:
+            conditions.append("l.created_by = ?")
+            params.append(teacher_id)
+        if lesson_ids is not None:
+            if not lesson_ids:
+                return []
+            conditions.append(f"l.id IN ({', '.join('?' * len(lesson_ids))})")
+            params.extend(lesson_ids)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = lesson_summary_row_factory
+            page = ""
+            if limit is not None:
+                page = "LIMIT ? OFFSET ?"
+                params.extend((limit, offset))
+            cursor.execute(f"{LESSON_SUMMARY_SELECT} {where} ORDER BY {order_by} {page}", params)
+            return cursor.fetchall()
+
+    def search_lessons(self, query: str, limit: int = 50) -> List[LessonSummary]:
+        """Summaries of lessons whose title or description, in either language, contains query."""
+        words = query.split()
+        if not words:
+            return []
+        conditions, params = [], []
+        for word in words:
+            pattern = "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(" + " OR ".join(
+                f"l.{column} LIKE ? ESCAPE '\\'" for column in ("title", "title_ar", "description", "description_ar")
+            ) + ")")
+            params.extend([pattern] * 4)
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM lessons WHERE id = ?", (lesson_id,))
-            row = cursor.fetchone()
-            if row:
-                return Lesson(
-                    id=row[0],
-                    title=row[1],
-                    title_ar=row[2],
-                    description=row[3],
-                    description_ar=row[4],
-                    image_path=row[5],
-                    video_path=row[6],
-                    created_by=row[7],
-                    created_at=datetime.strptime(row[8], "%Y-%m-%d %H:%M:%S") if row[8] else None
+            cursor.row_factory = lesson_summary_row_factory
+            cursor.execute(f"""{LESSON_SUMMARY_SELECT} WHERE {' AND '.join(conditions)}
+                ORDER BY l.created_at DESC, l.id DESC LIMIT ?""", params + [limit])
+            return cursor.fetchall()
+
+    def save_media_info(self, infos: Iterable[MediaInfo]) -> bool:
+        return self.queue_save_media_info(infos).result()
+
+    def queue_save_media_info(self, infos: Iterable[MediaInfo]) -> Future:
+        """Queue storing probed media info, replacing older rows for the same paths."""
+        infos = list(infos)
+        def op(conn: sqlite3.Connection) -> bool:
+            for info in infos:
+                self._save_media_info(conn, info)
+            return True
+        return self._submit_catalog_write(op, default=False)
+
+    @staticmethod
+    def _save_media_info(conn: sqlite3.Connection, info: MediaInfo):
+        # An upsert, not INSERT OR REPLACE: REPLACE removes the old row
+        # without firing delete triggers, so the media counters would count it twice
+        conn.execute("""
+            INSERT INTO media_info
+            (path, size, mtime, container, duration, width, height, bitrate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                size = excluded.size, mtime = excluded.mtime, container = excluded.container,
+                duration = excluded.duration, width = excluded.width, height = excluded.height,
+                bitrate = excluded.bitrate
+        """, (info.path, info.size, info.mtime, info.container,
+              info.duration, info.width, info.height, info.bitrate))
+
+    def get_media_info(self, path: str) -> Optional[MediaInfo]:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = media_info_row_factory
+            cursor.execute(f"SELECT {MEDIA_INFO_COLUMNS} FROM media_info WHERE path = ?", (path,))
+            return cursor.fetchone()
+
+    def get_unprobed_videos(self) -> List[str]:
+        """Distinct lesson video paths that have no media_info row yet."""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("""
+                SELECT DISTINCT l.video_path FROM lessons l
+                LEFT JOIN media_info m ON m.path = l.video_path
+                WHERE l.video_path != '' AND m.path IS NULL
+            """)]
+
+    def get_lessons_without_image(self, teacher_id: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(lesson_id, video_path) for lessons that have a video but no image, optionally one teacher's."""
+        with self._connect() as conn:
+            return conn.execute("""
+                SELECT id, video_path FROM lessons
+                WHERE (image_path IS NULL OR image_path = '') AND video_path != ''
+                  AND (? IS NULL OR created_by = ?)
+                ORDER BY id
+            """, (teacher_id, teacher_id)).fetchall()
+
+    def save_progress(self, entries: Iterable[LessonProgress]) -> bool:
+        return self.queue_save_progress(entries).result()
+
+    def queue_save_progress(self, entries: Iterable[LessonProgress]) -> Future:
+        """Queue storing watch positions, replacing each user's earlier position for the lesson.
+
+        A whole batch is one statement inside one queued write, so flushing
+        many positions at once costs a single transaction.
+        """
+        rows = [(entry.user_id, entry.lesson_id, entry.position_ms, entry.duration_ms) for entry in entries]
+        def op(conn: sqlite3.Connection) -> bool:
+            conn.executemany("""
+                INSERT INTO lesson_progress (user_id, lesson_id, position_ms, duration_ms, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (user_id, lesson_id) DO UPDATE SET
+                    position_ms = excluded.position_ms,
+                    duration_ms = excluded.duration_ms,
+                    updated_at = excluded.updated_at
+            """, rows)
+            return True
+        return self.writer.submit(op, default=False)
+
+    def get_progress(self, user_id: int, lesson_id: int) -> Optional[LessonProgress]:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = progress_row_factory
+            cursor.execute(f"SELECT {PROGRESS_COLUMNS} FROM lesson_progress WHERE user_id = ? AND lesson_id = ?",
+                           (user_id, lesson_id))
+            return cursor.fetchone()
+
+    def get_watched_lessons(self, user_id: int, limit: int = 12,
+                            in_progress: bool = False) -> List[Tuple[LessonSummary, LessonProgress]]:
+        """The lessons a user opened most recently, newest first, with their progress.
+
+        in_progress keeps only lessons started but not finished, for
+        "continue watching". Progress rows are read from a covering index
+        and only the lessons they point at are looked up.
+        """
+        condition = f"AND position_ms > 0 AND position_ms < duration_ms - {FINISHED_MARGIN_MS}" if in_progress else ""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = watched_lesson_row_factory
+            cursor.execute(f"""
+                SELECT {LESSON_SUMMARY_COLUMNS}, p.user_id, p.lesson_id, p.position_ms, p.duration_ms, p.updated_at
+                FROM (SELECT {PROGRESS_COLUMNS} FROM lesson_progress
+                      WHERE user_id = ? {condition}
+                      ORDER BY updated_at DESC LIMIT ?) p
+                JOIN lessons l ON l.id = p.lesson_id
+                {LESSON_SUMMARY_JOINS}
+                ORDER BY p.updated_at DESC, p.lesson_id DESC""", (user_id, limit))
+            return cursor.fetchall()
+
+    def log_views(self, events: Iterable[ViewEvent]) -> bool:
+        return self.queue_log_views(events).result()
+
+    def queue_log_views(self, events: Iterable[ViewEvent]) -> Future:
+        """Queue appending view events to the log, all in one statement."""
+        rows = [(event.user_id, event.lesson_id, event.watched_ms) for event in events]
+        def op(conn: sqlite3.Connection) -> bool:
+            conn.executemany("INSERT INTO view_events (user_id, lesson_id, watched_ms) VALUES (?, ?, ?)", rows)
+            return True
+        return self.writer.submit(op, default=False)
+
+    def roll_up_views(self, batch_size: int = 5000) -> int:
+        return self.queue_roll_up_views(batch_size).result()
+
+    def queue_roll_up_views(self, batch_size: int = 5000) -> Future:
+        """Queue folding up to batch_size new view events into the rollup tables.
+
+        Only events after the stored watermark are read, and the rollups,
+        lesson popularity and the watermark are updated in the same
+        transaction, so every event is counted exactly once however often
+        this runs. Events of lessons that no longer exist are skipped.
+        Resolves to the number of events read; 0 means the rollups are up
+        to date.
+        """
+        def op(conn: sqlite3.Connection) -> int:
+            row = conn.execute("SELECT last_event_id FROM rollup_state WHERE name = 'views'").fetchone()
+            start = row[0] if row else 0
+            end, count = conn.execute("""
+                SELECT MAX(id), COUNT(*) FROM (
+                    SELECT id FROM view_events WHERE id > ? ORDER BY id LIMIT ?
                 )
-            return None
+            """, (start, batch_size)).fetchone()
+            if not count:
+                return 0
+            conn.execute("""
+                INSERT INTO lesson_view_daily (day, lesson_id, views, watched_ms)
+                SELECT date(e.created_at), e.lesson_id, COUNT(*), SUM(e.watched_ms)
+                FROM view_events e JOIN lessons l ON l.id = e.lesson_id
+                WHERE e.id > ? AND e.id <= ?
+                GROUP BY date(e.created_at), e.lesson_id
+                ON CONFLICT (day, lesson_id) DO UPDATE SET
+                    views = views + excluded.views,
+                    watched_ms = watched_ms + excluded.watched_ms
+            """, (start, end))
+            conn.execute("""
+                INSERT INTO teacher_view_totals (teacher_id, views, watched_ms)
+                SELECT l.created_by, COUNT(*), SUM(e.watched_ms)
+                FROM view_events e JOIN lessons l ON l.id = e.lesson_id
+                WHERE e.id > ? AND e.id <= ?
+                GROUP BY l.created_by
+                ON CONFLICT (teacher_id) DO UPDATE SET
+                    views = views + excluded.views,
+                    watched_ms = watched_ms + excluded.watched_ms
+            """, (start, end))
+            self._add_popularity(conn, start, end)
+            conn.execute("INSERT OR REPLACE INTO rollup_state (name, last_event_id) VALUES ('views', ?)", (end,))
+            return count
+        future = self.writer.submit(op, default=0)
+        future.add_done_callback(self._views_rolled_up)
+        return future
+
+    def _views_rolled_up(self, future: Future):
+        # New views reorder the popular lists
+        if not future.exception() and future.result():
+            self._catalog_changed(future)
+
+    @staticmethod
+    def _add_popularity(conn: sqlite3.Connection, start: int, end: int):
+        """Add the views with start < id <= end to their lessons' popularity scores."""
+        added: Dict[int, float] = {}
+        for lesson_id, days in conn.execute("""
+            SELECT e.lesson_id, julianday(e.created_at) - julianday(?)
+            FROM view_events e JOIN lessons l ON l.id = e.lesson_id
+            WHERE e.id > ? AND e.id <= ?
+        """, (POPULARITY_EPOCH, start, end)):
+            weight = days / POPULARITY_HALF_LIFE_DAYS
+            added[lesson_id] = _log2_add(added[lesson_id], weight) if lesson_id in added else weight
+        if not added:
+            return
+        conn.executemany("UPDATE lessons SET popularity = ? WHERE id = ?", [
+            (_log2_add(old, added[lesson_id]) if old else added[lesson_id], lesson_id)
+            for lesson_id, old in conn.execute(
+                "SELECT id, popularity FROM lessons WHERE id IN (SELECT DISTINCT lesson_id FROM view_events "
+                "WHERE id > ? AND id <= ?)", (start, end))
+        ])
+
+    def get_lesson_view_stats(self, days: int = 30, limit: int = 50) -> List[LessonViewStats]:
+        """Most viewed lessons over the last days, from the daily rollup only."""
+        with self._connect() as conn:
+            return [LessonViewStats(*row) for row in conn.execute("""
+                SELECT d.lesson_id, l.title, l.title_ar, SUM(d.views) AS views, SUM(d.watched_ms)
+                FROM lesson_view_daily d JOIN lessons l ON l.id = d.lesson_id
+                WHERE d.day >= date('now', ?)
+                GROUP BY d.lesson_id
+                ORDER BY views DESC, d.lesson_id
+                LIMIT ?
+            """, (f"-{days - 1} days", limit))]
+
+    def get_teacher_view_stats(self) -> List[TeacherViewStats]:
+        """All-time views of each teacher's lessons, from the teacher rollup only."""
+        with self._connect() as conn:
+            return [TeacherViewStats(*row) for row in conn.execute("""
+                SELECT t.teacher_id, COALESCE(u.username, ''), t.views, t.watched_ms
+                FROM teacher_view_totals t LEFT JOIN users u ON u.id = t.teacher_id
+                ORDER BY t.views DESC, t.teacher_id
+            """)]
+
+    def get_statistics(self, days: int = 90, limit: int = 50) -> PlatformStatistics:
+        """Users by role, the limit authors with most lessons and the last days of growth.
+
+        Read from the trigger-maintained counter tables only: a few index
+        range scans whose cost does not depend on how many users and
+        lessons there are. Days without changes have no growth row.
+        """
+        with self._connect() as conn:
+            totals = conn.execute(
+                "SELECT total_users, total_lessons FROM daily_growth ORDER BY day DESC LIMIT 1").fetchone()
+            users_by_role = dict(conn.execute(
+                "SELECT role, users FROM user_role_counts WHERE users > 0 ORDER BY role"))
+            teachers = [TeacherStats(*row) for row in conn.execute("""
+                SELECT t.teacher_id, COALESCE(u.username, ''), t.lessons, t.media_bytes
+                FROM teacher_stats t LEFT JOIN users u ON u.id = t.teacher_id
+                ORDER BY t.lessons DESC, t.teacher_id
+                LIMIT ?
+            """, (limit,))]
+            growth = [DailyGrowth(*row) for row in conn.execute("""
+                SELECT day, users, lessons, total_users, total_lessons FROM daily_growth
+                WHERE day >= date('now', ?)
+                ORDER BY day
+            """, (f"-{days - 1} days",))]
+            return PlatformStatistics(*(totals or (0, 0)), users_by_role, teachers, growth)
+
+    def iter_lesson_texts(self, batch_size: int = 500) -> Iterator[Tuple[int, str, str, str, str]]:
+        """Yield (lesson_id, title, title_ar, description, description_ar) for every lesson, by id."""
+        with self._connect() as conn:
+            cursor = conn.execute("SELECT id, title, title_ar, description, description_ar FROM lessons ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def get_related_sources(self) -> Dict[int, str]:
+        """lesson_id -> hash of the text its related list was computed from."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT lesson_id, text_hash FROM related_sources"))
+
+    def get_related_index(self) -> Dict[int, List[Tuple[int, float]]]:
+        """Every stored related list: lesson_id -> [(related_id, score)] in rank order."""
+        index: Dict[int, List[Tuple[int, float]]] = {}
+        with self._connect() as conn:
+            for lesson_id, related_id, score in conn.execute(
+                    "SELECT lesson_id, related_id, score FROM related_lessons ORDER BY lesson_id, rank"):
+                index.setdefault(lesson_id, []).append((related_id, score))
+        return index
+
+    def save_related(self, lists: Dict[int, List[Tuple[int, float]]], hashes: Dict[int, str],
+                     removed: Iterable[int] = ()) -> bool:
+        return self.queue_save_related(lists, hashes, removed).result()
+
+    def queue_save_related(self, lists: Dict[int, List[Tuple[int, float]]], hashes: Dict[int, str],
+                           removed: Iterable[int] = ()) -> Future:
+        """Queue replacing the related lists of some lessons, all in one transaction.
+
+        lists maps lesson ids to [(related_id, score)] best first; hashes
+        records the text each lesson was indexed from; removed drops the
+        lists and hashes of lessons that no longer exist.
+        """
+        removed = [(lesson_id,) for lesson_id in removed]
+        rows = [(lesson_id, rank, related_id, score)
+                for lesson_id, related in lists.items()
+                for rank, (related_id, score) in enumerate(related)]
+        def op(conn: sqlite3.Connection) -> bool:
+            conn.executemany("DELETE FROM related_lessons WHERE lesson_id = ?", [(i,) for i in lists] + removed)
+            conn.executemany("DELETE FROM related_sources WHERE lesson_id = ?", removed)
+            conn.executemany("INSERT INTO related_lessons (lesson_id, rank, related_id, score) VALUES (?, ?, ?, ?)",
+                             rows)
+            conn.executemany("INSERT OR REPLACE INTO related_sources (lesson_id, text_hash) VALUES (?, ?)",
+                             hashes.items())
+            return True
+        return self._submit_catalog_write(op, default=False)
+
+    def get_related_lessons(self, lesson_id: int, limit: int = 8) -> List[LessonSummary]:
+        """Summaries of the lessons most similar to lesson_id, best first.
+
+        One primary-key range read of the precomputed list; lessons deleted
+        since it was computed are skipped.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = lesson_summary_row_factory
+            cursor.execute(f"""
+                SELECT {LESSON_SUMMARY_COLUMNS}
+                FROM related_lessons r
+                JOIN lessons l ON l.id = r.related_id
+                {LESSON_SUMMARY_JOINS}
+                WHERE r.lesson_id = ?
+                ORDER BY r.rank
+                LIMIT ?""", (lesson_id, limit))
+            return cursor.fetchall()
+
+    def get_lesson_fingerprints(self) -> Dict[int, Tuple[str, bytes]]:
+        """lesson_id -> (hash of the text, MinHash signature) as last stored."""
+        with self._connect() as conn:
+            return {row[0]: row[1:] for row in conn.execute(
+                "SELECT lesson_id, text_hash, minhash FROM lesson_fingerprints")}
+
+    def get_image_hashes(self) -> Dict[str, Tuple[int, float, Optional[str]]]:
+        """path -> (size, mtime, perceptual hash or None if unreadable) as last stored."""
+        with self._connect() as conn:
+            return {row[0]: row[1:] for row in conn.execute("SELECT path, size, mtime, phash FROM image_hashes")}
+
+    def save_fingerprints(self, lessons: Dict[int, Tuple[str, bytes]],
+                          images: Dict[str, Tuple[int, float, Optional[str]]],
+                          removed_lessons: Iterable[int] = (), removed_images: Iterable[str] = ()) -> bool:
+        return self.queue_save_fingerprints(lessons, images, removed_lessons, removed_images).result()
+
+    def queue_save_fingerprints(self, lessons: Dict[int, Tuple[str, bytes]],
+                                images: Dict[str, Tuple[int, float, Optional[str]]],
+                                removed_lessons: Iterable[int] = (), removed_images: Iterable[str] = ()) -> Future:
+        """Queue storing new text and image fingerprints and dropping stale ones, in one transaction."""
+        lesson_rows = [(lesson_id, *fingerprint) for lesson_id, fingerprint in lessons.items()]
+        image_rows = [(path, *fingerprint) for path, fingerprint in images.items()]
+        removed_lessons = [(lesson_id,) for lesson_id in removed_lessons]
+        removed_images = [(path,) for path in removed_images]
+        def op(conn: sqlite3.Connection) -> bool:
+            conn.executemany("INSERT OR REPLACE INTO lesson_fingerprints (lesson_id, text_hash, minhash) "
+                             "VALUES (?, ?, ?)", lesson_rows)
+            conn.executemany("INSERT OR REPLACE INTO image_hashes (path, size, mtime, phash) VALUES (?, ?, ?, ?)",
+                             image_rows)
+            conn.executemany("DELETE FROM lesson_fingerprints WHERE lesson_id = ?", removed_lessons)
+            conn.executemany("DELETE FROM image_hashes WHERE path = ?", removed_images)
+            return True
+        return self.writer.submit(op, default=False)
+
+    def find_duplicates(self, text_threshold: float = DUPLICATE_TEXT_THRESHOLD,
+                        image_distance: int = DUPLICATE_IMAGE_DISTANCE) -> List[DuplicateGroup]:
+        """Groups of lessons with near-identical text, or with the same image under different names.
+
+        See src.utils.duplicates; fingerprints of unchanged lessons and
+        image files are reused from the previous scan.
+        """
+        # Import here to avoid circular import
+        from src.utils.duplicates import DuplicateDetector
+        return DuplicateDetector(self, text_threshold, image_distance).find()
+
+    def iter_media_references(self, batch_size: int = 500) -> Iterator[Tuple[int, str, str]]:
+        """Yield (lesson_id, image_path, video_path) for every lesson.
+
+        Rows are fetched batch_size at a time, so scanning a large lessons
+        table never holds more than one batch in memory.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("SELECT id, image_path, video_path FROM lessons")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def referenced_media(self, paths: Iterable[str]) -> Set[str]:
+        """The subset of paths that some lesson uses as its image or video."""
+        paths = list(paths)
+        referenced = set()
+        with self._connect() as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(paths), 400):
+                chunk = paths[start:start + 400]
+                marks = ", ".join("?" * len(chunk))
+                referenced.update(row[0] for row in conn.execute(f"""
+                    SELECT image_path FROM lessons WHERE image_path IN ({marks})
+                    UNION
+                    SELECT video_path FROM lessons WHERE video_path IN ({marks})
+                """, chunk + chunk))
+        return referenced
 
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get a user by their username."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-                row = cursor.fetchone()
-                if row:
-                    return User(*row)
-                return None
+                cursor.row_factory = user_row_factory
+                cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE username = ?", (username,))
+                return cursor.fetchone()
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None 
\ No newline at end of file
@@ -0,0 +1,298 @@
+import json
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import closing
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Upper bounds (ms) of the latency histogram buckets; one more open-ended
+# bucket counts everything slower than the last bound
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Only data statements are timed; BEGIN/COMMIT/SAVEPOINT/PRAGMA are not
+TIMED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+def count_rows(result: Any) -> int:
+    """Rows a method returned: collection size, 1 for a record, 0 for None, a flag or a generator."""
+    if isinstance(result, (list, tuple, set)):
+        return len(result)
+    if result is None or isinstance(result, (bool, int, Iterator)):
+        return 0
+    return 1
+
+class MethodStats:
+    """Call count, returned rows and a latency histogram for one method."""
+    __slots__ = ("calls", "errors", "rows", "total_ms", "max_ms", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, rows: int, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a latency percentile as the upper bound of its bucket."""
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {
+                **{f"<={bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                f">{LATENCY_BUCKETS_MS[-1]}ms": self.histogram[-1],
+            },
+        }
+
+class TimedCursor(sqlite3.Cursor):
+    """A cursor that times only its own SQLite calls.
+
+    execute() and every fetch add to the statement's time; the statement is
+    reported once its rows are exhausted (or it has none), the cursor is
+    re-executed or closed, or the cursor is dropped early. Python work done
+    between fetches is not counted.
+    """
+
+    _statement: Optional[str] = None
+    _elapsed = 0.0
+
+    def _timed(self, call: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def _report(self):
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            self.connection.instrumentation.statement_finished(statement, self._elapsed * 1000)
+
+    def _run(self, call: Callable, sql: str, parameters):
+        self._report()
+        instrumentation = self.connection.instrumentation
+        instrumentation.statement_starting()
+        self._elapsed = 0.0
+        try:
+            self._timed(call, sql, parameters)
+        finally:
+            # The trace callback saw the statement with its parameters bound
+            self._statement = instrumentation.traced_statement() or sql
+        if self.description is None:
+            self._report()
+        return self
+
+    def execute(self, sql: str, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._report()
+        return row
+
+    def fetchmany(self, size: Optional[int] = None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if len(rows) < size:
+            self._report()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._report()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed(super().__next__)
+        except StopIteration:
+            self._report()
+            raise
+
+    def close(self):
+        self._report()
+        super().close()
+
+    def __del__(self):
+        self._report()
+
+class TimedConnection(sqlite3.Connection):
+    """A connection whose cursors are TimedCursors while the slow log is on.
+
+    Connection.execute() does not go through cursor(), so it is routed
+    explicitly. With the slow log off, plain cursors are returned and
+    nothing is timed.
+    """
+
+    instrumentation: Optional["QueryInstrumentation"] = None
+
+    def cursor(self, factory=None):
+        if factory is None:
+            timed = self.instrumentation is not None and self.instrumentation.slow_threshold_ms is not None
+            factory = TimedCursor if timed else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class QueryInstrumentation:
+    """Measures a Database: per-method latency and rows, plus slow statements.
+
+    instrument() wraps every public method of the database object. Calls
+    made from inside another instrumented method are attributed to the
+    outer call only, and methods returning a future are timed until the
+    future resolves. With slow_threshold_ms set, connections opened as
+    TimedConnections log statements whose SQLite calls took at least that
+    long, with their query plan; it is None (off) by default.
+    """
+
+    def __init__(self, db_path: str, slow_threshold_ms: Optional[float] = None, slow_log_size: int = 100):
+        self.db_path = db_path
+        self.slow_threshold_ms = slow_threshold_ms
+        self.methods: Dict[str, MethodStats] = {}
+        self.slow_statements: Deque[dict] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def instrument(self, target: Any, exclude: tuple = ()):
+        """Replace target's public methods with measuring wrappers."""
+        for name in dir(type(target)):
+            if name.startswith("_") or name in exclude:
+                continue
+            method = getattr(target, name)
+            if callable(method):
+                setattr(target, name, self._wrap(name, method))
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            local = self._local
+            if getattr(local, "active", False):
+                return method(*args, **kwargs)
+            local.active = True
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._record(name, start, 0, True)
+                raise
+            finally:
+                local.active = False
+            if isinstance(result, Future):
+                result.add_done_callback(lambda done: self._record(
+                    name, start, 0 if done.exception() else count_rows(done.result()),
+                    done.exception() is not None))
+            else:
+                self._record(name, start, count_rows(result), False)
+            return result
+        return wrapper
+
+    def _record(self, name: str, start: float, rows: int, failed: bool):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            stats = self.methods.get(name)
+            if stats is None:
+                stats = self.methods[name] = MethodStats()
+            stats.record(elapsed_ms, rows, failed)
+
+    def statement_traced(self, statement: str):
+        """Trace-callback hook: remember the first data statement since statement_starting()."""
+        if getattr(self._local, "traced", None) is None and statement.lstrip().upper().startswith(TIMED_STATEMENTS):
+            self._local.traced = statement
+
+    def statement_starting(self):
+        """A TimedCursor on this thread is about to execute a statement."""
+        self._local.traced = None
+
+    def traced_statement(self) -> Optional[str]:
+        """The expanded statement traced since statement_starting(), if any."""
+        return getattr(self._local, "traced", None)
+
+    def statement_finished(self, statement: str, elapsed_ms: float):
+        """A TimedCursor's statement is done; log it if it was slow."""
+        threshold = self.slow_threshold_ms
+        if (threshold is not None and elapsed_ms >= threshold
+                and statement.lstrip().upper().startswith(TIMED_STATEMENTS)):
+            self.log_slow_statement(statement, elapsed_ms)
+
+    def log_slow_statement(self, statement: str, elapsed_ms: float):
+        plan = self.explain(statement)
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "thread": threading.current_thread().name,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "statement": " ".join(statement.split()),
+            "plan": plan,
+        }
+        with self._lock:
+            self.slow_statements.append(entry)
+        print(f"Slow query ({elapsed_ms:.1f} ms): {entry['statement']}")
+        for line in plan:
+            print(f"    {line}")
+
+    def explain(self, statement: str) -> List[str]:
+        """EXPLAIN QUERY PLAN for an (already expanded) statement, one line per step."""
+        try:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                rows = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+        # Rows are (id, parent, notused, detail); indent children under parents
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return lines
+
+    def snapshot(self) -> dict:
+        """A JSON-serializable copy of everything recorded so far."""
+        with self._lock:
+            return {
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "methods": {name: stats.as_dict() for name, stats in sorted(self.methods.items())},
+                "slow_statements": list(self.slow_statements),
+            }
+
+    def dump(self, path: str):
+        """Write snapshot() to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self.methods.clear()
+            self.slow_statements.clear()
@@ -0,0 +1,323 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from src.models.api_server import (API_PREFIX, MAX_PAGE_SIZE, deletion_from_json, lesson_from_json,
+                                   progress_from_json, statistics_from_json, summary_from_json, to_json,
+                                   user_from_json)
+from src.models.database import (DUPLICATE_IMAGE_DISTANCE, DUPLICATE_TEXT_THRESHOLD, DeletionResult,
+                                 DuplicateGroup, Lesson, LessonProgress, LessonSummary, LessonViewStats, MediaInfo,
+                                 PlatformStatistics, TeacherViewStats, User, ViewEvent)
+
+# GET responses are reused for this long (unless this client writes), then revalidated
+CACHE_TTL = 2.0
+
+class RemoteDatabase:
+    """Database stand-in for clients of a `main.py --serve` catalog server.
+
+    It has the same methods the views, AsyncDatabase and NavigationManager
+    call on Database (including the queue_* write variants), so windows
+    work unchanged whether they own the SQLite file or share a server.
+    Each thread keeps one keep-alive connection. queue_* writes run in
+    order on one background thread, like Database's write queue. GET
+    responses are cached for CACHE_TTL seconds and then revalidated with
+    their ETag, so an unchanged lesson page costs the server a 304 and no
+    query. The cache is dropped whenever this client writes, so a client
+    always sees its own changes.
+    Lesson summaries are fetched page by page. Like Database, methods print
+    errors and return None/False/[] instead of raising when the server
+    cannot be reached.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        url = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+        self.base_url = base_url
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 80
+        self.timeout = timeout
+        self.requests = 0
+        self.cache_hits = 0
+        # GETs answered 304 Not Modified
+        self.revalidated = 0
+        self._local = threading.local()
+        # path -> (expires, ETag, decoded body)
+        self._cache: Dict[str, Tuple[float, Optional[str], Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-write")
+        # Session token from the last successful verify_user; sent with every request
+        self.token: Optional[str] = None
+
+    def close(self):
+        self._writes.shutdown(wait=True)
+
+    def query_stats(self) -> dict:
+        """The server database's per-method statistics."""
+        return self._get("/stats", default={})
+
+    # HTTP
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _request(self, method: str, path: str, body: Any = None,
+                 etag: Optional[str] = None) -> Tuple[int, Optional[str], Any]:
+        """(status, ETag, decoded body); the body is None for a 304 answer to etag."""
+        payload = None if body is None else json.dumps(to_json(body), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+        # A kept-alive connection the server has since closed fails once; retry on a new one.
+        # Only a GET is retried once the request is out: the server may have
+        # run a write before the connection dropped, and it must not run twice.
+        for attempt in (1, 2):
+            conn = self._connection()
+            sent = False
+            try:
+                conn.request(method, API_PREFIX + path, body=payload, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                self._local.conn = None
+                if attempt == 2 or (sent and method != "GET"):
+                    raise
+        self.requests += 1
+        if response.status == 304 and etag:
+            return 304, etag, None
+        if response.status != 200:
+            raise http.client.HTTPException(f"{method} {path}: {response.status} {response.reason}")
+        return 200, response.getheader("ETag"), json.loads(data)
+
+    def _get(self, path: str, params: Optional[dict] = None, default: Any = None) -> Any:
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(path)
+        if cached and cached[0] > now:
+            self.cache_hits += 1
+            return cached[2]
+        try:
+            # Past its TTL, a response with an ETag is revalidated rather than re-sent
+            status, etag, result = self._request("GET", path, etag=cached[1] if cached else None)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            print(f"Server error: {e}")
+            return default
+        if status == 304:
+            self.revalidated += 1
+            result = cached[2]
+        with self._cache_lock:
+            self._cache[path] = (now + CACHE_TTL, etag, result)
+        return result
+
+    def _send(self, method: str, path: str, body: Any = None, default: Any = None, writes: bool = True) -> Any:
+        try:
+            return self._request(method, path, body)[2]
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            print(f"Server error: {e}")
+            return default
+        finally:
+            if writes:
+                # Also drops anything a concurrent read cached while the write was in flight
+                with self._cache_lock:
+                    self._cache.clear()
+
+    def _queue(self, fn: Callable, *args) -> Future:
+        return self._writes.submit(fn, *args)
+
+    # Users
+    def verify_user(self, username: str, password: str) -> Optional[User]:
+        """Log in; on success every later request is made as this user."""
+        session = self._send("POST", "/login", {"username": username, "password": password})
+        if not session:
+            return None
+        self.token = session["token"]
+        return user_from_json(session["user"])
+
+    def logout(self):
+        """End the server session once the writes queued before it have been sent."""
+        self._queue(self._end_session, self.token)
+
+    def _end_session(self, token: Optional[str]):
+        # Unless someone has logged in again meanwhile
+        if token and self.token == token:
+            self._send("POST", "/logout", default=False)
+            self.token = None
+
+    def get_users(self) -> List[User]:
+        return [user_from_json(user) for user in self._get("/users", default=[])]
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        return user_from_json(self._get(f"/users/{user_id}"))
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        return user_from_json(self._get("/users", {"username": username}))
+
+    def add_user(self, username: str, password: str, role: str, language: str) -> Optional[User]:
+        return user_from_json(self._send("POST", "/users", {
+            "username": username, "password": password, "role": role, "language": language}))
+
+    def queue_add_user(self, username: str, password: str, role: str, language: str) -> Future:
+        return self._queue(self.add_user, username, password, role, language)
+
+    def update_user(self, user_id: int, username: str, role: str, language: str) -> bool:
+        return self._send("PUT", f"/users/{user_id}",
+                          {"username": username, "role": role, "language": language}, default=False)
+
+    def queue_update_user(self, user_id: int, username: str, role: str, language: str) -> Future:
+        return self._queue(self.update_user, user_id, username, role, language)
+
+    def update_user_language(self, user_id: int, language: str) -> bool:
+        return self._send("PUT", f"/users/{user_id}/language", {"language": language}, default=False)
+
+    def queue_update_user_language(self, user_id: int, language: str) -> Future:
+        return self._queue(self.update_user_language, user_id, language)
+
+    def delete_user(self, user_id: int) -> bool:
+        return self._send("DELETE", f"/users/{user_id}", default=False)
+
+    def queue_delete_user(self, user_id: int) -> Future:
+        return self._queue(self.delete_user, user_id)
+
+    def delete_users(self, user_ids: Iterable[int]) -> Optional[DeletionResult]:
+        return deletion_from_json(self._send("POST", "/users/delete", {"user_ids": list(user_ids)}))
+
+    def queue_delete_users(self, user_ids: Iterable[int]) -> Future:
+        return self._queue(self.delete_users, list(user_ids))
+
+    # Lessons
+    def get_lessons(self, teacher_id: Optional[int] = None, order: str = "newest") -> List[Lesson]:
+        params = {"order": order}
+        if teacher_id:
+            params["teacher_id"] = teacher_id
+        return [lesson_from_json(lesson) for lesson in self._get("/lessons", params, default=[])]
+
+    def get_lesson(self, lesson_id: int) -> Optional[Lesson]:
+        return lesson_from_json(self._get(f"/lessons/{lesson_id}"))
+
+    def get_lesson_summaries(self, teacher_id: Optional[int] = None,
+                             lesson_ids: Optional[List[int]] = None,
+                             limit: Optional[int] = None, offset: int = 0,
+                             order: str = "newest") -> List[LessonSummary]:
+        if lesson_ids is not None and not lesson_ids:
+            return []
+        params = {"order": order}
+        if teacher_id:
+            params["teacher_id"] = teacher_id
+        if lesson_ids is not None:
+            params["ids"] = ",".join(str(lesson_id) for lesson_id in lesson_ids)
+        summaries: List[LessonSummary] = []
+        next_offset: Optional[int] = offset
+        # Follow pages until the server says there are no more, or limit is reached
+        while next_offset is not None:
+            wanted = MAX_PAGE_SIZE if limit is None else min(limit - len(summaries), MAX_PAGE_SIZE)
+            if wanted <= 0:
+                break
+            page = self._get("/lesson-summaries", {**params, "offset": next_offset, "limit": wanted})
+            if page is None:
+                break
+            summaries.extend(summary_from_json(item) for item in page["items"])
+            next_offset = page["next_offset"]
+        return summaries
+
+    def search_lessons(self, query: str, limit: int = 50) -> List[LessonSummary]:
+        return [summary_from_json(item) for item in self._get("/search", {"q": query, "limit": limit}, default=[])]
+
+    def get_related_lessons(self, lesson_id: int, limit: int = 8) -> List[LessonSummary]:
+        return [summary_from_json(item)
+                for item in self._get(f"/lessons/{lesson_id}/related", {"limit": limit}, default=[])]
+
+    def add_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Optional[Lesson]:
+        return lesson_from_json(self._send("POST", "/lessons", {"lesson": lesson, "media_info": media_info}))
+
+    def queue_add_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        return self._queue(self.add_lesson, lesson, media_info)
+
+    def update_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> bool:
+        return self._send("PUT", f"/lessons/{lesson.id}", {"lesson": lesson, "media_info": media_info}, default=False)
+
+    def queue_update_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None) -> Future:
+        return self._queue(self.update_lesson, lesson, media_info)
+
+    def set_poster_image(self, lesson_id: int, image_path: str) -> bool:
+        return self._send("PUT", f"/lessons/{lesson_id}/image", {"image_path": image_path}, default=False)
+
+    def queue_set_poster_image(self, lesson_id: int, image_path: str) -> Future:
+        return self._queue(self.set_poster_image, lesson_id, image_path)
+
+    def delete_lesson(self, lesson_id: int) -> bool:
+        return self._send("DELETE", f"/lessons/{lesson_id}", default=False)
+
+    def queue_delete_lesson(self, lesson_id: int) -> Future:
+        return self._queue(self.delete_lesson, lesson_id)
+
+    def delete_lessons(self, lesson_ids: Iterable[int]) -> Optional[DeletionResult]:
+        return deletion_from_json(self._send("POST", "/lessons/delete", {"lesson_ids": list(lesson_ids)}))
+
+    def queue_delete_lessons(self, lesson_ids: Iterable[int]) -> Future:
+        return self._queue(self.delete_lessons, list(lesson_ids))
+
+    def preview_deletion(self, lesson_ids: Iterable[int] = (), user_ids: Iterable[int] = ()) -> DeletionResult:
+        result = self._send("POST", "/deletion-preview",
+                            {"lesson_ids": list(lesson_ids), "user_ids": list(user_ids)}, writes=False)
+        return deletion_from_json(result) or DeletionResult([], [], [])
+
+    def get_lessons_without_image(self) -> List[Tuple[int, str]]:
+        return [tuple(row) for row in self._get("/lessons/without-image", default=[])]
+
+    # Media info
+    def get_unprobed_videos(self) -> List[str]:
+        return self._get("/media-info/unprobed", default=[])
+
+    def save_media_info(self, infos: Iterable[MediaInfo]) -> bool:
+        return self._send("POST", "/media-info", {"infos": list(infos)}, default=False)
+
+    def queue_save_media_info(self, infos: Iterable[MediaInfo]) -> Future:
+        return self._queue(self.save_media_info, list(infos))
+
+    # Watch progress
+    def get_progress(self, user_id: int, lesson_id: int) -> Optional[LessonProgress]:
+        return progress_from_json(self._get(f"/users/{user_id}/progress/{lesson_id}"))
+
+    def get_watched_lessons(self, user_id: int, limit: int = 12,
+                            in_progress: bool = False) -> List[Tuple[LessonSummary, LessonProgress]]:
+        rows = self._get(f"/users/{user_id}/watched", {"limit": limit, "in_progress": int(in_progress)}, default=[])
+        return [(summary_from_json(summary), progress_from_json(progress)) for summary, progress in rows]
+
+    def save_progress(self, entries: Iterable[LessonProgress]) -> bool:
+        return self._send("POST", "/progress", {"entries": list(entries)}, default=False)
+
+    def queue_save_progress(self, entries: Iterable[LessonProgress]) -> Future:
+        return self._queue(self.save_progress, list(entries))
+
+    # View analytics; the server rolls events up
+    def log_views(self, events: Iterable[ViewEvent]) -> bool:
+        return self._send("POST", "/view-events", {"events": list(events)}, default=False, writes=False)
+
+    def queue_log_views(self, events: Iterable[ViewEvent]) -> Future:
+        return self._queue(self.log_views, list(events))
+
+    def get_lesson_view_stats(self, days: int = 30, limit: int = 50) -> List[LessonViewStats]:
+        return [LessonViewStats(**row) for row in
+                self._get("/analytics/lessons", {"days": days, "limit": limit}, default=[])]
+
+    def get_teacher_view_stats(self) -> List[TeacherViewStats]:
+        return [TeacherViewStats(**row) for row in self._get("/analytics/teachers", default=[])]
+
+    def get_statistics(self, days: int = 90, limit: int = 50) -> Optional[PlatformStatistics]:
+        return statistics_from_json(self._get("/statistics", {"days": days, "limit": limit}, default=None))
+
+    # The server reads the image files, so it does the scan
+    def find_duplicates(self, text_threshold: float = DUPLICATE_TEXT_THRESHOLD,
+                        image_distance: int = DUPLICATE_IMAGE_DISTANCE) -> List[DuplicateGroup]:
+        return [DuplicateGroup(**row) for row in self._get(
+            "/duplicates", {"text_threshold": text_threshold, "image_distance": image_distance}, default=[])]
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+class ResponseCache:
+    """Serialized JSON bodies of catalog GET requests, each valid for one catalog version.
+
+    Entries are keyed by request path and query string and remember the
+    Database.catalog_version they were computed at; a lookup at any other
+    version is a miss, so lesson writes invalidate everything without the
+    cache having to know which pages they touched. Bounded by entry count
+    and total body bytes, least recently used first out. Also counts how
+    requests were answered, for the hit-rate metrics.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count_not_modified(self):
+        with self._lock:
+            self.requests += 1
+            self.not_modified += 1
+
+    def get(self, key: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            self.requests += 1
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, version: int, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self._entries[key] = (version, body)
+            self.size += len(body)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            answered = self.hits + self.not_modified
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(answered / self.requests, 4) if self.requests else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,143 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# (operation, args, value returned on sqlite3.Error, future)
+WriteItem = Tuple[Callable[..., Any], tuple, Any, Future]
+
+class WriteQueue:
+    """Serializes every write to a database through one thread and connection.
+
+    Operations are callables taking the writer's connection (plus any extra
+    arguments). Whatever is queued while a transaction runs is grouped into
+    the next one, up to max_batch operations, so a burst of writes costs one
+    BEGIN IMMEDIATE/COMMIT instead of one per write. Each operation runs in
+    its own SAVEPOINT: if it raises, only its changes are rolled back and
+    only its future sees the failure. Futures resolve after the COMMIT, so a
+    caller that waits for one can immediately read its changes back.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_batch: int = 100):
+        self.max_batch = max_batch
+        self.transactions = 0
+        self.operations = 0
+        self._connect = connect
+        self._queue: "queue.Queue[Optional[WriteItem]]" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: Callable[..., Any], *args, default: Any = None) -> Future:
+        """Queue op(conn, *args); the future resolves to its return value.
+
+        If op raises sqlite3.Error the error is printed and the future
+        resolves to default instead, matching how Database methods report
+        failures. Any other exception is set on the future. After close()
+        nothing is written and the future resolves to default at once.
+        """
+        future = Future()
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put((op, args, default, future))
+                return future
+        print("Database error: the database is closed")
+        future.set_result(default)
+        return future
+
+    def run(self, op: Callable[..., Any], *args, default: Any = None) -> Any:
+        """Queue an operation and wait for its result."""
+        return self.submit(op, *args, default=default).result()
+
+    def close(self):
+        """Finish every queued write, then stop the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            print(f"Database error: {e}")
+            self._fail_all(e)
+            return
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Take whatever else is already waiting, without lingering
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._execute(conn, batch)
+        conn.close()
+
+    def _fail_all(self, error: Exception):
+        # Without a connection, fail every write instead of leaving callers waiting
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if item[3].set_running_or_notify_cancel():
+                item[3].set_exception(error)
+
+    def _execute(self, conn: sqlite3.Connection, batch: List[WriteItem]):
+        batch = [item for item in batch if item[3].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, default, future in batch:
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    result = op(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    conn.execute("RELEASE write_op")
+                    if isinstance(e, sqlite3.Error):
+                        print(f"Database error: {e}")
+                        outcomes.append((future, default, None))
+                    else:
+                        outcomes.append((future, None, e))
+                else:
+                    conn.execute("RELEASE write_op")
+                    outcomes.append((future, result, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            # The transaction as a whole failed, so none of it was written
+            print(f"Database error: {e}")
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            except sqlite3.Error as rollback_error:
+                print(f"Database error: {rollback_error}")
+            # Resolve every future even now, so no caller is left waiting
+            for op, args, default, future in batch:
+                if isinstance(e, sqlite3.Error):
+                    future.set_result(default)
+                else:
+                    future.set_exception(e)
+            return
+
+        self.transactions += 1
+        self.operations += len(batch)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
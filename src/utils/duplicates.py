@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import os
+import random
+from array import array
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from PIL import Image
+from src.models.database import (DUPLICATE_IMAGE_DISTANCE, DUPLICATE_TEXT_THRESHOLD, Database,
+                                 DuplicateGroup)
+from src.utils.related_lessons import text_hash, tokenize
+
+try:
+    import numpy
+except ImportError:
+    # Signatures are computed in pure Python instead, with the same result
+    numpy = None
+
+# Characters per shingle: lesson texts are short, and with character
+# shingles an edited word only changes the shingles around it
+SHINGLE_SIZE = 5
+# Past this many members, a bucket's members are only compared with its
+# first one, so a crowd of templated lessons stays linear, not quadratic
+MAX_BUCKET_SIZE = 64
+# 21 bands of 6 rows: a pair at 0.75 similarity shares a band (and is
+# compared) 98% of the time, at 0.9 always, at 0.5 28%, at 0.3 under 2%
+LSH_BANDS = 21
+LSH_ROWS = 6
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+# Permutations are h(x) = (a * x + b) mod p; fixed, so stored signatures stay comparable
+_PRIME = (1 << 31) - 1
+_random = random.Random(1729)
+_A = [_random.randrange(1, _PRIME) for _ in range(NUM_PERMUTATIONS)]
+_B = [_random.randrange(0, _PRIME) for _ in range(NUM_PERMUTATIONS)]
+
+def shingles(title: str, title_ar: str, description: str, description_ar: str) -> Set[str]:
+    """Runs of SHINGLE_SIZE characters of the normalized words, per language.
+
+    A text shorter than that is one shingle.
+    """
+    result = set()
+    for text in (f"{title} {description}", f"{title_ar} {description_ar}"):
+        text = " ".join(tokenize(text))
+        if 0 < len(text) < SHINGLE_SIZE:
+            result.add(text)
+        result.update(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+    return result
+
+def minhash(items: Iterable[str], use_numpy: bool = numpy is not None) -> bytes:
+    """MinHash signature of a set of strings, as NUM_PERMUTATIONS packed 32-bit values.
+
+    The fraction of positions where two signatures agree estimates the
+    Jaccard similarity of their sets. An empty set gives b"".
+    """
+    values = [int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little") % _PRIME
+              for item in items]
+    if not values:
+        return b""
+    if use_numpy and numpy is not None:
+        x = numpy.array(values, dtype=numpy.uint64)
+        a = numpy.array(_A, dtype=numpy.uint64)[:, None]
+        b = numpy.array(_B, dtype=numpy.uint64)[:, None]
+        # Below 2**63, so uint64 never wraps
+        return ((a * x + b) % _PRIME).min(axis=1).astype(numpy.uint32).tobytes()
+    return array("I", [min((a * x + b) % _PRIME for x in values) for a, b in zip(_A, _B)]).tobytes()
+
+def perceptual_hash(path: str) -> Optional[int]:
+    """64-bit difference hash of an image; None if it cannot be read.
+
+    The image is shrunk to 9x8 grey pixels and each bit says whether a
+    pixel is brighter than its right neighbour, so re-encoding, resizing
+    or small edits flip few bits.
+    """
+    try:
+        with Image.open(path) as image:
+            # Lets JPEG decode at a fraction of full size
+            image.draft("L", (64, 64))
+            pixels = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+def _bucket_pairs(bucket: List) -> Iterable[Tuple]:
+    bucket = sorted(bucket)
+    if len(bucket) > MAX_BUCKET_SIZE:
+        return ((bucket[0], member) for member in bucket[1:])
+    return combinations(bucket, 2)
+
+def _components(pairs: Dict[Tuple, float]) -> List[Tuple[List, float]]:
+    """Connected components of the pairs' graph, each with its lowest pair score."""
+    parent: Dict = {}
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    for first, second in pairs:
+        parent[find(first)] = find(second)
+    members: Dict = defaultdict(list)
+    lowest: Dict = {}
+    for node in parent:
+        members[find(node)].append(node)
+    for (first, _), score in pairs.items():
+        root = find(first)
+        lowest[root] = min(lowest.get(root, score), score)
+    return [(sorted(nodes), lowest[root]) for root, nodes in members.items()]
+
+class DuplicateDetector:
+    """Finds lessons that are copies of each other, in text or in their image.
+
+    Text: each lesson's character shingles get a MinHash signature. LSH banding
+    puts signatures that agree on a whole band in the same bucket, and
+    only pairs sharing a bucket are compared, so the work follows the
+    number of likely duplicates rather than the square of the catalog.
+
+    Images: each image file gets a perceptual hash. The 64 bits are split
+    into image_distance + 1 bands; two hashes within that distance must
+    agree exactly on at least one band, so bucketing by band finds every
+    such pair without comparing all of them.
+
+    Signatures and hashes are stored in the database, keyed by a hash of
+    the lesson text and by file size and mtime, and only recomputed for
+    lessons and files that changed since the last scan.
+    """
+
+    def __init__(self, db: Database, text_threshold: float = DUPLICATE_TEXT_THRESHOLD,
+                 image_distance: int = DUPLICATE_IMAGE_DISTANCE, use_numpy: bool = numpy is not None):
+        self.db = db
+        self.text_threshold = text_threshold
+        self.image_distance = image_distance
+        self.use_numpy = use_numpy
+
+    def find(self) -> List[DuplicateGroup]:
+        """Text groups first, then image groups; most similar first within each."""
+        titles: Dict[int, Tuple[str, str]] = {}
+        stored = self.db.get_lesson_fingerprints()
+        fingerprints: Dict[int, Tuple[str, bytes]] = {}
+        signatures: Dict[int, bytes] = {}
+        for lesson_id, *texts in self.db.iter_lesson_texts():
+            titles[lesson_id] = (texts[0], texts[1])
+            digest = text_hash(texts)
+            fingerprint = stored.get(lesson_id)
+            if fingerprint is None or fingerprint[0] != digest:
+                fingerprint = fingerprints[lesson_id] = (digest, minhash(shingles(*texts), self.use_numpy))
+            if fingerprint[1]:
+                signatures[lesson_id] = fingerprint[1]
+
+        lessons_by_path: Dict[str, List[int]] = defaultdict(list)
+        for lesson_id, image_path, _ in self.db.iter_media_references():
+            if image_path:
+                lessons_by_path[image_path].append(lesson_id)
+        stored_images = self.db.get_image_hashes()
+        images: Dict[str, Tuple[int, float, Optional[str]]] = {}
+        hashes: Dict[str, int] = {}
+        for path in lessons_by_path:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            cached = stored_images.get(path)
+            if cached is None or cached[0] != stat.st_size or cached[1] != stat.st_mtime:
+                phash = perceptual_hash(path)
+                cached = images[path] = (stat.st_size, stat.st_mtime, None if phash is None else f"{phash:016x}")
+            if cached[2] is not None:
+                hashes[path] = int(cached[2], 16)
+
+        removed_lessons = [lesson_id for lesson_id in stored if lesson_id not in titles]
+        removed_images = [path for path in stored_images if path not in lessons_by_path]
+        if fingerprints or images or removed_lessons or removed_images:
+            self.db.save_fingerprints(fingerprints, images, removed_lessons, removed_images)
+        return self._text_groups(signatures, titles) + self._image_groups(hashes, lessons_by_path, titles)
+
+    def _text_groups(self, signatures: Dict[int, bytes],
+                     titles: Dict[int, Tuple[str, str]]) -> List[DuplicateGroup]:
+        # Bytes per band of packed 32-bit values
+        width = 4 * LSH_ROWS
+        candidates: Set[Tuple[int, int]] = set()
+        for band in range(LSH_BANDS):
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            for lesson_id, signature in signatures.items():
+                buckets[signature[band * width:(band + 1) * width]].append(lesson_id)
+            for bucket in buckets.values():
+                candidates.update(_bucket_pairs(bucket))
+        pairs: Dict[Tuple[int, int], float] = {}
+        for first, second in candidates:
+            a, b = array("I", signatures[first]), array("I", signatures[second])
+            similarity = sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+            if similarity >= self.text_threshold:
+                pairs[first, second] = similarity
+        groups = [DuplicateGroup("text", lesson_ids, [titles[i][0] for i in lesson_ids],
+                                 [titles[i][1] for i in lesson_ids], similarity, [])
+                  for lesson_ids, similarity in _components(pairs)]
+        return sorted(groups, key=lambda group: (-group.similarity, group.lesson_ids))
+
+    def _image_groups(self, hashes: Dict[str, int], lessons_by_path: Dict[str, List[int]],
+                      titles: Dict[int, Tuple[str, str]]) -> List[DuplicateGroup]:
+        bands = self.image_distance + 1
+        bounds = [round(64 * band / bands) for band in range(bands + 1)]
+        candidates: Set[Tuple[str, str]] = set()
+        for start, end in zip(bounds, bounds[1:]):
+            buckets: Dict[int, List[str]] = defaultdict(list)
+            for path, phash in hashes.items():
+                buckets[(phash >> start) & ((1 << (end - start)) - 1)].append(path)
+            for bucket in buckets.values():
+                candidates.update(_bucket_pairs(bucket))
+        pairs: Dict[Tuple[str, str], float] = {}
+        for first, second in candidates:
+            distance = bin(hashes[first] ^ hashes[second]).count("1")
+            if distance <= self.image_distance:
+                pairs[first, second] = 1 - distance / 64
+        groups = []
+        for paths, similarity in _components(pairs):
+            lesson_ids = sorted({lesson_id for path in paths for lesson_id in lessons_by_path[path]})
+            groups.append(DuplicateGroup("image", lesson_ids, [titles[i][0] for i in lesson_ids],
+                                         [titles[i][1] for i in lesson_ids], similarity, paths))
+        return sorted(groups, key=lambda group: (-group.similarity, group.lesson_ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List lessons that look like copies of each other.")
+    parser.add_argument("--db", default="edu_platform.db", help="database file")
+    parser.add_argument("--text-threshold", type=float, default=DUPLICATE_TEXT_THRESHOLD,
+                        help="estimated Jaccard similarity above which texts are near-identical")
+    parser.add_argument("--image-distance", type=int, default=DUPLICATE_IMAGE_DISTANCE,
+                        help="largest perceptual-hash distance (bits of 64) for the same image")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    groups = db.find_duplicates(args.text_threshold, args.image_distance)
+    db.close()
+
+    for group in groups:
+        print(f"{group.kind} ({group.similarity:.0%}): "
+              + ", ".join(f"{lesson_id} {title!r}" for lesson_id, title in zip(group.lesson_ids, group.titles)))
+        for path in group.paths:
+            print(f"    {path}")
+    print(f"{len(groups)} group(s)")
+
+
+if __name__ == '__main__':
+    main()
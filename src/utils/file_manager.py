@@ -1,11 +1,28 @@
 import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterable, List, Optional
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImage
+from src.models.database import MediaInfo
+from src.utils.media_info import probe_media
+
+@dataclass
+class MediaReport:
+    """Media files a clean-up removed, or would remove on a dry run."""
+    dry_run: bool
+    files: List[str] = field(default_factory=list)
+    bytes: int = 0
+    # Paths left alone: missing, or outside the media directory
+    skipped: List[str] = field(default_factory=list)
 
 class FileManager:
     _instance = None
     _base_path: str = "media"
+    _cleanup_executor: Optional[ThreadPoolExecutor] = None
+    _probe_executor: Optional[ThreadPoolExecutor] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -57,6 +74,22 @@ class FileManager:
             print(f"Error saving video: {e}")
             return None
             
+    def save_poster(self, image: QImage, lesson_id: int, max_size: QSize = QSize(640, 360)) -> Optional[str]:
+        """Scale a frame grabbed from a lesson video down to card size and save it as the lesson image."""
+        try:
+            if image.width() > max_size.width() or image.height() > max_size.height():
+                image = image.scaled(max_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"lesson_{lesson_id}_{timestamp}_poster.jpg"
+            dest_path = os.path.join(self._base_path, "images", filename)
+            if not image.save(dest_path, "JPG", 85):
+                raise OSError(f"could not write {dest_path}")
+            return dest_path
+        except Exception as e:
+            print(f"Error saving image: {e}")
+            return None
+
     def delete_media(self, file_path: str) -> bool:
         """Delete a media file"""
         try:
@@ -68,6 +101,68 @@ class FileManager:
             print(f"Error deleting file: {e}")
             return False
             
+    def is_managed(self, file_path: str) -> bool:
+        """Whether a path points inside the media directory this class writes to.
+
+        Lessons may also reference files picked from anywhere on disk; those
+        belong to the user and must never be removed by a clean-up.
+        """
+        base = os.path.realpath(self._base_path)
+        return os.path.realpath(file_path).startswith(base + os.sep)
+
+    def remove_media(self, file_paths: Iterable[str], dry_run: bool = False) -> MediaReport:
+        """Delete managed media files and report the bytes reclaimed.
+
+        With dry_run=True nothing is deleted; the report says what would be.
+        """
+        report = MediaReport(dry_run=dry_run)
+        for file_path in file_paths:
+            if not file_path or not self.is_managed(file_path):
+                report.skipped.append(file_path)
+                continue
+            try:
+                size = os.stat(file_path).st_size
+                if not dry_run:
+                    os.remove(file_path)
+            except FileNotFoundError:
+                report.skipped.append(file_path)
+                continue
+            except OSError as e:
+                print(f"Error deleting file: {e}")
+                report.skipped.append(file_path)
+                continue
+            report.files.append(file_path)
+            report.bytes += size
+        return report
+
+    def remove_media_in_background(self, file_paths: Iterable[str]) -> Future:
+        """Run remove_media on a background thread; the future resolves to its report."""
+        return self.submit_cleanup(self.remove_media, list(file_paths))
+
+    def submit_cleanup(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a media clean-up job on the (single) clean-up thread, after earlier ones."""
+        if FileManager._cleanup_executor is None:
+            FileManager._cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-cleanup")
+        return self._cleanup_executor.submit(fn, *args, **kwargs)
+
+    def probe_media(self, file_path: str) -> Optional[MediaInfo]:
+        """Duration, resolution and bitrate from the file's container headers."""
+        return probe_media(file_path)
+
+    def probe_media_in_background(self, file_path: str) -> Future:
+        """Run probe_media off the GUI thread; the file may sit on a slow share."""
+        return self.submit_probe(self.probe_media, file_path)
+
+    def submit_probe(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a media-probing job on the probe thread."""
+        if FileManager._probe_executor is None:
+            FileManager._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-probe")
+        return self._probe_executor.submit(fn, *args, **kwargs)
+
+    def media_directories(self) -> List[str]:
+        """Directories that hold lesson images and videos."""
+        return [os.path.join(self._base_path, "images"), os.path.join(self._base_path, "videos")]
+
     def cleanup_temp_files(self):
         """Clean up temporary files"""
         temp_dir = os.path.join(self._base_path, "temp")
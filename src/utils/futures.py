@@ -0,0 +1,85 @@
+import itertools
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QCoreApplication, Qt, pyqtSignal
+
+class FutureDispatcher(QObject):
+    """Hands results of background futures to callbacks on the GUI thread.
+
+    Worker threads only emit a signal; the queued slot runs in the thread
+    that owns the dispatcher, so callbacks are free to touch widgets.
+    """
+    _finished = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.pending = 0
+        self._tokens = itertools.count(1)
+        self._latest: Dict[Tuple[int, str], int] = {}
+        self._finished.connect(self._dispatch, Qt.ConnectionType.QueuedConnection)
+
+    def deliver(self, future: Future, callback: Callable[[Any], None], owner: Optional[QObject] = None,
+                tag: Optional[str] = None, on_error: Optional[Callable[[BaseException], None]] = None):
+        """Call callback(result) on the GUI thread once future is done.
+
+        The callback is skipped if owner has been deleted by then, or if a
+        newer future was delivered for the same owner and tag (so a slow,
+        outdated query can never overwrite a newer result). Exceptions go to
+        on_error, or are printed when no handler is given.
+        """
+        key = token = None
+        if tag is not None:
+            key = (id(owner), tag)
+            token = self._latest[key] = next(self._tokens)
+        self.pending += 1
+        payload = (callback, owner, key, token, on_error)
+        future.add_done_callback(lambda done: self._finished.emit((done, payload)))
+
+    def _dispatch(self, item):
+        future, (callback, owner, key, token, on_error) = item
+        self.pending -= 1
+        if key is not None:
+            if self._latest.get(key) != token:
+                return
+            del self._latest[key]
+        if future.cancelled() or (owner is not None and sip.isdeleted(owner)):
+            return
+        error = future.exception()
+        if error is None:
+            callback(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            print(f"Database error: {error}")
+
+
+_dispatcher: Optional[FutureDispatcher] = None
+
+def get_dispatcher() -> FutureDispatcher:
+    """The shared dispatcher; created on first use, which must be on the GUI thread."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = FutureDispatcher()
+    return _dispatcher
+
+def deliver(future: Future, callback: Callable[[Any], None], owner: Optional[QObject] = None,
+            tag: Optional[str] = None, on_error: Optional[Callable[[BaseException], None]] = None):
+    """Shortcut for get_dispatcher().deliver(...)."""
+    get_dispatcher().deliver(future, callback, owner=owner, tag=tag, on_error=on_error)
+
+def wait_for_results(timeout: float = 10.0) -> bool:
+    """Process events until every delivered future has reached its callback.
+
+    For scripts and benchmarks that need a window to be fully loaded before
+    measuring it. Returns False if the timeout expired first.
+    """
+    dispatcher = get_dispatcher()
+    deadline = time.monotonic() + timeout
+    while dispatcher.pending:
+        if time.monotonic() > deadline:
+            return False
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    return True
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# Minimal HTTP/1.1 plumbing shared by the loopback media server and the
+# catalog API server: keep-alive connections, Content-Length bodies only.
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 201: "Created", 206: "Partial Content", 304: "Not Modified",
+               400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 416: "Range Not Satisfiable", 500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(status)
+        self.status = status
+        self.headers = headers or {}
+
+@dataclass
+class HttpRequest:
+    method: str
+    path: str
+    query: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    keep_alive: bool = True
+
+    def json(self) -> Any:
+        """The body parsed as JSON; HttpError(400) if it is not."""
+        try:
+            return json.loads(self.body or b"null")
+        except ValueError:
+            raise HttpError(400)
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+    """Read the next request on a connection; None once the client has gone."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(400)
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400)
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    body = b""
+    length = headers.get("content-length")
+    if length:
+        if not length.isdigit():
+            raise HttpError(400)
+        if int(length) > MAX_BODY_BYTES:
+            raise HttpError(413)
+        body = await reader.readexactly(int(length))
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query, keep_blank_values=True))
+    return HttpRequest(method, unquote(url.path), query, headers, body, keep_alive)
+
+async def send_head(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], keep_alive: bool):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+async def send_response(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                        body: bytes, keep_alive: bool):
+    await send_head(writer, status, {**headers, "Content-Length": str(len(body))}, keep_alive)
+    if body:
+        writer.write(body)
+        await writer.drain()
+
+async def serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                           handle: Callable[[HttpRequest, asyncio.StreamWriter], Awaitable[None]], name: str):
+    """Answer requests on one connection with handle() until either side closes it.
+
+    An HttpError raised by handle() before it has written anything becomes
+    an empty error response.
+    """
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except HttpError as e:
+                await send_response(writer, e.status, e.headers, b"", False)
+                break
+            if request is None:
+                break
+            try:
+                await handle(request, writer)
+            except HttpError as e:
+                await send_response(writer, e.status, e.headers, b"", request.keep_alive)
+            if not request.keep_alive:
+                break
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    except Exception as e:
+        print(f"{name} error: {e}")
+    finally:
+        writer.close()
@@ -0,0 +1,158 @@
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional, Tuple
+from src.models.database import Database, MediaInfo
+
+# ISO base media files (MP4, M4V, MOV) share the same box structure
+ISO_MEDIA_EXTENSIONS = {".mp4", ".m4v", ".mov", ".3gp"}
+
+def iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, payload offset, payload end) for the boxes in [start, end).
+
+    Only the 8 or 16 byte headers are read; payloads are skipped with a seek,
+    so walking past a multi-gigabyte 'mdat' costs nothing.
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack(">Q", large)[0]
+            header_size = 16
+        elif size == 0:
+            # Box runs to the end of the enclosing container
+            size = end - offset
+        if size < header_size:
+            return
+        yield box_type, offset + header_size, min(offset + size, end)
+        offset += size
+
+def read_mvhd(f: BinaryIO, offset: int) -> Optional[float]:
+    """Movie duration in seconds from an 'mvhd' payload."""
+    f.seek(offset)
+    version = f.read(1)
+    if not version:
+        return None
+    if version[0] == 1:
+        f.seek(offset + 4 + 16)
+        data = f.read(12)
+        if len(data) < 12:
+            return None
+        timescale, duration = struct.unpack(">IQ", data)
+    else:
+        f.seek(offset + 4 + 8)
+        data = f.read(8)
+        if len(data) < 8:
+            return None
+        timescale, duration = struct.unpack(">II", data)
+    return duration / timescale if timescale else None
+
+def read_tkhd_size(f: BinaryIO, offset: int) -> Tuple[int, int]:
+    """Presentation width and height (16.16 fixed point) from a 'tkhd' payload."""
+    f.seek(offset)
+    version = f.read(1)
+    if not version:
+        return 0, 0
+    # version/flags, times, track id, reserved, duration, then 52 bytes of
+    # reserved/layer/group/volume/matrix before width and height
+    skip = 4 + (32 if version[0] == 1 else 20) + 52
+    f.seek(offset + skip)
+    data = f.read(8)
+    if len(data) < 8:
+        return 0, 0
+    width, height = struct.unpack(">II", data)
+    return width >> 16, height >> 16
+
+def read_handler(f: BinaryIO, mdia: Tuple[int, int]) -> bytes:
+    """The handler type ('vide', 'soun', ...) of a track's 'mdia' box."""
+    for box_type, start, end in iter_boxes(f, *mdia):
+        if box_type == b"hdlr":
+            f.seek(start + 8)
+            return f.read(4)
+    return b""
+
+def probe_iso_media(f: BinaryIO, file_size: int) -> Tuple[Optional[float], int, int]:
+    """Duration and video resolution of an MP4/MOV file, read from its 'moov' box."""
+    duration, width, height = None, 0, 0
+    for box_type, start, end in iter_boxes(f, 0, file_size):
+        if box_type != b"moov":
+            continue
+        for child, child_start, child_end in iter_boxes(f, start, end):
+            if child == b"mvhd":
+                duration = read_mvhd(f, child_start)
+            elif child == b"trak":
+                size, mdia = (0, 0), None
+                for track_box, track_start, track_end in iter_boxes(f, child_start, child_end):
+                    if track_box == b"tkhd":
+                        size = read_tkhd_size(f, track_start)
+                    elif track_box == b"mdia":
+                        mdia = (track_start, track_end)
+                if mdia and not width and read_handler(f, mdia) == b"vide":
+                    width, height = size
+        break
+    return duration, width, height
+
+def probe_media(path: str) -> Optional[MediaInfo]:
+    """Read duration, resolution and bitrate from a media file's headers.
+
+    Only container headers are read, never the media data. Formats other
+    than MP4/MOV get size and modification time only. Returns None if the
+    file cannot be read.
+    """
+    try:
+        stat = os.stat(path)
+        info = MediaInfo(path=path, size=stat.st_size, mtime=stat.st_mtime,
+                         container=os.path.splitext(path)[1].lstrip(".").lower())
+        if os.path.splitext(path)[1].lower() in ISO_MEDIA_EXTENSIONS:
+            with open(path, "rb") as f:
+                duration, width, height = probe_iso_media(f, stat.st_size)
+            info.duration = duration
+            info.width = width or None
+            info.height = height or None
+            if duration:
+                info.bitrate = int(stat.st_size * 8 / duration)
+        return info
+    except (OSError, struct.error) as e:
+        print(f"Error reading media info: {e}")
+        return None
+
+def backfill_media_info(db: Database, batch_size: int = 50) -> int:
+    """Probe every lesson video that has no media_info row yet; returns how many were stored."""
+    stored = 0
+    batch = []
+    for path in db.get_unprobed_videos():
+        info = probe_media(path)
+        if info:
+            batch.append(info)
+        if len(batch) >= batch_size:
+            db.save_media_info(batch)
+            stored += len(batch)
+            batch = []
+    if batch:
+        db.save_media_info(batch)
+        stored += len(batch)
+    return stored
+
+def format_duration(seconds: Optional[float]) -> str:
+    """'m:ss' or 'h:mm:ss'; empty when unknown."""
+    if not seconds:
+        return ""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+def format_size(size: Optional[int]) -> str:
+    if not size:
+        return ""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,154 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from src.models.database import Database
+from src.utils.file_manager import FileManager
+
+# Files younger than this are never treated as orphans: an edit copies the
+# new file into media/ before the lesson row is updated to point at it
+DEFAULT_GRACE_PERIOD = 24 * 60 * 60
+
+@dataclass
+class ReconcileReport:
+    """Result of comparing the media directories with the lessons table."""
+    scanned_files: int = 0
+    scanned_bytes: int = 0
+    lessons: int = 0
+    # Unreferenced files older than the grace period
+    orphaned: List[str] = field(default_factory=list)
+    orphaned_bytes: int = 0
+    # (lesson id, path) for references whose file does not exist
+    missing: List[Tuple[int, str]] = field(default_factory=list)
+    reclaimed_files: int = 0
+    reclaimed_bytes: int = 0
+
+class MediaReconciler:
+    """Finds media files no lesson uses, and lessons whose media is gone.
+
+    scan() lists the media directories with os.scandir and streams the
+    lessons table in batches, so neither side is loaded at once. reclaim()
+    deletes orphans in bounded batches, re-checking each batch against the
+    database first and pausing between batches; run_in_background() does
+    both on FileManager's clean-up thread.
+    """
+
+    def __init__(self, db: Database, file_manager: Optional[FileManager] = None,
+                 grace_period: float = DEFAULT_GRACE_PERIOD, batch_size: int = 100, pause: float = 0.05):
+        self.db = db
+        self.file_manager = file_manager or FileManager()
+        self.grace_period = grace_period
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def scan(self) -> ReconcileReport:
+        """Compare files on disk with lesson references without changing anything."""
+        report = ReconcileReport()
+        cutoff = time.time() - self.grace_period
+        # Every file on disk by absolute path -> (path as listed, size, old enough)
+        on_disk: Dict[str, Tuple[str, int, bool]] = {}
+        for directory in self.file_manager.media_directories():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        on_disk[os.path.abspath(entry.path)] = (entry.path, stat.st_size, stat.st_mtime < cutoff)
+                        report.scanned_files += 1
+                        report.scanned_bytes += stat.st_size
+            except FileNotFoundError:
+                continue
+
+        unreferenced = dict(on_disk)
+        for lesson_id, image_path, video_path in self.db.iter_media_references():
+            report.lessons += 1
+            for path in (image_path, video_path):
+                if not path:
+                    continue
+                key = os.path.abspath(path)
+                unreferenced.pop(key, None)
+                # Managed files were all listed above; only stat the others
+                exists = key in on_disk if self.file_manager.is_managed(path) else os.path.exists(path)
+                if not exists:
+                    report.missing.append((lesson_id, path))
+
+        for path, size, old_enough in unreferenced.values():
+            if old_enough:
+                report.orphaned.append(path)
+                report.orphaned_bytes += size
+        report.orphaned.sort()
+        return report
+
+    def reclaim(self, report: ReconcileReport, max_files: Optional[int] = None,
+                stop: Optional[threading.Event] = None) -> ReconcileReport:
+        """Delete the report's orphans batch by batch, updating its reclaimed totals.
+
+        Each batch is checked against the lessons table right before it is
+        deleted, so a file that became referenced since the scan is kept.
+        Stops early after max_files or when stop is set.
+        """
+        candidates = report.orphaned[:max_files] if max_files is not None else report.orphaned
+        for start in range(0, len(candidates), self.batch_size):
+            if stop is not None and stop.is_set():
+                break
+            batch = candidates[start:start + self.batch_size]
+            # Compare absolute paths, as scan() does. A lesson may store a
+            # managed file relative (as FileManager saves it) or absolute (as
+            # a file dialog returns it), so both spellings are looked up.
+            keys = {path: os.path.abspath(path) for path in batch}
+            referenced = self.db.referenced_media(set(batch) | set(keys.values()))
+            still_used = {os.path.abspath(path) for path in referenced}
+            removed = self.file_manager.remove_media(path for path in batch if keys[path] not in still_used)
+            report.reclaimed_files += len(removed.files)
+            report.reclaimed_bytes += removed.bytes
+            # Leave the disk (and the GUI process) some breathing room
+            time.sleep(self.pause)
+        return report
+
+    def run(self, reclaim: bool = False, max_files: Optional[int] = None,
+            stop: Optional[threading.Event] = None) -> ReconcileReport:
+        report = self.scan()
+        if reclaim:
+            self.reclaim(report, max_files=max_files, stop=stop)
+        return report
+
+    def run_in_background(self, reclaim: bool = False, max_files: Optional[int] = None,
+                          stop: Optional[threading.Event] = None) -> Future:
+        """Scan (and optionally reclaim) on the clean-up thread; resolves to the report."""
+        return self.file_manager.submit_cleanup(self.run, reclaim, max_files, stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find (and optionally delete) media files no lesson uses.")
+    parser.add_argument("--db", default="edu_platform.db", help="database file")
+    parser.add_argument("--reclaim", action="store_true", help="delete orphaned files (default: report only)")
+    parser.add_argument("--max-files", type=int, help="delete at most this many files")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--grace-hours", type=float, default=DEFAULT_GRACE_PERIOD / 3600,
+                        help="ignore files modified within this many hours")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    reconciler = MediaReconciler(db, grace_period=args.grace_hours * 3600, batch_size=args.batch_size)
+    report = reconciler.run(reclaim=args.reclaim, max_files=args.max_files)
+    db.close()
+
+    mb = 1024 * 1024
+    print(f"Scanned {report.scanned_files} files ({report.scanned_bytes / mb:.1f} MB) "
+          f"against {report.lessons} lessons")
+    print(f"Orphaned: {len(report.orphaned)} files ({report.orphaned_bytes / mb:.1f} MB)")
+    for path in report.orphaned:
+        print(f"    {path}")
+    print(f"Missing: {len(report.missing)} references")
+    for lesson_id, path in report.missing:
+        print(f"    lesson {lesson_id}: {path}")
+    if args.reclaim:
+        print(f"Reclaimed: {report.reclaimed_files} files ({report.reclaimed_bytes / mb:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
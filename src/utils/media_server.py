@@ -0,0 +1,383 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import quote
+from src.utils.file_manager import FileManager
+from src.utils.http_server import (MAX_HEADER_BYTES, HttpError, HttpRequest, send_head,
+                                   serve_connection)
+
+# Files are read (and cached) in blocks of this size when sendfile is not used
+BLOCK_SIZE = 1 << 20
+# Blocks fetched ahead of a sequential reader
+READ_AHEAD_BLOCKS = 4
+# Memory the block cache may hold, shared by every file
+BLOCK_CACHE_BYTES = 64 << 20
+# Open file handles kept for reuse across requests and connections
+MAX_OPEN_FILES = 16
+
+class OpenFile:
+    """A file descriptor shared by every request for one file version."""
+    __slots__ = ("path", "fd", "size", "mtime_ns", "etag", "users", "closed", "lock")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        stat = os.fstat(self.fd)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.etag = f'"{self.size:x}-{self.mtime_ns:x}"'
+        self.users = 0
+        self.closed = False
+        # Only needed where os.pread is missing and reads must seek
+        self.lock = threading.Lock()
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self.fd, size, offset)
+        with self.lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            return os.read(self.fd, size)
+
+class FileHandleCache:
+    """LRU cache of open files, so seeks and parallel clients do not re-open the file.
+
+    A handle is reopened when the file's size or mtime changes, and an
+    evicted handle is only closed once no response is still using it.
+    """
+
+    def __init__(self, max_files: int = MAX_OPEN_FILES):
+        self.max_files = max_files
+        self._files: "OrderedDict[str, OpenFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, path: str) -> OpenFile:
+        stat = os.stat(path)
+        with self._lock:
+            handle = self._files.get(path)
+            if handle is not None and (handle.size, handle.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                self._files.move_to_end(path)
+            else:
+                if handle is not None:
+                    self._evict(path)
+                handle = self._files[path] = OpenFile(path)
+                while len(self._files) > self.max_files:
+                    self._evict(next(iter(self._files)))
+            handle.users += 1
+            return handle
+
+    def retain(self, handle: OpenFile):
+        """Keep an acquired handle open for one more user."""
+        with self._lock:
+            handle.users += 1
+
+    def release(self, handle: OpenFile):
+        with self._lock:
+            handle.users -= 1
+            if handle.closed and handle.users == 0:
+                os.close(handle.fd)
+
+    def _evict(self, path: str):
+        handle = self._files.pop(path)
+        handle.closed = True
+        if handle.users == 0:
+            os.close(handle.fd)
+
+    def close(self):
+        with self._lock:
+            for path in list(self._files):
+                self._evict(path)
+
+class BlockCache:
+    """Bounded LRU cache of file blocks, keyed by file version and block index."""
+
+    def __init__(self, max_bytes: int = BLOCK_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blocks: "OrderedDict[Tuple[str, str, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, handle: OpenFile, index: int) -> Optional[bytes]:
+        key = (handle.path, handle.etag, index)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+
+    def contains(self, handle: OpenFile, index: int) -> bool:
+        with self._lock:
+            return (handle.path, handle.etag, index) in self._blocks
+
+    def read(self, handle: OpenFile, index: int) -> bytes:
+        """Return a block, reading and caching it on a miss (blocking)."""
+        block = self.get(handle, index)
+        if block is None:
+            block = handle.read_at(index * BLOCK_SIZE, BLOCK_SIZE)
+            self.put(handle, index, block)
+        return block
+
+    def put(self, handle: OpenFile, index: int, block: bytes):
+        key = (handle.path, handle.etag, index)
+        with self._lock:
+            if key in self._blocks:
+                return
+            self._blocks[key] = block
+            self.size += len(block)
+            while self.size > self.max_bytes and self._blocks:
+                _, evicted = self._blocks.popitem(last=False)
+                self.size -= len(evicted)
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(first, last) byte of a single 'bytes=' range, or None to send the whole file.
+
+    Raises HttpError(416) if the range lies outside the file. Multi-range
+    requests are answered with the whole file, which HTTP allows.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise HttpError(416, {"Content-Range": f"bytes */{size}"})
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise HttpError(416, {"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+class MediaServer:
+    """Serves lesson media to the video player over loopback HTTP.
+
+    QMediaPlayer seeks by sending Range requests, so it no longer reads a
+    file (possibly on a slow share) from the start. Open handles are
+    shared between requests and connections through a FileHandleCache.
+    Files inside the media directory are sent with zero-copy sendfile.
+    Files elsewhere go through a BlockCache that reads a few blocks ahead
+    of a sequential reader. Responses carry an ETag built from size and
+    mtime and honour If-None-Match and If-Range.
+
+    The server binds to 127.0.0.1 on a free port and only serves files
+    registered through url_for(), never arbitrary paths. Each path has one
+    token, dropped once every url_for() has been matched by a release().
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MediaServer, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.host = "127.0.0.1"
+        self.port: Optional[int] = None
+        self.handles = FileHandleCache()
+        self.blocks = BlockCache()
+        # token -> [path, url_for() calls not yet released]
+        self._paths: Dict[str, list] = {}
+        self._paths_lock = threading.Lock()
+        self._prefetching: Set[Tuple[str, str, int]] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started = threading.Event()
+
+    def start(self):
+        """Start the server thread (once) and wait until it is listening."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._started.clear()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="media-read")
+        self._thread = threading.Thread(target=self._run, name="media-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def url_for(self, path: str) -> Optional[str]:
+        """The loopback URL a player can stream path from; None if the server is not running."""
+        self.start()
+        if self.port is None:
+            return None
+        path = os.path.abspath(path)
+        token = self._token(path)
+        with self._paths_lock:
+            self._paths.setdefault(token, [path, 0])[1] += 1
+        return f"http://{self.host}:{self.port}/media/{token}/{quote(os.path.basename(path))}"
+
+    def release(self, path: str):
+        """Undo one url_for(path); the URL stops working after the last one."""
+        token = self._token(os.path.abspath(path))
+        with self._paths_lock:
+            entry = self._paths.get(token)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._paths[token]
+
+    @staticmethod
+    def _token(path: str) -> str:
+        return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+
+    def stop(self):
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        # Reads already running still finish; _prefetched skips the closed loop
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._prefetching.clear()
+        self.handles.close()
+        self._thread = None
+        self.port = None
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, 0, limit=MAX_HEADER_BYTES))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            print(f"Error starting media server: {e}")
+            self._started.set()
+            loop.close()
+            return
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            # Drop players still connected (kept-alive or mid-response)
+            connections = asyncio.all_tasks(loop)
+            for task in connections:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*connections, return_exceptions=True))
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await serve_connection(reader, writer, self._handle_request, "Media server")
+
+    async def _handle_request(self, request: HttpRequest, writer: asyncio.StreamWriter):
+        if request.method not in ("GET", "HEAD"):
+            raise HttpError(405, {"Allow": "GET, HEAD"})
+        parts = request.path.split("/")
+        if len(parts) < 3 or parts[1] != "media":
+            raise HttpError(404)
+        with self._paths_lock:
+            entry = self._paths.get(parts[2])
+        if entry is None:
+            raise HttpError(404)
+        path = entry[0]
+        try:
+            handle = self.handles.acquire(path)
+        except OSError:
+            raise HttpError(404)
+        try:
+            await self._send_file(writer, handle, request.method, request.headers, request.keep_alive)
+        finally:
+            self.handles.release(handle)
+
+    async def _send_file(self, writer: asyncio.StreamWriter, handle: OpenFile, method: str,
+                         headers: Dict[str, str], keep_alive: bool):
+        common = {
+            "ETag": handle.etag,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "no-cache",
+        }
+        if handle.etag in headers.get("if-none-match", ""):
+            await send_head(writer, 304, common, keep_alive)
+            return
+
+        byte_range = None
+        if "range" in headers and headers.get("if-range", handle.etag) == handle.etag:
+            byte_range = parse_range(headers["range"], handle.size)
+        if byte_range is None:
+            status, start, end = 200, 0, handle.size - 1
+        else:
+            status, (start, end) = 206, byte_range
+            common["Content-Range"] = f"bytes {start}-{end}/{handle.size}"
+        length = end - start + 1 if handle.size else 0
+        common["Content-Type"] = mimetypes.guess_type(handle.path)[0] or "application/octet-stream"
+        common["Content-Length"] = str(length)
+        await send_head(writer, status, common, keep_alive)
+        if method == "HEAD" or length == 0:
+            return
+
+        if FileManager().is_managed(handle.path) and await self._sendfile(writer, handle, start, length):
+            return
+        await self._send_blocks(writer, handle, start, length)
+
+    async def _sendfile(self, writer: asyncio.StreamWriter, handle: OpenFile, start: int, length: int) -> bool:
+        """Zero-copy from the page cache to the socket; False if the platform cannot."""
+        loop = asyncio.get_running_loop()
+        # A private file object over the shared descriptor; sendfile passes
+        # explicit offsets, so concurrent responses do not disturb each other
+        with open(handle.fd, "rb", closefd=False) as f:
+            try:
+                await loop.sendfile(writer.transport, f, start, length, fallback=False)
+            except (NotImplementedError, asyncio.SendfileNotAvailableError):
+                return False
+        return True
+
+    async def _send_blocks(self, writer: asyncio.StreamWriter, handle: OpenFile, start: int, length: int):
+        loop = asyncio.get_running_loop()
+        end = start + length
+        offset = start
+        while offset < end:
+            index = offset // BLOCK_SIZE
+            block = self.blocks.get(handle, index)
+            if block is None:
+                block = await loop.run_in_executor(self._executor, self.blocks.read, handle, index)
+            self._read_ahead(handle, index + 1)
+            chunk = block[offset - index * BLOCK_SIZE:end - index * BLOCK_SIZE]
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+            offset += len(chunk)
+
+    def _read_ahead(self, handle: OpenFile, first: int):
+        """Start fetching the next blocks into the cache while the current one is sent."""
+        last_block = (handle.size - 1) // BLOCK_SIZE
+        for index in range(first, min(first + READ_AHEAD_BLOCKS, last_block + 1)):
+            key = (handle.path, handle.etag, index)
+            if key in self._prefetching or self.blocks.contains(handle, index):
+                continue
+            self._prefetching.add(key)
+            # The handle must stay open until the prefetch has read from it
+            self.handles.retain(handle)
+            future = self._executor.submit(self.blocks.read, handle, index)
+            future.add_done_callback(lambda done, key=key: self._prefetched(handle, key))
+
+    def _prefetched(self, handle: OpenFile, key: Tuple[str, str, int]):
+        self.handles.release(handle)
+        loop = self._loop
+        if loop.is_closed():
+            # stop() has run and cleared the set
+            return
+        try:
+            loop.call_soon_threadsafe(self._prefetching.discard, key)
+        except RuntimeError:
+            # The loop closed after the check above
+            pass
@@ -1,70 +1,237 @@
-from typing import Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
 from PyQt6.QtWidgets import QMainWindow
-from src.models.database import Database, User
+from src.models.database import Database, Lesson, User
+from src.models.async_database import AsyncDatabase
+
+WindowKey = Tuple[str, Optional[int]]
 
 class NavigationManager:
     _instance = None
     _current_window: Optional[QMainWindow] = None
     _db: Optional[Database] = None
-    
+    _async_db: Optional[AsyncDatabase] = None
+    _windows: Dict[WindowKey, QMainWindow] = {}
+    _detail_window: Optional[QMainWindow] = None
+    # A forgotten window that was still on screen, closed once navigation leaves it
+    _retired_window: Optional[QMainWindow] = None
+    _poster_queue = None
+    _progress_tracker = None
+    _view_aggregator = None
+    _related_index = None
+    _posters_on_login = False
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(NavigationManager, cls).__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         if self._db is None:
             self._db = Database()
-            
+
+    @classmethod
+    def use_database(cls, db):
+        """Use db (e.g. a RemoteDatabase) instead of opening the local database file."""
+        cls._db = db
+
     @property
     def current_window(self) -> Optional[QMainWindow]:
         return self._current_window
-        
+
+    def _show_window(self, key: WindowKey, factory: Callable[[], QMainWindow]):
+        """Show the cached window for key, building it with factory on first use.
+
+        Windows are hidden rather than closed when navigating away, so coming
+        back to one only runs its ``refresh`` hook (if it defines one) instead
+        of rebuilding the whole widget tree and reloading its data.
+        """
+        window = self._windows.get(key)
+        if window is None:
+            window = factory()
+            self._windows[key] = window
+        elif hasattr(window, "refresh"):
+            window.refresh()
+
+        previous = self._current_window
+        if previous is not None and previous is not window:
+            previous.hide()
+        self._current_window = window
+        window.show()
+        retired = self._retired_window
+        if retired is not None and retired is previous and retired is not window:
+            NavigationManager._retired_window = None
+            retired.close()
+            retired.deleteLater()
+
     def show_login(self):
-        if self._current_window:
-            self._current_window.close()
         # Import here to avoid circular import
         from src.views.login_window import LoginWindow
-        self._current_window = LoginWindow(self._db)
-        self._current_window.show()
-        
+        self._show_window(("login", None), lambda: LoginWindow(self._db))
+
     def show_registration(self):
-        if self._current_window:
-            self._current_window.close()
         # Import here to avoid circular import
         from src.views.registration_window import RegistrationWindow
-        self._current_window = RegistrationWindow(self._db)
-        self._current_window.show()
-        
+        self._show_window(("registration", None), lambda: RegistrationWindow(self._db))
+
     def show_dashboard(self, user: User):
-        if self._current_window:
-            self._current_window.close()
-            
+        if self._posters_on_login and user.role in ("teacher", "admin"):
+            # Only their session may list and update the lessons
+            self.queue_poster_frames()
         if user.role == "admin":
             # Import here to avoid circular import
             from src.views.admin_dashboard import AdminDashboard
-            self._current_window = AdminDashboard(user)
+            self._show_window(("admin", user.id), lambda: AdminDashboard(user))
         elif user.role == "teacher":
-            # Import here to avoid circular import
-            from src.views.teacher_dashboard import TeacherDashboard
-            self._current_window = TeacherDashboard(self._db, user)
+            self.show_teacher_dashboard(user)
         else:
             # Import here to avoid circular import
             from src.views.student_dashboard import StudentDashboard
-            self._current_window = StudentDashboard(self._db, user)
-            
-        self._current_window.show()
-        
+            self._show_window(("student", user.id), lambda: StudentDashboard(self._db, user))
+
     def show_teacher_dashboard(self, user: User):
-        if self._current_window:
-            self._current_window.close()
         # Import here to avoid circular import
         from src.views.teacher_dashboard import TeacherDashboard
-        self._current_window = TeacherDashboard(self._db, user)
-        self._current_window.show()
-        
+        self._show_window(("teacher", user.id), lambda: TeacherDashboard(self._db, user))
+
+    def show_lesson_detail(self, lesson: Lesson, language: str, user_id: Optional[int] = None):
+        """Show a lesson in the shared detail window.
+
+        A single LessonDetailWindow (and its media player) is created on first
+        use and then only has its content swapped, so browsing many lessons
+        does not keep allocating players and video widgets. With a user_id,
+        playback resumes where that user left off and their position is saved.
+        """
+        if self._detail_window is None:
+            # Import here to avoid circular import
+            from src.views.lesson_detail import LessonDetailWindow
+            self._detail_window = LessonDetailWindow(lesson, language, user_id, self.get_progress_tracker())
+        else:
+            self._detail_window.set_lesson(lesson, language, user_id)
+        self._detail_window.show()
+        self._detail_window.raise_()
+        self._detail_window.activateWindow()
+
+    def notify_lessons_changed(self, lesson_ids: Optional[Iterable[int]] = None):
+        """Tell every cached window that some lessons were added, edited or deleted.
+
+        Pass the affected ids so windows only re-fetch those lessons, or None
+        when the change cannot be narrowed down (e.g. a user and all of their
+        lessons were deleted) to make them reload everything.
+        """
+        lesson_ids = None if lesson_ids is None else set(lesson_ids)
+        for window in self._windows.values():
+            if hasattr(window, "invalidate_lessons"):
+                window.invalidate_lessons(lesson_ids)
+
+    def forget_user(self, user_id: int):
+        """Drop every cached window that belongs to the given user."""
+        for key in [key for key in self._windows if key[1] == user_id]:
+            window = self._windows.pop(key)
+            if window is self._current_window:
+                # Still on screen (e.g. an admin edited their own account)
+                NavigationManager._retired_window = window
+                continue
+            window.close()
+            window.deleteLater()
+
     def logout(self):
+        """Go back to the login window and drop the logged-out user's windows.
+
+        On a shared machine many users log in over a day; only the current
+        user's windows stay cached.
+        """
+        user_ids = {key[1] for key, window in self._windows.items()
+                    if window is self._current_window and key[1] is not None}
+        if self._detail_window is not None and self._detail_window.isVisible():
+            # Saves their position and view before the session ends
+            self._detail_window.close()
         self.show_login()
-        
+        for user_id in user_ids:
+            self.forget_user(user_id)
+        self._db.logout()
+
     def get_database(self) -> Database:
-        return self._db 
\ No newline at end of file
+        return self._db
+
+    def get_async_database(self) -> AsyncDatabase:
+        """The background-thread facade windows use instead of querying on the GUI thread."""
+        if self._async_db is None or self._async_db.db is not self._db:
+            NavigationManager._async_db = AsyncDatabase(self._db)
+        return self._async_db
+
+    def get_progress_tracker(self):
+        """The shared write-behind buffer for video watch positions."""
+        # Import here to avoid circular import
+        from src.utils.progress_tracker import ProgressTracker
+        if self._progress_tracker is None or self._progress_tracker.db_async is not self.get_async_database():
+            NavigationManager._progress_tracker = ProgressTracker(self.get_async_database())
+        return self._progress_tracker
+
+    def start_view_aggregator(self):
+        """Keep the view analytics rollups current from a background thread."""
+        # Import here to avoid circular import
+        from src.utils.view_aggregator import ViewAggregator
+        if self._view_aggregator is None:
+            NavigationManager._view_aggregator = ViewAggregator(self._db)
+            self._view_aggregator.start()
+
+    def start_related_index(self):
+        """Keep the related-lessons lists current as lessons change, from a background thread."""
+        # Import here to avoid circular import
+        from src.utils.related_lessons import RelatedLessonsIndex
+        if self._related_index is None:
+            NavigationManager._related_index = RelatedLessonsIndex(self._db)
+            self._related_index.start()
+
+    def backfill_media_info(self):
+        """Probe, in the background, lesson videos stored before media info existed."""
+        # Import here to avoid circular import
+        from src.utils.file_manager import FileManager
+        from src.utils.futures import deliver
+        from src.utils.media_info import backfill_media_info
+        future = FileManager().submit_probe(backfill_media_info, self._db)
+        # Cards pick up durations and sizes on their next refresh
+        deliver(future, lambda stored: stored and self.notify_lessons_changed())
+
+    def queue_poster_frames(self, lessons: Optional[Iterable[Tuple[int, str]]] = None):
+        """Extract a poster frame for lessons that have a video but no image.
+
+        Pass (lesson_id, video_path) pairs, or None to queue every such lesson.
+        """
+        # Import here to avoid circular import
+        from src.utils.futures import deliver
+        from src.utils.poster_frames import PosterFrameQueue
+        if self._poster_queue is None:
+            NavigationManager._poster_queue = PosterFrameQueue(
+                self.get_async_database(), on_saved=lambda lesson_id: self.notify_lessons_changed([lesson_id]))
+        if lessons is None:
+            # Lessons already queued are skipped, so this may run again
+            deliver(self.get_async_database().read(self._db.get_lessons_without_image),
+                    self._poster_queue.enqueue)
+        else:
+            self._poster_queue.enqueue(lessons)
+
+    def queue_poster_frames_on_login(self):
+        """Queue poster frames whenever a teacher or admin logs in (for a catalog server client)."""
+        NavigationManager._posters_on_login = True
+
+    def shutdown(self):
+        """Stop the background database threads, flushing any queued writes."""
+        if self._poster_queue is not None:
+            self._poster_queue.clear()
+        if self._progress_tracker is not None:
+            if self._detail_window is not None:
+                self._detail_window.end_view()
+            # Queued before the database closes, so close() writes it
+            self._progress_tracker.flush()
+        if self._view_aggregator is not None:
+            self._view_aggregator.stop()
+        if self._related_index is not None:
+            self._related_index.stop()
+        # Import here to avoid circular import
+        from src.utils.media_server import MediaServer
+        MediaServer().stop()
+        if self._async_db is not None:
+            self._async_db.shutdown()
+        if self._db is not None:
+            self._db.close()
\ No newline at end of file
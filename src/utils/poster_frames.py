@@ -0,0 +1,137 @@
+from collections import deque
+from typing import Callable, Deque, Iterable, Optional, Set, Tuple
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer, QVideoFrame, QVideoSink
+from src.models.async_database import AsyncDatabase
+from src.utils.file_manager import FileManager
+from src.utils.futures import deliver
+
+# Where the poster frame is taken from: this far into the video (skipping
+# fade-ins and title cards), but never later than MAX_POSTER_POSITION_MS
+POSTER_POSITION = 0.1
+MAX_POSTER_POSITION_MS = 30_000
+
+# Give up on a video that has not produced a frame in this long
+FRAME_TIMEOUT_MS = 15_000
+
+class PosterFrameQueue(QObject):
+    """Gives lessons that have a video but no image a frame of the video as image.
+
+    Lessons are processed one at a time by a single windowless QMediaPlayer
+    rendering into a QVideoSink, so decoding stays on Qt's media threads and
+    at most one video is open. The grabbed frame is scaled and saved by
+    FileManager on its probe thread and then written to the lesson, only if
+    it still has no image, through the write queue.
+    """
+    # lesson id, saved image path
+    poster_saved = pyqtSignal(int, str)
+
+    def __init__(self, db_async: AsyncDatabase, file_manager: Optional[FileManager] = None,
+                 on_saved: Optional[Callable[[int], None]] = None):
+        super().__init__()
+        self.db_async = db_async
+        self.file_manager = file_manager or FileManager()
+        self._pending: Deque[Tuple[int, str]] = deque()
+        self._queued: Set[int] = set()
+        self._current: Optional[Tuple[int, str]] = None
+        self._target_ms = 0
+        self._seeked = False
+
+        self.player = QMediaPlayer(self)
+        self.sink = QVideoSink(self)
+        # No audio output is attached, so nothing is ever heard
+        self.player.setVideoSink(self.sink)
+        self.player.mediaStatusChanged.connect(self.media_status_changed)
+        self.player.errorOccurred.connect(lambda error, message: self.skip(message))
+        self.sink.videoFrameChanged.connect(self.frame_ready)
+
+        self.timeout = QTimer(self)
+        self.timeout.setSingleShot(True)
+        self.timeout.timeout.connect(lambda: self.skip("timed out"))
+        if on_saved:
+            self.poster_saved.connect(lambda lesson_id, path: on_saved(lesson_id))
+
+    def enqueue(self, lessons: Iterable[Tuple[int, str]]):
+        """Queue (lesson_id, video_path) pairs; lessons already queued are ignored."""
+        for lesson_id, video_path in lessons:
+            if video_path and lesson_id not in self._queued:
+                self._queued.add(lesson_id)
+                self._pending.append((lesson_id, video_path))
+        if self._current is None:
+            self.next()
+
+    def pending(self) -> int:
+        return len(self._pending) + (self._current is not None)
+
+    def next(self):
+        if self._current is not None or not self._pending:
+            return
+        self._current = self._pending.popleft()
+        self._target_ms = 0
+        self._seeked = False
+        self.timeout.start(FRAME_TIMEOUT_MS)
+        self.player.setSource(QUrl.fromLocalFile(self._current[1]))
+
+    def media_status_changed(self, status: QMediaPlayer.MediaStatus):
+        if self._current is None:
+            return
+        if status == QMediaPlayer.MediaStatus.LoadedMedia and not self._seeked:
+            self._seeked = True
+            duration = self.player.duration()
+            self._target_ms = min(int(duration * POSTER_POSITION), MAX_POSTER_POSITION_MS) if duration > 0 else 0
+            self.player.setPosition(self._target_ms)
+            self.player.play()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self.skip("invalid media")
+
+    def frame_ready(self, frame: QVideoFrame):
+        if self._current is None or not self._seeked or not frame.isValid():
+            return
+        # Frames decoded before the seek took effect are ignored; startTime is
+        # in microseconds and -1 when the backend does not report it
+        start_ms = frame.startTime() // 1000 if frame.startTime() >= 0 else self._target_ms
+        if start_ms < self._target_ms - 1000:
+            return
+        image = frame.toImage()
+        if image.isNull():
+            return
+        lesson_id = self._current[0]
+        self.finish()
+        deliver(self.file_manager.submit_probe(self.file_manager.save_poster, image, lesson_id),
+                lambda path: self.poster_written(lesson_id, path), owner=self)
+
+    def poster_written(self, lesson_id: int, image_path: Optional[str]):
+        if not image_path:
+            return
+        def stored(updated: bool):
+            if updated:
+                self.poster_saved.emit(lesson_id, image_path)
+            else:
+                # The lesson got an image (or was deleted) while we worked
+                self.file_manager.remove_media_in_background([image_path])
+        deliver(self.db_async.set_poster_image(lesson_id, image_path), stored, owner=self)
+
+    def skip(self, reason: str):
+        if self._current is None:
+            return
+        print(f"Error extracting poster frame from {self._current[1]}: {reason}")
+        self.finish()
+
+    def finish(self):
+        """Release the current video and move on to the next one."""
+        self.timeout.stop()
+        self._queued.discard(self._current[0])
+        self._current = None
+        self.player.stop()
+        self.player.setSource(QUrl())
+        # Start the next video from the event loop, not from inside a player signal
+        QTimer.singleShot(0, self.next)
+
+    def clear(self):
+        self._pending.clear()
+        self._queued.clear()
+        if self._current is not None:
+            self.timeout.stop()
+            self._current = None
+            self.player.stop()
+            self.player.setSource(QUrl())
@@ -0,0 +1,78 @@
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from src.models.async_database import AsyncDatabase
+from src.models.database import LessonProgress, ViewEvent
+from src.utils.futures import deliver
+
+# Buffered positions are written at most this long after they were recorded
+FLUSH_INTERVAL_MS = 5000
+
+class ProgressTracker(QObject):
+    """Write-behind buffer for how far users have watched lesson videos.
+
+    The player reports its position many times a second. record() only
+    keeps the latest position per (user, lesson) in memory; the first
+    record after a flush starts a timer, and when it fires everything
+    buffered goes to the database as one queued write. Call flush() to
+    write immediately, e.g. when the player closes. Reads go through
+    load(), which answers from the buffer first so a position recorded
+    moments ago is never shadowed by an older stored one.
+
+    View events (one per opening of a lesson) are buffered the same way
+    and appended to the view log in the same flush.
+    """
+    # Emitted on the GUI thread once a flush has been committed
+    saved = pyqtSignal()
+
+    def __init__(self, db_async: AsyncDatabase, interval_ms: int = FLUSH_INTERVAL_MS):
+        super().__init__()
+        self.db_async = db_async
+        self.flushes = 0
+        self._pending: Dict[Tuple[int, int], LessonProgress] = {}
+        self._events: List[ViewEvent] = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def record(self, user_id: int, lesson_id: int, position_ms: int, duration_ms: int = 0):
+        self._pending[(user_id, lesson_id)] = LessonProgress(user_id, lesson_id, max(position_ms, 0),
+                                                             max(duration_ms, 0))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def log_view(self, user_id: int, lesson_id: int, watched_ms: int = 0):
+        self._events.append(ViewEvent(user_id, lesson_id, max(watched_ms, 0)))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def load(self, user_id: int, lesson_id: int) -> Future:
+        """Future resolving to the user's LessonProgress for the lesson, or None."""
+        pending = self._pending.get((user_id, lesson_id))
+        if pending is not None:
+            future = Future()
+            future.set_result(pending)
+            return future
+        return self.db_async.get_progress(user_id, lesson_id)
+
+    def flush(self) -> Optional[Future]:
+        """Queue everything buffered; None when there was nothing to write.
+
+        Positions and view events are two queued writes, which the write
+        queue commits together. The returned future is the last of them.
+        """
+        self._timer.stop()
+        if not self._pending and not self._events:
+            return None
+        self.flushes += 1
+        future = None
+        if self._events:
+            future = self.db_async.log_views(self._events)
+            self._events = []
+        if self._pending:
+            entries = list(self._pending.values())
+            self._pending.clear()
+            future = self.db_async.save_progress(entries)
+            deliver(future, lambda stored: stored and self.saved.emit())
+        return future
@@ -0,0 +1,337 @@
+import argparse
+import hashlib
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from src.models.database import Database
+
+try:
+    import numpy
+except ImportError:
+    # The pure-Python path computes the same lists, only more slowly
+    numpy = None
+
+DEFAULT_TOP_K = 8
+# Pairs scoring below this have too little in common to be shown as related
+DEFAULT_MIN_SCORE = 0.05
+# How often the background thread checks the catalog for changes, in seconds
+DEFAULT_INTERVAL = 60.0
+# Rebuild everything, rather than patch lists, when more lessons than this changed
+REBUILD_FRACTION = 0.25
+# Upper bound on the block of scores the NumPy path holds at once
+BATCH_BYTES = 32 * 1024 * 1024
+
+Neighbours = List[Tuple[int, float]]
+
+# Words are runs of two or more letters; digits and punctuation separate them
+_WORD = re.compile(r"[^\W\d_]{2,}")
+# Harakat, Quranic marks and tatweel, which vary between writers of the same word
+_ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u0640]")
+_ARABIC_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي"})
+
+# In normalized form (see tokenize)
+STOPWORDS = frozenset("""
+    about after all also an and any are as at be been but by can do for from has have how if in into is it
+    its more not of on or our so than that the their then there these this those to was we were what when
+    which will with you your
+    في من علي الي عن مع هذا هذه ذلك تلك التي الذي الذين او ان كان كانت كما لا ما هو هي ثم قد كل بعض عند بين
+    حتي لم لن هل اذا
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words of English or Arabic text, normalized so spelling variants match.
+
+    Arabic loses its diacritics, alef/ta marbuta/alef maqsura variants
+    are unified and a leading definite article (ال, وال) is dropped from
+    longer words. Stopwords are removed.
+    """
+    text = _ARABIC_MARKS.sub("", text.casefold()).translate(_ARABIC_LETTERS)
+    tokens = []
+    for word in _WORD.findall(text):
+        if word in STOPWORDS:
+            continue
+        if word.startswith("وال") and len(word) > 5:
+            word = word[3:]
+        elif word.startswith("ال") and len(word) > 4:
+            word = word[2:]
+        tokens.append(word)
+    return tokens
+
+def lesson_terms(title: str, title_ar: str, description: str, description_ar: str) -> Counter:
+    """Term counts of a lesson in both languages; title words count twice."""
+    terms = Counter(tokenize(f"{title} {title_ar}"))
+    for term in terms:
+        terms[term] *= 2
+    terms.update(tokenize(f"{description} {description_ar}"))
+    return terms
+
+def text_hash(texts: Iterable[str]) -> str:
+    return hashlib.sha1("\x1f".join(texts).encode("utf-8")).hexdigest()
+
+def _best(pairs: Iterable[Tuple[int, float]], top_k: Optional[int]) -> Neighbours:
+    """Highest scores first, ties by lesson id; all of them when top_k is None."""
+    key = lambda pair: (-pair[1], pair[0])
+    return sorted(pairs, key=key) if top_k is None else heapq.nsmallest(top_k, pairs, key=key)
+
+class TfidfMatrix:
+    """TF-IDF vectors of a set of lessons, with an inverted index over their terms.
+
+    Weights are sublinear (1 + log tf) times smoothed idf, and each row is
+    L2-normalized, so a dot product is the cosine similarity. Rows and
+    postings are sparse; the similarity of a lesson to all others only
+    touches lessons that share a term with it.
+    """
+
+    def __init__(self, docs: Dict[int, Counter]):
+        self.ids = list(docs)
+        df: Counter = Counter()
+        for terms in docs.values():
+            df.update(terms.keys())
+        vocabulary = {term: index for index, term in enumerate(df)}
+        idf = [math.log((1 + len(self.ids)) / (1 + count)) + 1 for count in df.values()]
+        self.rows: List[Dict[int, float]] = []
+        # term -> [(row, weight)]
+        self.postings: List[List[Tuple[int, float]]] = [[] for _ in vocabulary]
+        for position, terms in enumerate(docs.values()):
+            row = {}
+            for term, count in terms.items():
+                index = vocabulary[term]
+                row[index] = (1 + math.log(count)) * idf[index]
+            norm = math.sqrt(sum(weight * weight for weight in row.values())) or 1.0
+            for index in row:
+                row[index] /= norm
+                self.postings[index].append((position, row[index]))
+            self.rows.append(row)
+        self._arrays = None
+
+    def neighbours(self, lesson_ids: Iterable[int], top_k: Optional[int], min_score: float,
+                   use_numpy: bool = numpy is not None,
+                   batch_bytes: int = BATCH_BYTES) -> Iterator[Tuple[int, Neighbours]]:
+        """Yield (lesson_id, [(other_id, score)]) with the lesson's most similar others.
+
+        Scores below min_score are dropped; top_k=None keeps all the rest.
+        """
+        index = {lesson_id: position for position, lesson_id in enumerate(self.ids)}
+        positions = [index[lesson_id] for lesson_id in lesson_ids]
+        if use_numpy and numpy is not None:
+            yield from self._numpy_neighbours(positions, top_k, min_score, batch_bytes)
+            return
+        for position in positions:
+            scores: Dict[int, float] = defaultdict(float)
+            for term, weight in self.rows[position].items():
+                for other, other_weight in self.postings[term]:
+                    scores[other] += weight * other_weight
+            scores.pop(position, None)
+            yield self.ids[position], _best(((self.ids[other], score) for other, score in scores.items()
+                                             if score >= min_score), top_k)
+
+    def _numpy_neighbours(self, positions: List[int], top_k: Optional[int], min_score: float,
+                          batch_bytes: int) -> Iterator[Tuple[int, Neighbours]]:
+        """Score a batch of rows against all lessons at once.
+
+        The batch's (row, term) pairs are expanded into their posting
+        entries and summed per (row, lesson) with one bincount, which is
+        the sparse product of the batch with the whole matrix. Batches are
+        sized so the dense block of scores fits in batch_bytes.
+        """
+        if self._arrays is None:
+            lengths = [len(posting) for posting in self.postings]
+            pointers = numpy.zeros(len(lengths) + 1, dtype=numpy.int64)
+            numpy.cumsum(lengths, out=pointers[1:])
+            rows = numpy.fromiter((row for posting in self.postings for row, _ in posting),
+                                  dtype=numpy.int64, count=int(pointers[-1]))
+            weights = numpy.fromiter((weight for posting in self.postings for _, weight in posting),
+                                     dtype=numpy.float64, count=int(pointers[-1]))
+            self._arrays = pointers, rows, weights
+        pointers, posting_rows, posting_weights = self._arrays
+        count = len(self.ids)
+        batch_size = max(1, batch_bytes // (8 * max(count, 1)))
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            query_rows = numpy.fromiter((i for i, position in enumerate(batch) for _ in self.rows[position]),
+                                        dtype=numpy.int64)
+            terms = numpy.fromiter((term for position in batch for term in self.rows[position]),
+                                   dtype=numpy.int64)
+            weights = numpy.fromiter((weight for position in batch for weight in self.rows[position].values()),
+                                     dtype=numpy.float64)
+            starts = pointers[terms]
+            lengths = pointers[terms + 1] - starts
+            # Index of every posting entry each (row, term) pair reaches
+            entries = numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths) + numpy.arange(lengths.sum())
+            cells = numpy.repeat(query_rows, lengths) * count + posting_rows[entries]
+            scores = numpy.bincount(cells, weights=numpy.repeat(weights, lengths) * posting_weights[entries],
+                                    minlength=len(batch) * count).reshape(len(batch), count)
+            # A lesson is not related to itself
+            scores[numpy.arange(len(batch)), batch] = 0.0
+            floors = numpy.full(len(batch), min_score)
+            if top_k is not None and top_k < count:
+                # Each row's k-th best score; everything tied with it stays a
+                # candidate so ties are broken by id, as in the Python path
+                kth = numpy.partition(scores, count - top_k, axis=1)[:, count - top_k]
+                numpy.maximum(floors, kth - 1e-12, out=floors)
+            for i, position in enumerate(batch):
+                others = numpy.flatnonzero(scores[i] >= floors[i])
+                yield self.ids[position], _best(
+                    zip((self.ids[other] for other in others.tolist()), scores[i, others].tolist()), top_k)
+
+@dataclass(slots=True)
+class RelatedReport:
+    """What one RelatedLessonsIndex.update did."""
+    lessons: int = 0
+    changed: int = 0     # new or edited since the last update
+    removed: int = 0     # deleted since the last update
+    recomputed: int = 0  # lists computed against every lesson
+    merged: int = 0      # lists patched with the changed lessons' scores
+    rebuilt: bool = False
+    seconds: float = 0.0
+
+class RelatedLessonsIndex:
+    """Maintains the related_lessons table the lesson detail view reads.
+
+    update() compares a hash of every lesson's text with the one its list
+    was computed from. New and edited lessons get their lists computed
+    against the whole catalog, and those scores are merged into the other
+    lessons' lists; a list only has to be recomputed when it was full and
+    lost an entry (to a deletion or a lower score). When most of the
+    catalog changed, or with full=True, every list is rebuilt. IDF weights
+    are recomputed on each run, so lists patched long ago may lag slightly
+    behind; a full rebuild brings them back in line.
+
+    start() runs update() on a background thread whenever the database's
+    catalog_version has moved since the last run.
+    """
+
+    def __init__(self, db: Database, top_k: int = DEFAULT_TOP_K, min_score: float = DEFAULT_MIN_SCORE,
+                 interval: float = DEFAULT_INTERVAL, use_numpy: bool = numpy is not None):
+        self.db = db
+        self.top_k = top_k
+        self.min_score = min_score
+        self.interval = interval
+        self.use_numpy = use_numpy
+        self._version: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="related-lessons", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop after the current update, if one is running."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _neighbours(self, matrix: TfidfMatrix, lesson_ids: Iterable[int],
+                    top_k: Optional[int]) -> Iterator[Tuple[int, Neighbours]]:
+        return matrix.neighbours(lesson_ids, top_k, self.min_score, self.use_numpy)
+
+    def update(self, full: bool = False) -> RelatedReport:
+        start = time.perf_counter()
+        docs: Dict[int, Counter] = {}
+        hashes: Dict[int, str] = {}
+        for lesson_id, *texts in self.db.iter_lesson_texts():
+            hashes[lesson_id] = text_hash(texts)
+            docs[lesson_id] = lesson_terms(*texts)
+        stored = self.db.get_related_sources()
+        changed = [lesson_id for lesson_id, digest in hashes.items() if stored.get(lesson_id) != digest]
+        removed = [lesson_id for lesson_id in stored if lesson_id not in hashes]
+        report = RelatedReport(len(docs), len(changed), len(removed))
+        if not changed and not removed and not full:
+            return report
+
+        matrix = TfidfMatrix(docs)
+        if full or len(changed) + len(removed) > REBUILD_FRACTION * len(docs):
+            lists = dict(self._neighbours(matrix, matrix.ids, self.top_k))
+            report.rebuilt = True
+            report.recomputed = len(lists)
+            self.db.save_related(lists, hashes, removed)
+        else:
+            lists, report.merged, recompute = self._patch(matrix, changed, removed)
+            lists.update(self._neighbours(matrix, recompute, self.top_k))
+            report.recomputed = len(changed) + len(recompute)
+            self.db.save_related(lists, {lesson_id: hashes[lesson_id] for lesson_id in changed}, removed)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _patch(self, matrix: TfidfMatrix, changed: Sequence[int],
+               removed: Sequence[int]) -> Tuple[Dict[int, Neighbours], int, List[int]]:
+        """Lists of the changed lessons, and the other lists patched with their scores.
+
+        Returns (lists, how many were patched, lessons whose list must be
+        recomputed instead).
+        """
+        changed_set, removed_set = set(changed), set(removed)
+        lists: Dict[int, Neighbours] = {}
+        # lesson -> {changed lesson: score}; similarity is symmetric
+        incoming: Dict[int, Dict[int, float]] = defaultdict(dict)
+        for lesson_id, scores in self._neighbours(matrix, changed, None):
+            lists[lesson_id] = scores[:self.top_k]
+            for other, score in scores:
+                incoming[other][lesson_id] = score
+        index = self.db.get_related_index()
+        patched, recompute = 0, []
+        for lesson_id in matrix.ids:
+            if lesson_id in changed_set:
+                continue
+            old = index.get(lesson_id, [])
+            gained = incoming.get(lesson_id, {})
+            kept = [(other, score) for other, score in old
+                    if other not in changed_set and other not in removed_set]
+            # Below a full list's last entry there may be lessons it never stored
+            lost = any(gained.get(other, 0.0) < score for other, score in old
+                       if other in changed_set or other in removed_set)
+            if lost and len(old) >= self.top_k:
+                recompute.append(lesson_id)
+                continue
+            merged = _best(kept + list(gained.items()), self.top_k)
+            if merged != old:
+                lists[lesson_id] = merged
+                patched += 1
+        return lists, patched, recompute
+
+    def _run(self):
+        while True:
+            version = self.db.catalog_version
+            if version != self._version:
+                # Writes during the update (including its own) move the
+                # version again, so the next check looks once more
+                self._version = version
+                try:
+                    self.update()
+                except Exception as e:
+                    print(f"Database error: {e}")
+            if self._stop.wait(self.interval):
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the related-lessons lists the lesson view shows.")
+    parser.add_argument("--db", default="edu_platform.db", help="database file")
+    parser.add_argument("--full", action="store_true", help="recompute every list, not just changed ones")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="related lessons kept per lesson")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE,
+                        help="smallest cosine similarity worth keeping")
+    parser.add_argument("--no-numpy", action="store_true", help="use the pure-Python path even if NumPy is installed")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    index = RelatedLessonsIndex(db, top_k=args.top_k, min_score=args.min_score, use_numpy=not args.no_numpy)
+    report = index.update(full=args.full)
+    db.close()
+
+    print(f"{report.lessons} lessons: {report.changed} changed, {report.removed} removed")
+    print(f"{'Rebuilt' if report.rebuilt else 'Recomputed'} {report.recomputed} lists, "
+          f"patched {report.merged}, in {report.seconds:.2f} s"
+          f" ({'NumPy' if index.use_numpy and numpy is not None else 'pure Python'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,752 @@
+"""
+Application-wide stylesheet.
+
+Every window used to call setStyleSheet with its own copy of the theme and
+every LessonCard parsed its own sheet as well. All of those rules now live
+here, scoped to a window through its objectName (``#dashboardWindow QLabel``)
+or to a widget role (``QFrame#lessonCard``), and are installed once on the
+QApplication so Qt only parses them a single time.
+"""
+from typing import Optional
+from PyQt6.QtWidgets import QApplication
+
+# Dashboard (shared by the student and teacher dashboards)
+DASHBOARD_STYLE = """
+QMainWindow#dashboardWindow {
+    background-color: #1e1e2e;
+}
+#dashboardWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#dashboardWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 6px;
+    font-size: 14px;
+    font-weight: bold;
+}
+#dashboardWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#dashboardWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#dashboardWindow QComboBox {
+    padding: 8px 15px;
+    border: 2px solid #89b4fa;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    min-width: 150px;
+}
+#dashboardWindow QComboBox:hover {
+    border-color: #b4befe;
+}
+#dashboardWindow QComboBox::drop-down {
+    border: none;
+}
+#dashboardWindow QComboBox::down-arrow {
+    image: url(resources/icons/dropdown.png);
+    width: 12px;
+    height: 12px;
+}
+#dashboardWindow QScrollArea {
+    border: none;
+    background-color: transparent;
+}
+#dashboardWindow QScrollBar:vertical {
+    border: none;
+    background-color: #313244;
+    width: 10px;
+    margin: 0;
+}
+#dashboardWindow QScrollBar::handle:vertical {
+    background-color: #89b4fa;
+    border-radius: 5px;
+    min-height: 20px;
+}
+#dashboardWindow QScrollBar::handle:vertical:hover {
+    background-color: #b4befe;
+}
+#dashboardWindow QFrame#headerFrame {
+    background-color: #313244;
+    border-radius: 10px;
+    padding: 10px;
+}
+#dashboardWindow QFrame#contentFrame {
+    background-color: #313244;
+    border-radius: 10px;
+    padding: 20px;
+}
+"""
+
+# Lesson detail window
+LESSON_DETAIL_STYLE = """
+QMainWindow#lessonDetailWindow {
+    background-color: #1e1e2e;
+}
+#lessonDetailWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#lessonDetailWindow QLabel#titleLabel {
+    font-size: 24px;
+    font-weight: bold;
+    color: #89b4fa;
+}
+#lessonDetailWindow QLabel#descriptionLabel {
+    font-size: 16px;
+    line-height: 1.6;
+}
+#lessonDetailWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 6px;
+    font-size: 14px;
+    font-weight: bold;
+}
+#lessonDetailWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#lessonDetailWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#lessonDetailWindow QPushButton:disabled {
+    background-color: #45475a;
+    color: #6c7086;
+}
+#lessonDetailWindow QLabel#sectionLabel {
+    color: #94e2d5;
+    font-size: 18px;
+    font-weight: bold;
+}
+#lessonDetailWindow QPushButton#relatedLessonButton {
+    background-color: #45475a;
+    color: #cdd6f4;
+    font-weight: normal;
+}
+#lessonDetailWindow QPushButton#relatedLessonButton:hover {
+    background-color: #585b70;
+}
+#lessonDetailWindow QScrollArea {
+    border: none;
+    background-color: transparent;
+}
+#lessonDetailWindow QFrame {
+    background-color: #313244;
+    border-radius: 10px;
+}
+#lessonDetailWindow QLabel#errorLabel {
+    color: #f38ba8;
+    font-size: 16px;
+}
+#lessonDetailWindow QLabel#imageLabel {
+    color: #6c7086;
+    font-size: 16px;
+}
+#lessonDetailWindow QSlider::groove:horizontal {
+    border: none;
+    height: 6px;
+    background: #45475a;
+    border-radius: 3px;
+}
+#lessonDetailWindow QSlider::handle:horizontal {
+    background: #89b4fa;
+    width: 16px;
+    height: 16px;
+    margin: -5px 0;
+    border-radius: 8px;
+}
+#lessonDetailWindow QSlider::handle:horizontal:hover {
+    background: #b4befe;
+}
+"""
+
+# Admin dashboard
+ADMIN_DASHBOARD_STYLE = """
+QMainWindow#adminWindow {
+    background-color: #1e1e2e;
+}
+#adminWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#adminWindow QLabel#titleLabel {
+    color: #89b4fa;
+    font-size: 32px;
+    font-weight: bold;
+}
+#adminWindow QLabel#sectionLabel {
+    color: #94e2d5;
+    font-size: 24px;
+    font-weight: bold;
+}
+#adminWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#adminWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#adminWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#adminWindow QPushButton#dangerButton {
+    background-color: #f38ba8;
+}
+#adminWindow QPushButton#dangerButton:hover {
+    background-color: #eba0b3;
+}
+#adminWindow QTableWidget {
+    background-color: #313244;
+    border: none;
+    border-radius: 12px;
+    gridline-color: #45475a;
+    color: #cdd6f4;
+}
+#adminWindow QTableWidget::item {
+    padding: 8px;
+}
+#adminWindow QTableWidget::item:selected {
+    background-color: #45475a;
+}
+#adminWindow QHeaderView::section {
+    background-color: #181825;
+    color: #89b4fa;
+    padding: 8px;
+    border: none;
+    font-weight: bold;
+}
+#adminWindow QFrame {
+    background-color: #313244;
+    border-radius: 12px;
+}
+#adminWindow QComboBox {
+    background-color: #313244;
+    color: #cdd6f4;
+    border: 2px solid #45475a;
+    border-radius: 8px;
+    padding: 8px;
+}
+#adminWindow QComboBox:hover {
+    border-color: #89b4fa;
+}
+#adminWindow QComboBox::drop-down {
+    border: none;
+}
+#adminWindow QComboBox::down-arrow {
+    image: url(resources/icons/dropdown.png);
+}
+#adminWindow QScrollArea {
+    border: none;
+    background-color: transparent;
+}
+#adminWindow QScrollBar:vertical {
+    border: none;
+    background-color: #313244;
+    width: 10px;
+    margin: 0;
+}
+#adminWindow QScrollBar::handle:vertical {
+    background-color: #45475a;
+    border-radius: 5px;
+    min-height: 20px;
+}
+#adminWindow QScrollBar::handle:vertical:hover {
+    background-color: #89b4fa;
+}
+"""
+
+# Admin add/edit user dialog
+USER_DIALOG_STYLE = """
+QDialog#userDialog {
+    background-color: #1E1E2E;
+    color: #CDD6F4;
+}
+#userDialog QLabel {
+    color: #CDD6F4;
+}
+#userDialog QLineEdit, #userDialog QComboBox {
+    background-color: #313244;
+    color: #CDD6F4;
+    border: 1px solid #45475A;
+    border-radius: 4px;
+    padding: 5px;
+}
+#userDialog QLineEdit:focus, #userDialog QComboBox:focus {
+    border: 1px solid #89B4FA;
+}
+#userDialog QPushButton {
+    background-color: #89B4FA;
+    color: #1E1E2E;
+    border: none;
+    border-radius: 4px;
+    padding: 5px 15px;
+}
+#userDialog QPushButton:hover {
+    background-color: #B4BEFE;
+}
+"""
+
+# Login window
+LOGIN_STYLE = """
+QMainWindow#loginWindow {
+    background-color: #1e1e2e;
+}
+#loginWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#loginWindow QLabel#titleLabel {
+    color: #89b4fa;
+    font-size: 32px;
+    font-weight: bold;
+}
+#loginWindow QLabel#errorLabel {
+    color: #f38ba8;
+    font-size: 14px;
+}
+#loginWindow QLineEdit {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    selection-background-color: #45475a;
+}
+#loginWindow QLineEdit:focus {
+    border: 2px solid #89b4fa;
+}
+#loginWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px;
+    border-radius: 6px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#loginWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#loginWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#loginWindow QPushButton#linkButton {
+    background-color: transparent;
+    color: #89b4fa;
+    padding: 5px;
+    text-decoration: underline;
+}
+#loginWindow QPushButton#linkButton:hover {
+    color: #b4befe;
+}
+#loginWindow QComboBox {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    min-width: 150px;
+}
+#loginWindow QComboBox:hover {
+    border-color: #89b4fa;
+}
+#loginWindow QComboBox::drop-down {
+    border: none;
+}
+#loginWindow QComboBox::down-arrow {
+    image: url(resources/icons/dropdown.png);
+    width: 12px;
+    height: 12px;
+}
+#loginWindow QFrame {
+    background-color: #313244;
+    border-radius: 10px;
+}
+#loginWindow QComboBox#languageCombo {
+    background-color: #2d2d2d;
+    color: #ffffff;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+    padding: 5px;
+    min-width: 100px;
+}
+#loginWindow QComboBox#languageCombo:hover {
+    border-color: #4d4d4d;
+}
+#loginWindow QComboBox#languageCombo:focus {
+    border-color: #0078d4;
+}
+#loginWindow QLabel#illustrationLabel {
+    background-color: transparent;
+}
+"""
+
+# Registration window
+REGISTRATION_STYLE = """
+QMainWindow#registrationWindow {
+    background-color: #1e1e2e;
+}
+#registrationWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#registrationWindow QLabel#titleLabel {
+    color: #89b4fa;
+    font-size: 32px;
+    font-weight: bold;
+}
+#registrationWindow QLineEdit {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    selection-background-color: #45475a;
+}
+#registrationWindow QLineEdit:focus {
+    border: 2px solid #89b4fa;
+}
+#registrationWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px;
+    border-radius: 6px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#registrationWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#registrationWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#registrationWindow QPushButton#linkButton {
+    background-color: transparent;
+    color: #89b4fa;
+    padding: 5px;
+    text-decoration: underline;
+}
+#registrationWindow QPushButton#linkButton:hover {
+    color: #b4befe;
+}
+#registrationWindow QComboBox {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    min-width: 150px;
+}
+#registrationWindow QComboBox:hover {
+    border-color: #89b4fa;
+}
+#registrationWindow QComboBox::drop-down {
+    border: none;
+}
+#registrationWindow QComboBox::down-arrow {
+    image: url(resources/icons/dropdown.png);
+    width: 12px;
+    height: 12px;
+}
+#registrationWindow QFrame {
+    background-color: #313244;
+    border-radius: 10px;
+}
+#registrationWindow QComboBox#languageCombo {
+    background-color: #2d2d2d;
+    color: #ffffff;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+    padding: 5px;
+    min-width: 100px;
+}
+#registrationWindow QComboBox#languageCombo:hover {
+    border-color: #4d4d4d;
+}
+#registrationWindow QComboBox#languageCombo:focus {
+    border-color: #0078d4;
+}
+#registrationWindow QLabel#illustrationLabel {
+    background-color: transparent;
+}
+#registrationWindow QLabel#errorLabel {
+    color: #f38ba8;
+    font-size: 14px;
+}
+"""
+
+# Lesson creation window
+LESSON_CREATION_STYLE = """
+QMainWindow#lessonCreationWindow {
+    background-color: #1e1e2e;
+}
+#lessonCreationWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#lessonCreationWindow QLabel#titleLabel {
+    color: #89b4fa;
+    font-size: 32px;
+    font-weight: bold;
+}
+#lessonCreationWindow QLabel#subtitleLabel {
+    color: #94e2d5;
+    font-size: 16px;
+}
+#lessonCreationWindow QLineEdit, #lessonCreationWindow QTextEdit {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 8px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    selection-background-color: #45475a;
+}
+#lessonCreationWindow QLineEdit:focus, #lessonCreationWindow QTextEdit:focus {
+    border: 2px solid #89b4fa;
+    background-color: #1e1e2e;
+}
+#lessonCreationWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#lessonCreationWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#lessonCreationWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#lessonCreationWindow QPushButton#secondaryButton {
+    background-color: #313244;
+    color: #cdd6f4;
+    border: 2px solid #45475a;
+}
+#lessonCreationWindow QPushButton#secondaryButton:hover {
+    background-color: #45475a;
+    border-color: #89b4fa;
+}
+#lessonCreationWindow QFrame {
+    background-color: #313244;
+    border-radius: 12px;
+}
+#lessonCreationWindow QFrame#previewFrame {
+    background-color: #181825;
+    border: 2px solid #313244;
+}
+#lessonCreationWindow QFrame#previewContainer {
+    background-color: #11111b;
+    border: 2px dashed #45475a;
+}
+#lessonCreationWindow QLabel#previewImage {
+    background-color: transparent;
+    border-radius: 8px;
+}
+#lessonCreationWindow QLabel#fileLabel {
+    color: #a6e3a1;
+    font-size: 13px;
+}
+#lessonCreationWindow QLabel#errorLabel {
+    color: #f38ba8;
+    font-size: 14px;
+    margin: 8px;
+}
+#lessonCreationWindow QScrollArea {
+    border: none;
+    background-color: transparent;
+}
+#lessonCreationWindow QScrollBar:vertical {
+    border: none;
+    background-color: #313244;
+    width: 10px;
+    margin: 0;
+}
+#lessonCreationWindow QScrollBar::handle:vertical {
+    background-color: #45475a;
+    border-radius: 5px;
+    min-height: 20px;
+}
+#lessonCreationWindow QScrollBar::handle:vertical:hover {
+    background-color: #89b4fa;
+}
+"""
+
+# Lesson edit window
+LESSON_EDIT_STYLE = """
+QMainWindow#lessonEditWindow {
+    background-color: #1e1e2e;
+}
+#lessonEditWindow QLabel {
+    color: #cdd6f4;
+    font-size: 14px;
+}
+#lessonEditWindow QLabel#titleLabel {
+    color: #89b4fa;
+    font-size: 32px;
+    font-weight: bold;
+}
+#lessonEditWindow QLineEdit, #lessonEditWindow QTextEdit {
+    padding: 12px;
+    border: 2px solid #313244;
+    border-radius: 6px;
+    background-color: #313244;
+    color: #cdd6f4;
+    font-size: 14px;
+    selection-background-color: #45475a;
+}
+#lessonEditWindow QLineEdit:focus, #lessonEditWindow QTextEdit:focus {
+    border: 2px solid #89b4fa;
+}
+#lessonEditWindow QPushButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px;
+    border-radius: 6px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#lessonEditWindow QPushButton:hover {
+    background-color: #b4befe;
+}
+#lessonEditWindow QPushButton:pressed {
+    background-color: #74c7ec;
+}
+#lessonEditWindow QFrame {
+    background-color: #313244;
+    border-radius: 10px;
+}
+#lessonEditWindow QLabel#imagePreview {
+    border: 2px solid #45475a;
+    border-radius: 6px;
+}
+#lessonEditWindow QLabel#fileLabel {
+    color: #89b4fa;
+}
+#lessonEditWindow QPushButton#secondaryButton {
+    background-color: #45475a;
+}
+#lessonEditWindow QPushButton#secondaryButton:hover {
+    background-color: #585b70;
+}
+"""
+
+# Lesson cards. These are created by the hundred, so they must not carry
+# their own stylesheets.
+LESSON_CARD_STYLE = """
+QFrame#lessonCard, QFrame#lessonCard QFrame {
+    background-color: #313244;
+    border-radius: 10px;
+}
+QFrame#lessonCard:hover, QFrame#lessonCard QFrame:hover {
+    background-color: #45475a;
+}
+QFrame#lessonCard QLabel {
+    color: #cdd6f4;
+}
+QFrame#lessonCard QLabel#lessonCardTitle {
+    color: #89b4fa;
+    font-weight: bold;
+}
+QFrame#lessonCard QFrame#lessonCardImage {
+    background-color: #1e1e2e;
+    border-top-left-radius: 10px;
+    border-top-right-radius: 10px;
+    border-bottom-left-radius: 0px;
+    border-bottom-right-radius: 0px;
+}
+QFrame#lessonCard QLabel#lessonCardPlaceholder {
+    color: #6c7086;
+    font-size: 14px;
+}
+QFrame#lessonCard QLabel#lessonCardMeta {
+    color: #a6adc8;
+    font-size: 11px;
+}
+QFrame#lessonCard QProgressBar#lessonCardProgress {
+    background-color: #45475a;
+    border: none;
+    border-radius: 0px;
+}
+QFrame#lessonCard QProgressBar#lessonCardProgress::chunk {
+    background-color: #f38ba8;
+}
+"""
+
+# Teacher dashboard additions
+TEACHER_DASHBOARD_STYLE = """
+#dashboardWindow QPushButton#primaryButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+#dashboardWindow QPushButton#primaryButton:hover {
+    background-color: #b4befe;
+}
+#dashboardWindow QPushButton#primaryButton:pressed {
+    background-color: #74c7ec;
+}
+#dashboardWindow QPushButton#editLessonButton {
+    background-color: #89b4fa;
+    color: #1e1e2e;
+    border: none;
+    padding: 8px;
+    border-radius: 4px;
+    font-size: 12px;
+}
+#dashboardWindow QPushButton#editLessonButton:hover {
+    background-color: #b4befe;
+}
+"""
+
+APP_STYLESHEET = "".join([
+    DASHBOARD_STYLE,
+    TEACHER_DASHBOARD_STYLE,
+    LESSON_CARD_STYLE,
+    LESSON_DETAIL_STYLE,
+    ADMIN_DASHBOARD_STYLE,
+    USER_DIALOG_STYLE,
+    LOGIN_STYLE,
+    REGISTRATION_STYLE,
+    LESSON_CREATION_STYLE,
+    LESSON_EDIT_STYLE,
+])
+
+
+def apply_theme(app: Optional[QApplication] = None):
+    """Install the application stylesheet once on the QApplication."""
+    app = app or QApplication.instance()
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
@@ -0,0 +1,165 @@
+from typing import Callable, Dict, Tuple
+from PyQt6.QtCore import QObject
+
+# Message catalog: key -> {language code -> text}. Texts may contain
+# str.format placeholders that are filled from the kwargs given at
+# registration time.
+MESSAGES: Dict[str, Dict[str, str]] = {
+    # Shared
+    "common.logout": {"en": "Logout", "ar": "تسجيل الخروج"},
+    "common.edit": {"en": "Edit", "ar": "تعديل"},
+    "common.delete": {"en": "Delete", "ar": "حذف"},
+
+    # Dashboards
+    "dashboard.window_title": {"en": "Educational Platform - Dashboard", "ar": "منصة التعليم - لوحة التحكم"},
+    "dashboard.welcome": {"en": "Welcome, {username}", "ar": "مرحباً {username}"},
+    "dashboard.available_lessons": {"en": "Available Lessons", "ar": "الدروس المتاحة"},
+    "dashboard.continue_watching": {"en": "Continue Watching", "ar": "متابعة المشاهدة"},
+    "dashboard.recently_viewed": {"en": "Recently Viewed", "ar": "شوهدت مؤخراً"},
+    "dashboard.order.newest": {"en": "Newest", "ar": "الأحدث"},
+    "dashboard.order.popular": {"en": "Popular", "ar": "الأكثر شيوعاً"},
+    "student.window_title": {"en": "Educational Platform - Student Dashboard", "ar": "منصة التعليم - لوحة الطالب"},
+    "teacher.window_title": {"en": "Educational Platform - Teacher Dashboard", "ar": "منصة التعليم - لوحة تحكم المعلم"},
+    "teacher.add_lesson": {"en": "Add Lesson", "ar": "إضافة درس"},
+    "teacher.edit_lesson": {"en": "Edit Lesson", "ar": "تعديل الدرس"},
+
+    # Admin dashboard
+    "admin.window_title": {"en": "Educational Platform - Admin Dashboard", "ar": "منصة التعليم - لوحة تحكم المشرف"},
+    "admin.title": {"en": "Admin Dashboard", "ar": "لوحة تحكم المشرف"},
+    "admin.add_user": {"en": "Add User", "ar": "إضافة مستخدم"},
+    "admin.users_tab": {"en": "Users", "ar": "المستخدمون"},
+    "admin.lessons_tab": {"en": "Lessons", "ar": "الدروس"},
+    "admin.column.id": {"en": "ID", "ar": "المعرف"},
+    "admin.column.username": {"en": "Username", "ar": "اسم المستخدم"},
+    "admin.column.role": {"en": "Role", "ar": "الدور"},
+    "admin.column.language": {"en": "Language", "ar": "اللغة"},
+    "admin.column.actions": {"en": "Actions", "ar": "الإجراءات"},
+    "admin.column.title": {"en": "Title", "ar": "العنوان"},
+    "admin.column.title_ar": {"en": "Title (AR)", "ar": "العنوان (بالعربية)"},
+    "admin.column.created_by": {"en": "Created By", "ar": "أنشئ بواسطة"},
+    "admin.column.created_at": {"en": "Created At", "ar": "تاريخ الإنشاء"},
+    "admin.analytics_tab": {"en": "Analytics", "ar": "الإحصاءات"},
+    "admin.analytics.refresh": {"en": "Refresh", "ar": "تحديث"},
+    "admin.analytics.top_lessons": {"en": "Most viewed lessons (last {days} days)",
+                                     "ar": "الدروس الأكثر مشاهدة (آخر {days} يوماً)"},
+    "admin.analytics.teachers": {"en": "Views by teacher", "ar": "المشاهدات حسب المعلم"},
+    "admin.column.teacher": {"en": "Teacher", "ar": "المعلم"},
+    "admin.column.views": {"en": "Views", "ar": "المشاهدات"},
+    "admin.column.watch_time": {"en": "Watch Time", "ar": "وقت المشاهدة"},
+    "admin.duplicates_tab": {"en": "Duplicates", "ar": "التكرارات"},
+    "admin.duplicates.title": {"en": "Possible duplicate lessons", "ar": "دروس قد تكون مكررة"},
+    "admin.duplicates.scan": {"en": "Scan Again", "ar": "إعادة الفحص"},
+    "admin.duplicates.scanning": {"en": "Scanning...", "ar": "جارٍ الفحص..."},
+    "admin.duplicates.found": {"en": "{count} group(s) found", "ar": "عدد المجموعات: {count}"},
+    "admin.duplicates.text": {"en": "Same text", "ar": "نص متطابق"},
+    "admin.duplicates.image": {"en": "Same image", "ar": "صورة متطابقة"},
+    "admin.column.kind": {"en": "Kind", "ar": "النوع"},
+    "admin.column.similarity": {"en": "Similarity", "ar": "التشابه"},
+    "admin.column.lessons": {"en": "Lessons", "ar": "الدروس"},
+    "admin.statistics_tab": {"en": "Statistics", "ar": "إحصاءات المنصة"},
+    "admin.statistics.totals": {"en": "{users} users, {lessons} lessons",
+                                "ar": "المستخدمون: {users}، الدروس: {lessons}"},
+    "admin.statistics.roles": {"en": "Users by role", "ar": "المستخدمون حسب الدور"},
+    "admin.statistics.teachers": {"en": "Lessons by teacher", "ar": "الدروس حسب المعلم"},
+    "admin.statistics.growth": {"en": "Growth (last {days} days)", "ar": "النمو (آخر {days} يومًا)"},
+    "admin.column.users": {"en": "Users", "ar": "المستخدمون"},
+    "admin.column.media": {"en": "Media", "ar": "الوسائط"},
+    "admin.column.day": {"en": "Day", "ar": "اليوم"},
+    "admin.column.new_users": {"en": "New Users", "ar": "مستخدمون جدد"},
+    "admin.column.new_lessons": {"en": "New Lessons", "ar": "دروس جديدة"},
+    "admin.column.total_users": {"en": "Total Users", "ar": "إجمالي المستخدمين"},
+    "admin.column.total_lessons": {"en": "Total Lessons", "ar": "إجمالي الدروس"},
+
+    # Login window
+    "login.window_title": {"en": "Educational Platform - Login", "ar": "منصة التعليم - تسجيل الدخول"},
+    "login.title": {"en": "Sign In", "ar": "تسجيل الدخول"},
+    "login.subtitle": {"en": "Welcome back! Please enter your details.", "ar": "مرحباً بعودتك! الرجاء إدخال بياناتك."},
+    "login.username": {"en": "Username", "ar": "اسم المستخدم"},
+    "login.username_placeholder": {"en": "Enter your username", "ar": "أدخل اسم المستخدم"},
+    "login.password": {"en": "Password", "ar": "كلمة المرور"},
+    "login.password_placeholder": {"en": "Enter your password", "ar": "أدخل كلمة المرور"},
+    "login.language": {"en": "Language", "ar": "اللغة"},
+    "login.sign_in": {"en": "Sign In", "ar": "تسجيل الدخول"},
+    "login.no_account": {"en": "Don't have an account?", "ar": "ليس لديك حساب؟"},
+    "login.sign_up": {"en": "Sign Up", "ar": "إنشاء حساب"},
+    "login.fill_all_fields": {"en": "Please fill in all fields", "ar": "يجب ملء جميع الحقول"},
+    "login.invalid_credentials": {"en": "Invalid username or password", "ar": "اسم المستخدم أو كلمة المرور غير صحيحة"},
+
+    # Lesson detail window
+    "lesson_detail.window_title": {"en": "Educational Platform - Lesson Details", "ar": "منصة التعليم - تفاصيل الدرس"},
+    "lesson_detail.related": {"en": "Related Lessons", "ar": "دروس ذات صلة"},
+}
+
+
+class TranslationCatalog:
+    """Keeps track of the widgets whose text comes from MESSAGES.
+
+    Each window owns one catalog and registers a message key once per widget.
+    Switching language then updates exactly the registered widgets instead of
+    scanning every child widget and comparing its current text.
+    """
+
+    def __init__(self, language: str = "ar"):
+        self.language = language
+        self._entries: Dict[Tuple[int, str], Tuple[Callable[[str], None], str, dict]] = {}
+        self._listeners: Dict[int, Callable[[str], None]] = {}
+
+    @staticmethod
+    def translate(key: str, language: str, **kwargs) -> str:
+        """Look up a message, falling back to English and then to the key."""
+        texts = MESSAGES.get(key)
+        if texts is None:
+            return key
+        text = texts.get(language) or texts.get("en", key)
+        return text.format(**kwargs) if kwargs else text
+
+    def text(self, key: str, **kwargs) -> str:
+        """Translate a message into the catalog's current language."""
+        return self.translate(key, self.language, **kwargs)
+
+    def register(self, widget: QObject, key: str, setter: str = "setText", **kwargs):
+        """Bind widget.<setter> to a message key and apply it right away.
+
+        Registering the same widget and setter again replaces the previous key.
+        The entry is dropped automatically when the widget is destroyed.
+        """
+        entry_id = (id(widget), setter)
+        if entry_id not in self._entries:
+            widget.destroyed.connect(lambda _=None, entry_id=entry_id: self._entries.pop(entry_id, None))
+        apply = getattr(widget, setter)
+        self._entries[entry_id] = (apply, key, kwargs)
+        apply(self.text(key, **kwargs))
+
+    def register_callback(self, owner: QObject, name: str, key: str, callback: Callable[[str], None], **kwargs):
+        """Like register(), for texts that are not set through a widget method.
+
+        ``name`` distinguishes several callbacks for the same owner (e.g. one
+        per table header section).
+        """
+        entry_id = (id(owner), name)
+        if entry_id not in self._entries:
+            owner.destroyed.connect(lambda _=None, entry_id=entry_id: self._entries.pop(entry_id, None))
+        self._entries[entry_id] = (callback, key, kwargs)
+        callback(self.text(key, **kwargs))
+
+    def subscribe(self, owner: QObject, callback: Callable[[str], None]):
+        """Call callback(language) on every switch until owner is destroyed.
+
+        For widgets that show bilingual data (e.g. lesson titles) rather than
+        catalog messages and re-render it themselves.
+        """
+        key = id(owner)
+        if key not in self._listeners:
+            owner.destroyed.connect(lambda _=None, key=key: self._listeners.pop(key, None))
+        self._listeners[key] = callback
+
+    def set_language(self, language: str):
+        """Re-apply every registered message in the given language."""
+        self.language = language
+        for apply, key, kwargs in self._entries.values():
+            apply(self.text(key, **kwargs))
+        for callback in self._listeners.values():
+            callback(language)
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._listeners)
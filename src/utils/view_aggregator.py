@@ -0,0 +1,56 @@
+import threading
+from typing import Optional
+from src.models.database import Database
+
+# How often new view events are folded into the rollup tables, in seconds
+DEFAULT_INTERVAL = 30.0
+
+class ViewAggregator:
+    """Keeps the view rollup tables up to date from a background thread.
+
+    Every interval (and once at start) it calls Database.roll_up_views
+    until it reports nothing new. Each call only reads events past the
+    rollup watermark, so the cost follows the number of new views, not
+    the size of the log. The work itself runs on the database's writer,
+    between other writes.
+    """
+
+    def __init__(self, db: Database, interval: float = DEFAULT_INTERVAL, batch_size: int = 5000):
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.events = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="view-rollup", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop after the current roll-up, if one is running."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_once(self) -> int:
+        """Fold every pending event now; returns how many there were."""
+        total = 0
+        while not self._stop.is_set():
+            count = self.db.roll_up_views(self.batch_size)
+            total += count
+            if count < self.batch_size:
+                break
+        self.events += total
+        return total
+
+    def _run(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Database error: {e}")
+            if self._stop.wait(self.interval):
+                break
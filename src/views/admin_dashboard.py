@@ -4,125 +4,42 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QMessageBox, QTabWidget, QFormLayout)
 from PyQt6.QtCore import Qt, pyqtSlot
 from PyQt6.QtGui import QFont, QIcon
-from src.models.database import Database, User, Lesson
+from src.models.database import (Database, DeletionResult, DuplicateGroup, User, Lesson, LessonSummary,
+                                 LessonViewStats, PlatformStatistics, TeacherViewStats)
 from src.utils.navigation import NavigationManager
+from src.utils.file_manager import FileManager
+from src.utils.futures import deliver
+from src.utils.media_info import format_duration, format_size
 from src.utils.security import Security
+from src.utils.translations import TranslationCatalog
 from datetime import datetime
+from typing import List, Optional
+
+# The analytics tab covers this many days of lesson views
+ANALYTICS_DAYS = 30
+# ... and the statistics tab this many days of growth
+STATISTICS_DAYS = 90
 
 class AdminDashboard(QMainWindow):
     def __init__(self, user: User):
         super().__init__()
         self.user = user
-        self.db = Database()
         self.nav = NavigationManager()
+        self.db = self.nav.get_database()
+        self.db_async = self.nav.get_async_database()
+        self.file_manager = FileManager()
         self.current_language = user.language  # Get language from user
+        self.translations = TranslationCatalog(self.current_language)
+        self._lessons_stale = False
+        self._analytics_loaded = False
+        self._duplicates: Optional[List[DuplicateGroup]] = None
         self.setup_ui()
         self.load_data()
-        # Set initial language
-        self.update_ui_text()
         
     def setup_ui(self):
-        self.setWindowTitle("Admin Dashboard")
+        self.translations.register(self, "admin.window_title", "setWindowTitle")
         self.setMinimumSize(1200, 800)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-size: 32px;
-                font-weight: bold;
-            }
-            QLabel#sectionLabel {
-                color: #94e2d5;
-                font-size: 24px;
-                font-weight: bold;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QPushButton#dangerButton {
-                background-color: #f38ba8;
-            }
-            QPushButton#dangerButton:hover {
-                background-color: #eba0b3;
-            }
-            QTableWidget {
-                background-color: #313244;
-                border: none;
-                border-radius: 12px;
-                gridline-color: #45475a;
-                color: #cdd6f4;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QTableWidget::item:selected {
-                background-color: #45475a;
-            }
-            QHeaderView::section {
-                background-color: #181825;
-                color: #89b4fa;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 12px;
-            }
-            QComboBox {
-                background-color: #313244;
-                color: #cdd6f4;
-                border: 2px solid #45475a;
-                border-radius: 8px;
-                padding: 8px;
-            }
-            QComboBox:hover {
-                border-color: #89b4fa;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background-color: #313244;
-                width: 10px;
-                margin: 0;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #45475a;
-                border-radius: 5px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #89b4fa;
-            }
-        """)
+        self.setObjectName("adminWindow")
         
         # Create central widget
         central_widget = QWidget()
@@ -138,8 +55,9 @@ class AdminDashboard(QMainWindow):
         header_layout.setContentsMargins(20, 10, 20, 10)
         
         # Title
-        title_label = QLabel("Admin Dashboard")
+        title_label = QLabel()
         title_label.setObjectName("titleLabel")
+        self.translations.register(title_label, "admin.title")
         header_layout.addWidget(title_label)
         
         # Right side controls
@@ -154,7 +72,8 @@ class AdminDashboard(QMainWindow):
         controls_layout.addWidget(self.lang_combo)
         
         # Logout button
-        self.logout_button = QPushButton("Logout")
+        self.logout_button = QPushButton()
+        self.translations.register(self.logout_button, "common.logout")
         self.logout_button.clicked.connect(self.nav.logout)
         controls_layout.addWidget(self.logout_button)
         
@@ -170,7 +89,8 @@ class AdminDashboard(QMainWindow):
         
         # Users toolbar
         users_toolbar = QHBoxLayout()
-        add_user_btn = QPushButton("Add User")
+        add_user_btn = QPushButton()
+        self.translations.register(add_user_btn, "admin.add_user")
         add_user_btn.clicked.connect(self.add_user)
         users_toolbar.addWidget(add_user_btn)
         users_toolbar.addStretch()
@@ -180,6 +100,10 @@ class AdminDashboard(QMainWindow):
         self.users_table = QTableWidget()
         self.users_table.setColumnCount(5)
         self.users_table.setHorizontalHeaderLabels(["ID", "Username", "Role", "Language", "Actions"])
+        self.register_headers(self.users_table, [
+            "admin.column.id", "admin.column.username", "admin.column.role",
+            "admin.column.language", "admin.column.actions"
+        ])
         self.users_table.horizontalHeader().setStretchLastSection(True)
         self.users_table.verticalHeader().setVisible(False)
         users_layout.addWidget(self.users_table)
@@ -192,18 +116,169 @@ class AdminDashboard(QMainWindow):
         self.lessons_table = QTableWidget()
         self.lessons_table.setColumnCount(7)
         self.lessons_table.setHorizontalHeaderLabels(["ID", "Title", "Title (AR)", "Created By", "Created At", "Actions"])
+        self.register_headers(self.lessons_table, [
+            "admin.column.id", "admin.column.title", "admin.column.title_ar",
+            "admin.column.created_by", "admin.column.created_at", "admin.column.actions"
+        ])
         self.lessons_table.horizontalHeader().setStretchLastSection(True)
         self.lessons_table.verticalHeader().setVisible(False)
         lessons_layout.addWidget(self.lessons_table)
         
+        # Analytics tab: read from the rollup tables, never the raw view log
+        analytics_tab = QWidget()
+        analytics_layout = QVBoxLayout(analytics_tab)
+        
+        analytics_toolbar = QHBoxLayout()
+        top_lessons_label = QLabel()
+        top_lessons_label.setObjectName("sectionLabel")
+        self.translations.register(top_lessons_label, "admin.analytics.top_lessons", days=ANALYTICS_DAYS)
+        analytics_toolbar.addWidget(top_lessons_label)
+        analytics_toolbar.addStretch()
+        refresh_btn = QPushButton()
+        self.translations.register(refresh_btn, "admin.analytics.refresh")
+        refresh_btn.clicked.connect(self.load_analytics)
+        analytics_toolbar.addWidget(refresh_btn)
+        analytics_layout.addLayout(analytics_toolbar)
+        
+        self.lesson_views_table = QTableWidget()
+        self.lesson_views_table.setColumnCount(4)
+        self.lesson_views_table.setHorizontalHeaderLabels(["ID", "Title", "Views", "Watch Time"])
+        self.register_headers(self.lesson_views_table, [
+            "admin.column.id", "admin.column.title", "admin.column.views", "admin.column.watch_time"
+        ])
+        self.lesson_views_table.horizontalHeader().setStretchLastSection(True)
+        self.lesson_views_table.verticalHeader().setVisible(False)
+        analytics_layout.addWidget(self.lesson_views_table, stretch=2)
+        
+        teachers_label = QLabel()
+        teachers_label.setObjectName("sectionLabel")
+        self.translations.register(teachers_label, "admin.analytics.teachers")
+        analytics_layout.addWidget(teachers_label)
+        
+        self.teacher_views_table = QTableWidget()
+        self.teacher_views_table.setColumnCount(3)
+        self.teacher_views_table.setHorizontalHeaderLabels(["Teacher", "Views", "Watch Time"])
+        self.register_headers(self.teacher_views_table, [
+            "admin.column.teacher", "admin.column.views", "admin.column.watch_time"
+        ])
+        self.teacher_views_table.horizontalHeader().setStretchLastSection(True)
+        self.teacher_views_table.verticalHeader().setVisible(False)
+        analytics_layout.addWidget(self.teacher_views_table, stretch=1)
+        
+        # Duplicates tab: lessons copied from others, or reusing an image under a new name
+        duplicates_tab = QWidget()
+        duplicates_layout = QVBoxLayout(duplicates_tab)
+        
+        duplicates_toolbar = QHBoxLayout()
+        duplicates_label = QLabel()
+        duplicates_label.setObjectName("sectionLabel")
+        self.translations.register(duplicates_label, "admin.duplicates.title")
+        duplicates_toolbar.addWidget(duplicates_label)
+        duplicates_toolbar.addStretch()
+        self.duplicates_status = QLabel()
+        duplicates_toolbar.addWidget(self.duplicates_status)
+        self.scan_button = QPushButton()
+        self.translations.register(self.scan_button, "admin.duplicates.scan")
+        self.scan_button.clicked.connect(self.load_duplicates)
+        duplicates_toolbar.addWidget(self.scan_button)
+        duplicates_layout.addLayout(duplicates_toolbar)
+        
+        self.duplicates_table = QTableWidget()
+        self.duplicates_table.setColumnCount(3)
+        self.duplicates_table.setHorizontalHeaderLabels(["Kind", "Similarity", "Lessons"])
+        self.register_headers(self.duplicates_table, [
+            "admin.column.kind", "admin.column.similarity", "admin.column.lessons"
+        ])
+        self.duplicates_table.horizontalHeader().setStretchLastSection(True)
+        self.duplicates_table.verticalHeader().setVisible(False)
+        duplicates_layout.addWidget(self.duplicates_table)
+        
+        # Statistics tab: read from counter tables kept current by triggers,
+        # so it costs the same however many users and lessons there are
+        statistics_tab = QWidget()
+        statistics_layout = QVBoxLayout(statistics_tab)
+        
+        statistics_toolbar = QHBoxLayout()
+        self.statistics_totals = QLabel()
+        self.statistics_totals.setObjectName("sectionLabel")
+        statistics_toolbar.addWidget(self.statistics_totals)
+        statistics_toolbar.addStretch()
+        statistics_refresh_btn = QPushButton()
+        self.translations.register(statistics_refresh_btn, "admin.analytics.refresh")
+        statistics_refresh_btn.clicked.connect(self.load_statistics)
+        statistics_toolbar.addWidget(statistics_refresh_btn)
+        statistics_layout.addLayout(statistics_toolbar)
+        
+        counts_layout = QHBoxLayout()
+        roles_layout = QVBoxLayout()
+        roles_label = QLabel()
+        self.translations.register(roles_label, "admin.statistics.roles")
+        roles_layout.addWidget(roles_label)
+        self.roles_table = QTableWidget()
+        self.roles_table.setColumnCount(2)
+        self.roles_table.setHorizontalHeaderLabels(["Role", "Users"])
+        self.register_headers(self.roles_table, ["admin.column.role", "admin.column.users"])
+        self.roles_table.horizontalHeader().setStretchLastSection(True)
+        self.roles_table.verticalHeader().setVisible(False)
+        roles_layout.addWidget(self.roles_table)
+        counts_layout.addLayout(roles_layout, stretch=1)
+        
+        teacher_stats_layout = QVBoxLayout()
+        teacher_stats_label = QLabel()
+        self.translations.register(teacher_stats_label, "admin.statistics.teachers")
+        teacher_stats_layout.addWidget(teacher_stats_label)
+        self.teacher_stats_table = QTableWidget()
+        self.teacher_stats_table.setColumnCount(3)
+        self.teacher_stats_table.setHorizontalHeaderLabels(["Teacher", "Lessons", "Media"])
+        self.register_headers(self.teacher_stats_table, [
+            "admin.column.teacher", "admin.column.lessons", "admin.column.media"
+        ])
+        self.teacher_stats_table.horizontalHeader().setStretchLastSection(True)
+        self.teacher_stats_table.verticalHeader().setVisible(False)
+        teacher_stats_layout.addWidget(self.teacher_stats_table)
+        counts_layout.addLayout(teacher_stats_layout, stretch=2)
+        statistics_layout.addLayout(counts_layout, stretch=1)
+        
+        growth_label = QLabel()
+        self.translations.register(growth_label, "admin.statistics.growth", days=STATISTICS_DAYS)
+        statistics_layout.addWidget(growth_label)
+        self.growth_table = QTableWidget()
+        self.growth_table.setColumnCount(5)
+        self.growth_table.setHorizontalHeaderLabels(["Day", "New Users", "New Lessons", "Total Users", "Total Lessons"])
+        self.register_headers(self.growth_table, [
+            "admin.column.day", "admin.column.new_users", "admin.column.new_lessons",
+            "admin.column.total_users", "admin.column.total_lessons"
+        ])
+        self.growth_table.horizontalHeader().setStretchLastSection(True)
+        self.growth_table.verticalHeader().setVisible(False)
+        statistics_layout.addWidget(self.growth_table, stretch=1)
+        
         # Add tabs
         tabs.addTab(users_tab, "Users")
         tabs.addTab(lessons_tab, "Lessons")
+        tabs.addTab(analytics_tab, "Analytics")
+        tabs.addTab(duplicates_tab, "Duplicates")
+        tabs.addTab(statistics_tab, "Statistics")
+        self.translations.register_callback(tabs, "tab0", "admin.users_tab", lambda text: tabs.setTabText(0, text))
+        self.translations.register_callback(tabs, "tab1", "admin.lessons_tab", lambda text: tabs.setTabText(1, text))
+        self.translations.register_callback(tabs, "tab2", "admin.analytics_tab", lambda text: tabs.setTabText(2, text))
+        self.translations.register_callback(tabs, "tab3", "admin.duplicates_tab", lambda text: tabs.setTabText(3, text))
+        self.translations.register_callback(tabs, "tab4", "admin.statistics_tab", lambda text: tabs.setTabText(4, text))
+        # Analytics and duplicates are loaded when their tab is first opened, and on Refresh/Scan
+        tabs.currentChanged.connect(lambda index: index == 2 and not self._analytics_loaded and self.load_analytics())
+        tabs.currentChanged.connect(lambda index: index == 3 and self._duplicates is None and self.load_duplicates())
+        # Statistics are cheap to read, so they are reloaded every time their tab is opened
+        tabs.currentChanged.connect(lambda index: index == 4 and self.load_statistics())
         main_layout.addWidget(tabs)
         
     def load_data(self):
-        # Load users
-        users = self.db.get_users()
+        self.load_users()
+        self.load_lessons()
+        
+    def load_users(self):
+        deliver(self.db_async.get_users(), self.show_users, owner=self, tag="users")
+        
+    def show_users(self, users: List[User]):
         self.users_table.setRowCount(len(users))
         for i, user in enumerate(users):
             self.users_table.setItem(i, 0, QTableWidgetItem(str(user.id)))
@@ -215,10 +290,12 @@ class AdminDashboard(QMainWindow):
             actions_layout = QHBoxLayout(actions_widget)
             actions_layout.setContentsMargins(0, 0, 0, 0)
             
-            edit_btn = QPushButton("Edit")
+            edit_btn = QPushButton()
+            self.translations.register(edit_btn, "common.edit")
             edit_btn.clicked.connect(lambda checked, u=user: self.edit_user(u))
             
-            delete_btn = QPushButton("Delete")
+            delete_btn = QPushButton()
+            self.translations.register(delete_btn, "common.delete")
             delete_btn.setObjectName("dangerButton")
             delete_btn.clicked.connect(lambda checked, u=user: self.delete_user(u))
             
@@ -226,16 +303,19 @@ class AdminDashboard(QMainWindow):
             actions_layout.addWidget(delete_btn)
             self.users_table.setCellWidget(i, 4, actions_widget)
 
-        # Load lessons
-        lessons = self.db.get_lessons()
+    def load_lessons(self):
+        self._lessons_stale = False
+        # Summaries carry the creator's name, so there is no per-row user lookup
+        deliver(self.db_async.get_lesson_summaries(), self.show_lessons, owner=self, tag="lessons")
+        
+    def show_lessons(self, lessons: List[LessonSummary]):
         self.lessons_table.setRowCount(len(lessons))
         for i, lesson in enumerate(lessons):
             self.lessons_table.setItem(i, 0, QTableWidgetItem(str(lesson.id)))
             self.lessons_table.setItem(i, 1, QTableWidgetItem(lesson.title))
             self.lessons_table.setItem(i, 2, QTableWidgetItem(lesson.title_ar))
             
-            creator = self.db.get_user(lesson.created_by)
-            creator_name = creator.username if creator else "Unknown"
+            creator_name = lesson.creator_name or "Unknown"
             self.lessons_table.setItem(i, 3, QTableWidgetItem(creator_name))
             
             created_at = lesson.created_at.strftime("%Y-%m-%d %H:%M") if lesson.created_at else "Unknown"
@@ -245,146 +325,225 @@ class AdminDashboard(QMainWindow):
             actions_layout = QHBoxLayout(actions_widget)
             actions_layout.setContentsMargins(0, 0, 0, 0)
             
-            delete_btn = QPushButton("Delete")
+            delete_btn = QPushButton()
+            self.translations.register(delete_btn, "common.delete")
             delete_btn.clicked.connect(lambda checked, l=lesson: self.delete_lesson(l))
             
             actions_layout.addWidget(delete_btn)
             self.lessons_table.setCellWidget(i, 5, actions_widget)
 
+    def load_analytics(self):
+        self._analytics_loaded = True
+        deliver(self.db_async.get_lesson_view_stats(ANALYTICS_DAYS), self.show_lesson_views,
+                owner=self, tag="lesson_views")
+        deliver(self.db_async.get_teacher_view_stats(), self.show_teacher_views, owner=self, tag="teacher_views")
+        
+    def show_lesson_views(self, stats: List[LessonViewStats]):
+        self.lesson_views_table.setRowCount(len(stats))
+        for i, row in enumerate(stats):
+            title = row.title_ar if self.current_language == "ar" else row.title
+            self.lesson_views_table.setItem(i, 0, QTableWidgetItem(str(row.lesson_id)))
+            self.lesson_views_table.setItem(i, 1, QTableWidgetItem(title))
+            self.lesson_views_table.setItem(i, 2, QTableWidgetItem(str(row.views)))
+            self.lesson_views_table.setItem(i, 3, QTableWidgetItem(format_duration(row.watched_ms / 1000) or "0:00"))
+            
+    def show_teacher_views(self, stats: List[TeacherViewStats]):
+        self.teacher_views_table.setRowCount(len(stats))
+        for i, row in enumerate(stats):
+            self.teacher_views_table.setItem(i, 0, QTableWidgetItem(row.username or "Unknown"))
+            self.teacher_views_table.setItem(i, 1, QTableWidgetItem(str(row.views)))
+            self.teacher_views_table.setItem(i, 2, QTableWidgetItem(format_duration(row.watched_ms / 1000) or "0:00"))
+
+    def load_duplicates(self):
+        """Scan in the background; only lessons and images changed since the last scan are hashed again."""
+        self._duplicates = []
+        self.scan_button.setEnabled(False)
+        self.translations.register(self.duplicates_status, "admin.duplicates.scanning")
+        deliver(self.db_async.find_duplicates(), self.show_duplicates, owner=self, tag="duplicates",
+                on_error=self.handle_scan_error)
+        
+    def handle_scan_error(self, error: BaseException):
+        print(f"Database error: {error}")
+        self.show_duplicates([])
+        
+    def show_duplicates(self, groups: List[DuplicateGroup]):
+        self._duplicates = groups
+        self.scan_button.setEnabled(True)
+        self.translations.register(self.duplicates_status, "admin.duplicates.found", count=len(groups))
+        self.duplicates_table.setRowCount(len(groups))
+        for i, group in enumerate(groups):
+            titles = group.titles_ar if self.current_language == "ar" else group.titles
+            lessons = QTableWidgetItem(", ".join(f"{lesson_id}: {title}"
+                                                 for lesson_id, title in zip(group.lesson_ids, titles)))
+            lessons.setToolTip("\n".join(group.paths))
+            self.duplicates_table.setItem(i, 0, QTableWidgetItem(self.translations.text(f"admin.duplicates.{group.kind}")))
+            self.duplicates_table.setItem(i, 1, QTableWidgetItem(f"{group.similarity:.0%}"))
+            self.duplicates_table.setItem(i, 2, lessons)
+
+    def load_statistics(self):
+        deliver(self.db_async.get_statistics(STATISTICS_DAYS), self.show_statistics, owner=self, tag="statistics")
+        
+    def show_statistics(self, statistics: Optional[PlatformStatistics]):
+        if statistics is None:
+            return
+        self.translations.register(self.statistics_totals, "admin.statistics.totals",
+                                   users=statistics.total_users, lessons=statistics.total_lessons)
+        self.roles_table.setRowCount(len(statistics.users_by_role))
+        for i, (role, count) in enumerate(statistics.users_by_role.items()):
+            self.roles_table.setItem(i, 0, QTableWidgetItem(role))
+            self.roles_table.setItem(i, 1, QTableWidgetItem(str(count)))
+        self.teacher_stats_table.setRowCount(len(statistics.teachers))
+        for i, row in enumerate(statistics.teachers):
+            self.teacher_stats_table.setItem(i, 0, QTableWidgetItem(row.username or "Unknown"))
+            self.teacher_stats_table.setItem(i, 1, QTableWidgetItem(str(row.lessons)))
+            self.teacher_stats_table.setItem(i, 2, QTableWidgetItem(format_size(row.media_bytes) or "0 B"))
+        # Newest day first
+        self.growth_table.setRowCount(len(statistics.growth))
+        for i, row in enumerate(reversed(statistics.growth)):
+            self.growth_table.setItem(i, 0, QTableWidgetItem(row.day))
+            self.growth_table.setItem(i, 1, QTableWidgetItem(f"{row.users:+d}"))
+            self.growth_table.setItem(i, 2, QTableWidgetItem(f"{row.lessons:+d}"))
+            self.growth_table.setItem(i, 3, QTableWidgetItem(str(row.total_users)))
+            self.growth_table.setItem(i, 4, QTableWidgetItem(str(row.total_lessons)))
+
+    def invalidate_lessons(self, lesson_ids):
+        """Lessons changed elsewhere; reload the lessons table when next shown."""
+        self._lessons_stale = True
+        if self.isVisible():
+            self.refresh()
+            
+    def refresh(self):
+        if self._lessons_stale:
+            self.load_lessons()
+
     def add_user(self):
         dialog = UserDialog(self)
         if dialog.exec():
-            username = dialog.username.text()
+            username = dialog.username.text().strip()
             password = dialog.password.text()
             role = dialog.role.currentText()
             language = dialog.language.currentText()
             
-            user = self.db.add_user(username, password, role, language)
-            if user:
-                self.load_data()
-                QMessageBox.information(self, "Success", "User added successfully!")
-            else:
-                QMessageBox.warning(self, "Error", f"Username '{username}' already exists. Please choose a different username.")
+            deliver(self.db_async.add_user(username, password, role, language),
+                    lambda user: self.user_added(user, username), owner=self)
+                    
+    def user_added(self, user: Optional[User], username: str):
+        if user:
+            self.load_users()
+            QMessageBox.information(self, "Success", "User added successfully!")
+        else:
+            QMessageBox.warning(self, "Error", f"Username '{username}' already exists. Please choose a different username.")
 
     def edit_user(self, user: User):
         dialog = UserDialog(self, user)
         if dialog.exec():
-            username = dialog.username.text()
+            username = dialog.username.text().strip()
             role = dialog.role.currentText()
             language = dialog.language.currentText()
             
-            if self.db.update_user(user.id, username, role, language):
-                self.load_data()
-                QMessageBox.information(self, "Success", "User updated successfully!")
-            else:
-                QMessageBox.warning(self, "Error", f"Username '{username}' is already taken by another user. Please choose a different username.")
+            deliver(self.db_async.update_user(user.id, username, role, language),
+                    lambda updated: self.user_updated(updated, user, username), owner=self)
+                    
+    def user_updated(self, updated: bool, user: User, username: str):
+        if updated:
+            self.nav.forget_user(user.id)
+            self.load_data()
+            QMessageBox.information(self, "Success", "User updated successfully!")
+        else:
+            QMessageBox.warning(self, "Error", f"Username '{username}' is already taken by another user. Please choose a different username.")
 
     def delete_user(self, user: User):
         if user.role == 'admin':
             QMessageBox.warning(self, "Error", "Cannot delete admin user!")
             return
             
+        # Dry run first so the confirmation can say how much media goes too
+        deliver(self.db_async.preview_deletion(user_ids=[user.id]),
+                lambda preview: self.confirm_delete_user(user, preview), owner=self)
+        
+    def confirm_delete_user(self, user: User, preview: DeletionResult):
         reply = QMessageBox.question(self, "Confirm Delete",
                                    f"Are you sure you want to delete user {user.username}?\n"
-                                   "This will also delete all lessons created by this user.",
+                                   "This will also delete all lessons created by this user."
+                                   f"{self.media_summary(preview)}",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.db.delete_user(user.id):
-                self.load_data()
-                QMessageBox.information(self, "Success", "User deleted successfully!")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to delete user.")
+            deliver(self.db_async.delete_users([user.id]),
+                    lambda result: self.user_deleted(result, user), owner=self)
+                    
+    def user_deleted(self, result: Optional[DeletionResult], user: User):
+        if result and user.id in result.user_ids:
+            self.file_manager.remove_media_in_background(result.orphaned_media)
+            self.nav.forget_user(user.id)
+            self.nav.notify_lessons_changed(result.lesson_ids)
+            self.load_users()
+            QMessageBox.information(self, "Success", "User deleted successfully!")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to delete user.")
 
-    def delete_lesson(self, lesson: Lesson):
+    def delete_lesson(self, lesson: LessonSummary):
+        deliver(self.db_async.preview_deletion(lesson_ids=[lesson.id]),
+                lambda preview: self.confirm_delete_lesson(lesson, preview), owner=self)
+        
+    def confirm_delete_lesson(self, lesson: LessonSummary, preview: DeletionResult):
         reply = QMessageBox.question(self, "Confirm Delete",
-                                   f"Are you sure you want to delete lesson {lesson.title}?",
+                                   f"Are you sure you want to delete lesson {lesson.title}?"
+                                   f"{self.media_summary(preview)}",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.db.delete_lesson(lesson.id):
-                self.load_data()
-                QMessageBox.information(self, "Success", "Lesson deleted successfully!")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to delete lesson.")
+            deliver(self.db_async.delete_lessons([lesson.id]),
+                    lambda result: self.lesson_deleted(result, lesson), owner=self)
+                    
+    def lesson_deleted(self, result: Optional[DeletionResult], lesson: LessonSummary):
+        if result and lesson.id in result.lesson_ids:
+            self.file_manager.remove_media_in_background(result.orphaned_media)
+            # Also reloads this window's lessons table
+            self.nav.notify_lessons_changed(result.lesson_ids)
+            QMessageBox.information(self, "Success", "Lesson deleted successfully!")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to delete lesson.")
+
+    def media_summary(self, preview: DeletionResult) -> str:
+        """Confirmation suffix with the media a deletion would free, if any."""
+        if not preview.media_files:
+            return ""
+        return f"\n{preview.media_files} media file(s), {preview.media_bytes / (1024 * 1024):.1f} MB, will be removed."
 
     @pyqtSlot(str)
     def change_language(self, language: str):
         lang_code = 'ar' if language == 'العربية' else 'en'
-        if self.db.update_user_language(self.user.id, lang_code):
+        deliver(self.db_async.update_user_language(self.user.id, lang_code),
+                lambda updated: self.language_saved(updated, lang_code), owner=self, tag="language")
+        
+    def language_saved(self, updated: bool, lang_code: str):
+        if updated:
             self.user.language = lang_code
+            self.current_language = lang_code
             self.update_ui_text()
+            if self._analytics_loaded:
+                # Lesson titles are shown in the current language
+                self.load_analytics()
+            if self._duplicates:
+                self.show_duplicates(self._duplicates)
 
     def update_ui_text(self):
-        if self.current_language == "ar":
-            self.setWindowTitle('منصة التعليم - لوحة تحكم المشرف')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText("لوحة تحكم المشرف")
-                elif widget.text() == "Users":
-                    widget.setText("المستخدمون")
-                elif widget.text() == "Lessons":
-                    widget.setText("الدروس")
-                elif widget.text() == "Username":
-                    widget.setText("اسم المستخدم")
-                elif widget.text() == "Role":
-                    widget.setText("الدور")
-                elif widget.text() == "Actions":
-                    widget.setText("الإجراءات")
-                elif widget.text() == "Title":
-                    widget.setText("العنوان")
-                elif widget.text() == "Created By":
-                    widget.setText("أنشئ بواسطة")
-                    
-            # Update buttons
-            for button in self.findChildren(QPushButton):
-                if button.text() == "Add User":
-                    button.setText("إضافة مستخدم")
-                elif button.text() == "Edit":
-                    button.setText("تعديل")
-                elif button.text() == "Delete":
-                    button.setText("حذف")
-                elif button.text() == "Add Lesson":
-                    button.setText("إضافة درس")
-        else:
-            self.setWindowTitle('Educational Platform - Admin Dashboard')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText("Admin Dashboard")
-                elif widget.text() == "المستخدمون":
-                    widget.setText("Users")
-                elif widget.text() == "الدروس":
-                    widget.setText("Lessons")
-                elif widget.text() == "اسم المستخدم":
-                    widget.setText("Username")
-                elif widget.text() == "الدور":
-                    widget.setText("Role")
-                elif widget.text() == "الإجراءات":
-                    widget.setText("Actions")
-                elif widget.text() == "العنوان":
-                    widget.setText("Title")
-                elif widget.text() == "أنشئ بواسطة":
-                    widget.setText("Created By")
-                    
-            # Update buttons
-            for button in self.findChildren(QPushButton):
-                if button.text() == "إضافة مستخدم":
-                    button.setText("Add User")
-                elif button.text() == "تعديل":
-                    button.setText("Edit")
-                elif button.text() == "حذف":
-                    button.setText("Delete")
-                elif button.text() == "إضافة درس":
-                    button.setText("Add Lesson")
+        self.translations.set_language(self.current_language)
+
+    def register_headers(self, table: QTableWidget, keys):
+        """Translate a table's horizontal header labels through the catalog."""
+        for column, key in enumerate(keys):
+            self.translations.register_callback(
+                table, f"header{column}", key,
+                lambda text, column=column: table.horizontalHeaderItem(column).setText(text)
+            )
 
 
 class UserDialog(QDialog):
     def __init__(self, parent=None, user: User = None):
         super().__init__(parent)
         self.user = user
-        self.db = Database()
         self.setup_ui()
 
     def setup_ui(self):
@@ -429,70 +588,19 @@ class UserDialog(QDialog):
         button_layout.addWidget(cancel_btn)
         layout.addRow("", button_layout)
 
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1E1E2E;
-                color: #CDD6F4;
-            }
-            QLabel {
-                color: #CDD6F4;
-            }
-            QLineEdit, QComboBox {
-                background-color: #313244;
-                color: #CDD6F4;
-                border: 1px solid #45475A;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QLineEdit:focus, QComboBox:focus {
-                border: 1px solid #89B4FA;
-            }
-            QPushButton {
-                background-color: #89B4FA;
-                color: #1E1E2E;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-            }
-            QPushButton:hover {
-                background-color: #B4BEFE;
-            }
-        """)
+        self.setObjectName("userDialog")
 
     def accept(self):
+        # Only validates the form: the dashboard saves the user on its
+        # writer thread and reports duplicate usernames from the result
         username = self.username.text().strip()
-        role = self.role.currentText()
-        language = self.language.currentText()
         
         if not username:
             QMessageBox.warning(self, "Error", "Please enter a username")
             return
             
-        if not self.user:  # Creating new user
-            password = self.password.text()
-            if not password:
-                QMessageBox.warning(self, "Error", "Please enter a password")
-                return
-                
-            # Check if username exists before trying to create
-            existing_user = self.db.get_user_by_username(username)
-            if existing_user:
-                QMessageBox.warning(self, "Error", f"Username '{username}' already exists. Please choose a different username.")
-                return
-                
-            user = self.db.add_user(username, password, role, language)
-            if user:
-                super().accept()
-            else:
-                QMessageBox.critical(self, "Error", "Failed to create user. Please try again.")
-        else:  # Updating existing user
-            if username != self.user.username:  # Only check if username changed
-                existing_user = self.db.get_user_by_username(username)
-                if existing_user:
-                    QMessageBox.warning(self, "Error", f"Username '{username}' is already taken by another user. Please choose a different username.")
-                    return
-                    
-            if self.db.update_user(self.user.id, username, role, language):
-                super().accept()
-            else:
-                QMessageBox.critical(self, "Error", "Failed to update user. Please try again.") 
\ No newline at end of file
+        if not self.user and not self.password.text():
+            QMessageBox.warning(self, "Error", "Please enter a password")
+            return
+            
+        super().accept()
\ No newline at end of file
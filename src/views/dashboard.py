@@ -3,97 +3,45 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QFrame, QSizePolicy)
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QFont, QIcon, QPixmap
-from src.models.database import Database, User, Lesson
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from src.models.database import LESSON_ORDERS, Database, User, Lesson, LessonProgress, LessonSummary
 from .lesson_card import LessonCard
-from .lesson_detail import LessonDetailWindow
 from src.utils.navigation import NavigationManager
+from src.utils.futures import deliver
+from src.utils.translations import TranslationCatalog
 
 class Dashboard(QMainWindow):
+    WINDOW_TITLE_KEY = "dashboard.window_title"
+    # "Continue watching" and "recently viewed" rails above the grid
+    SHOW_WATCHED = False
+    WATCHED_LIMIT = 24
+    
     def __init__(self, db: Database, user: User):
         super().__init__()
         self.db = db
         self.user = user
         self.current_language = user.language
         self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
+        self.translations = TranslationCatalog(self.current_language)
+        self.lessons: List[LessonSummary] = []
+        self.lesson_cards: Dict[int, QWidget] = {}
+        self._grid_columns = 0
+        self._stale_lesson_ids: Set[int] = set()
+        self._reload_all = False
+        self._fetching = False
+        # A LESSON_ORDERS key
+        self.order = "newest"
+        self.rail_cards: List[QWidget] = []
+        self._watched_stale = False
         self.init_ui()
-        # Set initial language
-        self.update_ui_text()
         
     def init_ui(self):
-        self.setWindowTitle('Educational Platform - Dashboard')
+        self.translations.register(self, self.WINDOW_TITLE_KEY, "setWindowTitle")
         self.setMinimumSize(1000, 600)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QComboBox {
-                padding: 8px 15px;
-                border: 2px solid #89b4fa;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QComboBox:hover {
-                border-color: #b4befe;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-                width: 12px;
-                height: 12px;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background-color: #313244;
-                width: 10px;
-                margin: 0;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #89b4fa;
-                border-radius: 5px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #b4befe;
-            }
-            QFrame#headerFrame {
-                background-color: #313244;
-                border-radius: 10px;
-                padding: 10px;
-            }
-            QFrame#contentFrame {
-                background-color: #313244;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        self.setObjectName("dashboardWindow")
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -110,7 +58,7 @@ class Dashboard(QMainWindow):
         
         # Welcome message
         self.welcome_label = QLabel()
-        self.update_welcome_message()
+        self.translations.register(self.welcome_label, "dashboard.welcome", username=self.user.username)
         self.welcome_label.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
         header_layout.addWidget(self.welcome_label)
         
@@ -118,6 +66,16 @@ class Dashboard(QMainWindow):
         controls_layout = QHBoxLayout()
         controls_layout.setSpacing(15)
         
+        # Grid ordering
+        self.order_combo = QComboBox()
+        for index, order in enumerate(LESSON_ORDERS):
+            self.order_combo.addItem(order, order)
+            self.translations.register_callback(
+                self.order_combo, f"order{index}", f"dashboard.order.{order}",
+                lambda text, index=index: self.order_combo.setItemText(index, text))
+        self.order_combo.currentIndexChanged.connect(self.change_order)
+        controls_layout.addWidget(self.order_combo)
+        
         # Language selector
         self.lang_combo = QComboBox()
         self.lang_combo.addItems(["English", "العربية"])
@@ -126,7 +84,8 @@ class Dashboard(QMainWindow):
         controls_layout.addWidget(self.lang_combo)
         
         # Logout button
-        self.logout_button = QPushButton("Logout")
+        self.logout_button = QPushButton()
+        self.translations.register(self.logout_button, "common.logout")
         self.logout_button.setFixedWidth(120)
         self.logout_button.clicked.connect(self.handle_logout)
         controls_layout.addWidget(self.logout_button)
@@ -140,11 +99,18 @@ class Dashboard(QMainWindow):
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(0, 0, 0, 0)
         
+        if self.SHOW_WATCHED:
+            self.continue_rail = self.create_rail(content_layout, "dashboard.continue_watching")
+            self.recent_rail = self.create_rail(content_layout, "dashboard.recently_viewed")
+            # Saved positions change what the rails show
+            self.nav_manager.get_progress_tracker().saved.connect(self.invalidate_watched)
+        
         # Lessons section title
-        lessons_title = QLabel("Available Lessons")
-        lessons_title.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        lessons_title.setContentsMargins(20, 0, 0, 20)
-        content_layout.addWidget(lessons_title)
+        self.lessons_title = QLabel()
+        self.translations.register(self.lessons_title, "dashboard.available_lessons")
+        self.lessons_title.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
+        self.lessons_title.setContentsMargins(20, 0, 0, 20)
+        content_layout.addWidget(self.lessons_title)
         
         # Lessons grid
         self.lessons_scroll = QScrollArea()
@@ -161,67 +127,211 @@ class Dashboard(QMainWindow):
         
         # Load lessons
         self.load_lessons()
+        if self.SHOW_WATCHED:
+            self.load_watched()
         
-    def update_welcome_message(self):
-        if self.current_language == "ar":
-            self.welcome_label.setText(f"مرحباً {self.user.username}")
-        else:
-            self.welcome_label.setText(f"Welcome, {self.user.username}")
-            
     def update_language(self, lang: str):
+        # Cards are subscribed to the catalog and re-render themselves, so
+        # switching language needs neither a query nor new widgets
         self.current_language = "ar" if lang == "العربية" else "en"
-        self.update_welcome_message()
         self.update_ui_text()
-        self.load_lessons()
         
     def update_ui_text(self):
-        if self.current_language == "ar":
-            self.setWindowTitle('منصة التعليم - لوحة التحكم')
-            self.logout_button.setText('تسجيل الخروج')
-            # Find and update the lessons title label
-            for widget in self.findChildren(QLabel):
-                if widget.text() == "Available Lessons":
-                    widget.setText("الدروس المتاحة")
-        else:
-            self.setWindowTitle('Educational Platform - Dashboard')
-            self.logout_button.setText('Logout')
-            # Find and update the lessons title label
-            for widget in self.findChildren(QLabel):
-                if widget.text() == "الدروس المتاحة":
-                    widget.setText("Available Lessons")
+        self.translations.set_language(self.current_language)
+        
+    def change_order(self, index: int):
+        self.order = self.order_combo.itemData(index)
+        self.load_lessons()
+            
+    def create_rail(self, layout: QVBoxLayout, title_key: str) -> Tuple[QWidget, QHBoxLayout]:
+        """Add a titled, horizontally scrolling row of cards; it stays hidden while empty."""
+        rail = QWidget()
+        rail_layout = QVBoxLayout(rail)
+        rail_layout.setContentsMargins(0, 0, 0, 10)
+        
+        title = QLabel()
+        self.translations.register(title, title_key)
+        title.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
+        title.setContentsMargins(20, 0, 0, 10)
+        rail_layout.addWidget(title)
+        
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll.setFixedHeight(320)
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.setSpacing(20)
+        row_layout.setContentsMargins(20, 0, 20, 0)
+        row_layout.addStretch()
+        scroll.setWidget(row)
+        rail_layout.addWidget(scroll)
+        
+        rail.hide()
+        layout.addWidget(rail)
+        return rail, row_layout
+        
+    def load_watched(self):
+        """Fetch the user's recently opened lessons for the rails, in one indexed query."""
+        self._watched_stale = False
+        deliver(self.db_async.get_watched_lessons(self.user.id, self.WATCHED_LIMIT),
+                self.set_watched, owner=self, tag="watched")
+        
+    def set_watched(self, watched: List[Tuple[LessonSummary, LessonProgress]]):
+        """Split watched lessons into started-but-unfinished and the rest, newest first."""
+        for card in self.rail_cards:
+            card.setParent(None)
+            card.deleteLater()
+        self.rail_cards = []
+        
+        started = [item for item in watched if item[1].in_progress]
+        viewed = [item for item in watched if not item[1].in_progress]
+        for (rail, row_layout), items in ((self.continue_rail, started), (self.recent_rail, viewed)):
+            for summary, progress in items:
+                card = LessonCard(summary, self.current_language,
+                                  progress.fraction if progress.duration_ms else None)
+                self.translations.subscribe(card, card.set_language)
+                card.setFixedWidth(300)
+                card.clicked.connect(lambda s=summary: self.show_lesson_detail(s))
+                # Before the trailing stretch
+                row_layout.insertWidget(row_layout.count() - 1, card)
+                self.rail_cards.append(card)
+            rail.setVisible(bool(items))
+        
+    def invalidate_watched(self):
+        self._watched_stale = True
+        self.refresh_if_visible()
             
     def load_lessons(self):
-        # Clear existing lessons
-        for i in reversed(range(self.lessons_grid.count())): 
-            self.lessons_grid.itemAt(i).widget().setParent(None)
+        """Fetch every lesson shown by this dashboard; the grid is rebuilt when they arrive."""
+        self._stale_lesson_ids.clear()
+        self._reload_all = False
+        self._fetching = True
+        # A newer fetch with the same tag makes any in-flight one obsolete
+        deliver(self.fetch_lessons(), self.set_lessons, owner=self, tag="lessons",
+                on_error=self.handle_fetch_error)
+        
+    def set_lessons(self, lessons: List[LessonSummary]):
+        """Replace every card with the freshly fetched lessons."""
+        self._fetching = False
+        for card in self.lesson_cards.values():
+            card.setParent(None)
+            card.deleteLater()
             
-        # Get lessons from database
-        lessons = self.db.get_lessons()
+        self.lessons = lessons
+        self.lesson_cards = {lesson.id: self.create_card(lesson) for lesson in self.lessons}
+        self.layout_cards(force=True)
+        self.refresh_if_visible()
+        
+    def fetch_lessons(self, lesson_ids: Optional[List[int]] = None) -> Future:
+        """Start fetching summaries of the lessons this dashboard lists, optionally only some ids."""
+        return self.db_async.get_lesson_summaries(lesson_ids=lesson_ids, order=self.order)
+        
+    def handle_fetch_error(self, error: BaseException):
+        self._fetching = False
+        print(f"Database error: {error}")
+        
+    def accepts_lesson(self, lesson: LessonSummary) -> bool:
+        """Whether a changed lesson belongs on this dashboard."""
+        return True
         
+    def create_card(self, lesson: LessonSummary) -> QWidget:
+        """Build the grid widget for a single lesson."""
+        card = LessonCard(lesson, self.current_language)
+        self.translations.subscribe(card, card.set_language)
+        card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        card.clicked.connect(lambda l=lesson: self.show_lesson_detail(l))
+        return card
+        
+    def grid_columns(self) -> int:
         # Calculate grid dimensions based on window width
         grid_width = self.lessons_scroll.viewport().width()
         card_width = 300  # Minimum card width
-        columns = max(1, grid_width // (card_width + self.lessons_grid.spacing()))
+        return max(1, grid_width // (card_width + self.lessons_grid.spacing()))
+        
+    def layout_cards(self, force: bool = False):
+        """Place the existing cards in the grid without rebuilding them."""
+        columns = self.grid_columns()
+        if columns == self._grid_columns and not force:
+            return
+        self._grid_columns = columns
         
-        # Add lessons to grid
-        for i, lesson in enumerate(lessons):
-            row = i // columns
-            col = i % columns
+        while self.lessons_grid.count():
+            self.lessons_grid.takeAt(0)
+        for i, lesson in enumerate(self.lessons):
+            self.lessons_grid.addWidget(self.lesson_cards[lesson.id], i // columns, i % columns)
+            
+    def invalidate_lessons(self, lesson_ids: Optional[Set[int]]):
+        """Mark lessons as changed; None means everything may have changed."""
+        if lesson_ids is None:
+            self._reload_all = True
+        else:
+            self._stale_lesson_ids.update(lesson_ids)
+        # The rails may show any of them
+        self._watched_stale = self.SHOW_WATCHED
+        self.refresh_if_visible()
             
-            card = LessonCard(lesson, self.current_language)
-            card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-            card.clicked.connect(lambda l=lesson: self.show_lesson_detail(l))
-            self.lessons_grid.addWidget(card, row, col)
+    def refresh_if_visible(self):
+        # Hidden dashboards catch up when navigation shows them again
+        if self.isVisible():
+            self.refresh()
+            
+    def refresh(self):
+        """Bring the grid up to date, re-fetching only lessons marked as changed."""
+        if self._watched_stale:
+            self.load_watched()
+        if self._fetching:
+            # Changes made meanwhile are picked up once the current fetch lands
+            return
+        if self._reload_all:
+            self.load_lessons()
+            return
+        if not self._stale_lesson_ids:
+            return
+            
+        # One query for every changed lesson that still exists
+        stale = self._stale_lesson_ids
+        self._stale_lesson_ids = set()
+        self._fetching = True
+        deliver(self.fetch_lessons(lesson_ids=list(stale)),
+                lambda lessons: self.apply_changed_lessons(stale, lessons),
+                owner=self, tag="lessons", on_error=self.handle_fetch_error)
+        
+    def apply_changed_lessons(self, stale: Set[int], lessons: List[LessonSummary]):
+        """Swap the cards of changed lessons for the re-fetched ones."""
+        self._fetching = False
+        for lesson_id in stale:
+            card = self.lesson_cards.pop(lesson_id, None)
+            if card:
+                card.setParent(None)
+                card.deleteLater()
+        self.lessons = [l for l in self.lessons if l.id not in stale]
+        
+        for lesson in lessons:
+            if self.accepts_lesson(lesson):
+                self.lessons.append(lesson)
+                self.lesson_cards[lesson.id] = self.create_card(lesson)
+        
+        # Keep the order the database returned them in (see LESSON_ORDERS)
+        if self.order == "popular":
+            self.lessons.sort(key=lambda l: (l.popularity, l.id), reverse=True)
+        else:
+            self.lessons.sort(key=lambda l: (l.created_at or datetime.min, l.id), reverse=True)
+        self.layout_cards(force=True)
+        self.refresh_if_visible()
             
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Reload lessons grid when window is resized
-        self.load_lessons()
+        # Re-flow the existing cards when the number of columns changes
+        self.layout_cards()
+        
+    def show_lesson_detail(self, summary: LessonSummary):
+        # Cards only hold a summary; load the full lesson for the detail view
+        deliver(self.db_async.get_lesson(summary.id), self.open_lesson_detail, owner=self, tag="detail")
         
-    def show_lesson_detail(self, lesson: Lesson):
-        # Store the detail window as an instance variable to prevent garbage collection
-        self.detail_window = LessonDetailWindow(lesson, self.current_language)
-        self.detail_window.show()
+    def open_lesson_detail(self, lesson: Optional[Lesson]):
+        if lesson:
+            self.nav_manager.show_lesson_detail(lesson, self.current_language, self.user.id)
         
     def handle_logout(self):
         self.nav_manager.logout() 
\ No newline at end of file
@@ -1,36 +1,26 @@
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QHBoxLayout
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QHBoxLayout, QProgressBar
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QFont, QColor, QPalette
-from src.models.database import Lesson
+from typing import Optional
+from src.models.database import LessonSummary
+from src.utils.media_info import format_duration, format_size
 
 class LessonCard(QFrame):
     clicked = pyqtSignal()
     
-    def __init__(self, lesson: Lesson, language: str):
+    def __init__(self, lesson: LessonSummary, language: str, progress: Optional[float] = None):
         super().__init__()
         self.lesson = lesson
         self.language = language
+        # Fraction of the video watched, shown as a bar under the image
+        self.progress = progress
         self.init_ui()
         
     def init_ui(self):
         self.setFixedHeight(300)
         self.setMinimumWidth(300)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #313244;
-                border-radius: 10px;
-            }
-            QFrame:hover {
-                background-color: #45475a;
-            }
-            QLabel {
-                color: #cdd6f4;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-weight: bold;
-            }
-        """)
+        # Styled by the application stylesheet (see src/utils/theme.py)
+        self.setObjectName("lessonCard")
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -39,16 +29,8 @@ class LessonCard(QFrame):
         
         # Image container
         image_container = QFrame()
+        image_container.setObjectName("lessonCardImage")
         image_container.setFixedHeight(180)
-        image_container.setStyleSheet("""
-            QFrame {
-                background-color: #1e1e2e;
-                border-top-left-radius: 10px;
-                border-top-right-radius: 10px;
-                border-bottom-left-radius: 0px;
-                border-bottom-right-radius: 0px;
-            }
-        """)
         
         # Image
         image_layout = QVBoxLayout(image_container)
@@ -61,12 +43,21 @@ class LessonCard(QFrame):
             scaled_pixmap = pixmap.scaled(300, 180, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             image_label.setPixmap(scaled_pixmap)
         else:
+            image_label.setObjectName("lessonCardPlaceholder")
             image_label.setText("No image")
-            image_label.setStyleSheet("color: #6c7086; font-size: 14px;")
         
         image_layout.addWidget(image_label)
         layout.addWidget(image_container)
         
+        if self.progress is not None:
+            progress_bar = QProgressBar()
+            progress_bar.setObjectName("lessonCardProgress")
+            progress_bar.setRange(0, 1000)
+            progress_bar.setValue(int(self.progress * 1000))
+            progress_bar.setTextVisible(False)
+            progress_bar.setFixedHeight(4)
+            layout.addWidget(progress_bar)
+        
         # Content container
         content_container = QFrame()
         content_layout = QVBoxLayout(content_container)
@@ -74,35 +65,48 @@ class LessonCard(QFrame):
         content_layout.setSpacing(10)
         
         # Title
-        title_label = QLabel()
-        title_label.setObjectName("titleLabel")
-        title_label.setFont(QFont("Segoe UI", 14))
-        title_label.setWordWrap(True)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.title_label = QLabel()
+        self.title_label.setObjectName("lessonCardTitle")
+        self.title_label.setFont(QFont("Segoe UI", 14))
+        self.title_label.setWordWrap(True)
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         
         # Description
-        desc_label = QLabel()
-        desc_label.setFont(QFont("Segoe UI", 12))
-        desc_label.setWordWrap(True)
-        desc_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.desc_label = QLabel()
+        self.desc_label.setFont(QFont("Segoe UI", 12))
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         
-        # Set text based on language
-        if self.language == "ar":
-            title_label.setText(self.lesson.title_ar)
-            desc_text = self.lesson.description_ar
-        else:
-            title_label.setText(self.lesson.title)
-            desc_text = self.lesson.description
-            
-        # Truncate description
-        if len(desc_text) > 100:
-            desc_text = desc_text[:97] + "..."
-        desc_label.setText(desc_text)
+        self.update_text()
+        
+        content_layout.addWidget(self.title_label)
+        content_layout.addWidget(self.desc_label)
         
-        content_layout.addWidget(title_label)
-        content_layout.addWidget(desc_label)
+        # Video length and size, when the file has been probed
+        meta = " · ".join(part for part in (format_duration(self.lesson.video_duration),
+                                            format_size(self.lesson.video_size)) if part)
+        if meta:
+            meta_label = QLabel(meta)
+            meta_label.setObjectName("lessonCardMeta")
+            meta_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+            content_layout.addWidget(meta_label)
         layout.addWidget(content_container)
         
+    def set_language(self, language: str):
+        """Re-render the card's text in place; the lesson already holds both languages."""
+        if language != self.language:
+            self.language = language
+            self.update_text()
+            
+    def update_text(self):
+        # Set text based on language; summaries come pre-truncated from the database
+        if self.language == "ar":
+            self.title_label.setText(self.lesson.title_ar)
+            self.desc_label.setText(self.lesson.summary_ar)
+        else:
+            self.title_label.setText(self.lesson.title)
+            self.desc_label.setText(self.lesson.summary)
+        
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.clicked.emit()
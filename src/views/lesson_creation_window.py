@@ -3,8 +3,11 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QFileDialog, QScrollArea, QMessageBox)
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QFont, QIcon, QPixmap
-from src.models.database import Database, User, Lesson
+from src.models.database import Database, User, Lesson, MediaInfo
 from src.utils.navigation import NavigationManager
+from src.utils.file_manager import FileManager
+from src.utils.futures import deliver
+from typing import Optional
 import os
 
 class LessonCreationWindow(QMainWindow):
@@ -13,6 +16,8 @@ class LessonCreationWindow(QMainWindow):
         self.db = db
         self.user = user
         self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
+        self.file_manager = FileManager()
         self.current_language = user.language  # Get language from user
         self.selected_video_path = None
         self.selected_image_path = None
@@ -23,97 +28,7 @@ class LessonCreationWindow(QMainWindow):
     def init_ui(self):
         self.setWindowTitle('Educational Platform - Create Lesson')
         self.setMinimumSize(1200, 800)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-size: 32px;
-                font-weight: bold;
-            }
-            QLabel#subtitleLabel {
-                color: #94e2d5;
-                font-size: 16px;
-            }
-            QLineEdit, QTextEdit {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 8px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                selection-background-color: #45475a;
-            }
-            QLineEdit:focus, QTextEdit:focus {
-                border: 2px solid #89b4fa;
-                background-color: #1e1e2e;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QPushButton#secondaryButton {
-                background-color: #313244;
-                color: #cdd6f4;
-                border: 2px solid #45475a;
-            }
-            QPushButton#secondaryButton:hover {
-                background-color: #45475a;
-                border-color: #89b4fa;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 12px;
-            }
-            QFrame#previewFrame {
-                background-color: #181825;
-                border: 2px solid #313244;
-            }
-            QLabel#fileLabel {
-                color: #a6e3a1;
-                font-size: 13px;
-            }
-            QLabel#errorLabel {
-                color: #f38ba8;
-                font-size: 14px;
-                margin: 8px;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background-color: #313244;
-                width: 10px;
-                margin: 0;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #45475a;
-                border-radius: 5px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #89b4fa;
-            }
-        """)
+        self.setObjectName("lessonCreationWindow")
         
         # Create central widget with scroll area
         central_widget = QWidget()
@@ -156,23 +71,13 @@ class LessonCreationWindow(QMainWindow):
         
         # Preview container
         preview_container = QFrame()
-        preview_container.setStyleSheet("""
-            QFrame {
-                background-color: #11111b;
-                border: 2px dashed #45475a;
-            }
-        """)
+        preview_container.setObjectName("previewContainer")
         preview_container_layout = QVBoxLayout(preview_container)
         
         self.preview_image = QLabel()
         self.preview_image.setFixedSize(480, 270)
         self.preview_image.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.preview_image.setStyleSheet("""
-            QLabel {
-                background-color: transparent;
-                border-radius: 8px;
-            }
-        """)
+        self.preview_image.setObjectName("previewImage")
         preview_container_layout.addWidget(self.preview_image, alignment=Qt.AlignmentFlag.AlignCenter)
         
         preview_layout.addWidget(preview_container)
@@ -314,8 +219,21 @@ class LessonCreationWindow(QMainWindow):
             created_at=None  # Will be set by database
         )
         
-        if self.db.add_lesson(lesson):
+        # Probe the video, then save on the writer thread; the button stays disabled until then
+        self.create_button.setEnabled(False)
+        deliver(self.file_manager.probe_media_in_background(lesson.video_path),
+                lambda info: self.save_new_lesson(lesson, info), owner=self)
+        
+    def save_new_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo]):
+        deliver(self.db_async.add_lesson(lesson, media_info), self.lesson_created, owner=self)
+        
+    def lesson_created(self, new_lesson: Optional[Lesson]):
+        self.create_button.setEnabled(True)
+        if new_lesson:
             self.close()  # Close the lesson creation window
+            self.nav_manager.notify_lessons_changed([new_lesson.id])
+            if not new_lesson.image_path:
+                self.nav_manager.queue_poster_frames([(new_lesson.id, new_lesson.video_path)])
             self.nav_manager.show_teacher_dashboard(self.user)
         else:
             self.show_error("Failed to create lesson")
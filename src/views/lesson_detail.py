@@ -5,81 +5,46 @@ from PyQt6.QtCore import Qt, QUrl, QTimer
 from PyQt6.QtGui import QFont, QPixmap, QIcon
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
-from src.models.database import Lesson
+from typing import List, Optional, Tuple
+from src.models.database import FINISHED_MARGIN_MS, Lesson, LessonProgress, LessonSummary
+from src.utils.futures import deliver
+from src.utils.navigation import NavigationManager
+from src.utils.translations import TranslationCatalog
+from src.utils.media_server import MediaServer
+from src.utils.progress_tracker import ProgressTracker
+
+# Position jumps larger than this are seeks, not playback
+MAX_PLAYBACK_STEP_MS = 2000
 
 class LessonDetailWindow(QMainWindow):
-    def __init__(self, lesson: Lesson, language: str):
+    def __init__(self, lesson: Lesson, language: str, user_id: Optional[int] = None,
+                 progress: Optional[ProgressTracker] = None):
         super().__init__()
         self.lesson = lesson
         self.current_language = language  # Get language from user
+        self.user_id = user_id
+        self.progress = progress
+        self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
+        self.related_buttons: List[Tuple[QPushButton, LessonSummary]] = []
+        # Positions are only recorded between play and stop, so the jump
+        # back to 0 when the player stops is never saved
+        self._tracking = False
+        self._resume_ms: Optional[int] = None
+        # The video registered with the media server, released on the next swap
+        self._media_path: Optional[str] = None
+        # The open view: (user id, lesson id), and how much of it was played
+        self._view: Optional[tuple] = None
+        self._watched_ms = 0
+        self._last_position = 0
+        self.translations = TranslationCatalog(language)
         self.init_ui()
-        # Set initial language
-        self.update_ui_text()
+        self.set_lesson(lesson, language, user_id)
         
     def init_ui(self):
-        self.setWindowTitle('Lesson Details')
+        self.translations.register(self, "lesson_detail.window_title", "setWindowTitle")
         self.setMinimumSize(1200, 800)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                font-size: 24px;
-                font-weight: bold;
-                color: #89b4fa;
-            }
-            QLabel#descriptionLabel {
-                font-size: 16px;
-                line-height: 1.6;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QPushButton:disabled {
-                background-color: #45475a;
-                color: #6c7086;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 10px;
-            }
-            QSlider::groove:horizontal {
-                border: none;
-                height: 6px;
-                background: #45475a;
-                border-radius: 3px;
-            }
-            QSlider::handle:horizontal {
-                background: #89b4fa;
-                width: 16px;
-                height: 16px;
-                margin: -5px 0;
-                border-radius: 8px;
-            }
-            QSlider::handle:horizontal:hover {
-                background: #b4befe;
-            }
-        """)
+        self.setObjectName("lessonDetailWindow")
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -95,11 +60,11 @@ class LessonDetailWindow(QMainWindow):
         content_layout.setContentsMargins(20, 20, 20, 20)
         
         # Title section
-        title_label = QLabel()
-        title_label.setObjectName("titleLabel")
-        title_label.setWordWrap(True)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        content_layout.addWidget(title_label)
+        self.title_label = QLabel()
+        self.title_label.setObjectName("titleLabel")
+        self.title_label.setWordWrap(True)
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        content_layout.addWidget(self.title_label)
         
         # Media section
         media_layout = QHBoxLayout()
@@ -120,6 +85,12 @@ class LessonDetailWindow(QMainWindow):
         self.media_player.setVideoOutput(self.video_widget)
         video_layout.addWidget(self.video_widget)
         
+        self.video_error_label = QLabel("Video not available")
+        self.video_error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.video_error_label.setObjectName("errorLabel")
+        self.video_error_label.hide()
+        video_layout.addWidget(self.video_error_label)
+        
         # Video controls
         controls_frame = QFrame()
         controls_layout = QVBoxLayout(controls_frame)
@@ -150,7 +121,7 @@ class LessonDetailWindow(QMainWindow):
         except:
             pass  # Keep text if icon failed to load
         self.stop_button.setFixedSize(40, 40)
-        self.stop_button.clicked.connect(self.media_player.stop)
+        self.stop_button.clicked.connect(self.stop_playback)
         buttons_layout.addWidget(self.stop_button)
         
         buttons_layout.addStretch()
@@ -164,69 +135,130 @@ class LessonDetailWindow(QMainWindow):
         image_layout = QVBoxLayout(image_container)
         image_layout.setContentsMargins(0, 0, 0, 0)
         
-        image_label = QLabel()
-        image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        pixmap = QPixmap(self.lesson.image_path)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(350, 350, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            image_label.setPixmap(scaled_pixmap)
-        else:
-            image_label.setText("No image available")
-            image_label.setStyleSheet("color: #6c7086; font-size: 16px;")
-        
-        image_layout.addWidget(image_label)
+        self.image_label = QLabel()
+        self.image_label.setObjectName("imageLabel")
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        image_layout.addWidget(self.image_label)
         media_layout.addWidget(image_container, stretch=1)
         
         content_layout.addLayout(media_layout)
         
         # Description
-        desc_label = QLabel()
-        desc_label.setObjectName("descriptionLabel")
-        desc_label.setWordWrap(True)
-        desc_label.setAlignment(Qt.AlignmentFlag.AlignJustify)
-        content_layout.addWidget(desc_label)
+        self.desc_label = QLabel()
+        self.desc_label.setObjectName("descriptionLabel")
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setAlignment(Qt.AlignmentFlag.AlignJustify)
+        content_layout.addWidget(self.desc_label)
+        
+        # Related lessons; hidden until the lesson has some
+        self.related_section = QWidget()
+        related_layout = QVBoxLayout(self.related_section)
+        related_layout.setContentsMargins(0, 0, 0, 0)
+        related_label = QLabel()
+        related_label.setObjectName("sectionLabel")
+        self.translations.register(related_label, "lesson_detail.related")
+        related_layout.addWidget(related_label)
+        related_scroll = QScrollArea()
+        related_scroll.setWidgetResizable(True)
+        related_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        related_scroll.setFixedHeight(70)
+        related_row = QWidget()
+        self.related_layout = QHBoxLayout(related_row)
+        self.related_layout.setSpacing(10)
+        self.related_layout.setContentsMargins(0, 0, 0, 0)
+        self.related_layout.addStretch()
+        related_scroll.setWidget(related_row)
+        related_layout.addWidget(related_scroll)
+        self.related_section.hide()
+        content_layout.addWidget(self.related_section)
         
         main_layout.addWidget(content_frame)
         
-        # Set up video player
-        if self.lesson.video_path:
+        # The player is shared by every lesson shown in this window
+        self.media_player.durationChanged.connect(self.update_duration)
+        self.media_player.positionChanged.connect(self.update_position)
+        self.progress_slider.sliderMoved.connect(self.set_position)
+        
+    def set_lesson(self, lesson: Lesson, language: str, user_id: Optional[int] = None):
+        """Swap the displayed lesson, reusing the widgets and media pipeline."""
+        self.stop_playback()
+        self.end_view()
+        self.lesson = lesson
+        self.current_language = language
+        self.user_id = user_id
+        self._resume_ms = None
+        
+        # Image
+        pixmap = QPixmap(lesson.image_path)
+        if not pixmap.isNull():
+            scaled_pixmap = pixmap.scaled(350, 350, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            self.image_label.setPixmap(scaled_pixmap)
+        else:
+            self.image_label.setText("No image available")
+            
+        # Video
+        self.progress_slider.setEnabled(False)
+        self.progress_slider.setRange(0, 0)
+        self.play_button.setIcon(QIcon("resources/icons/play.png"))
+        if lesson.video_path:
             try:
-                self.media_player.setSource(QUrl.fromLocalFile(self.lesson.video_path))
-                self.media_player.durationChanged.connect(self.update_duration)
-                self.media_player.positionChanged.connect(self.update_position)
-                self.progress_slider.sliderMoved.connect(self.set_position)
+                # Streamed through the local media server so seeking only reads what it needs
+                url = MediaServer().url_for(lesson.video_path)
+                self.release_media()
+                if url:
+                    self._media_path = lesson.video_path
+                self.media_player.setSource(QUrl(url) if url else QUrl.fromLocalFile(lesson.video_path))
+                self.video_widget.show()
+                self.video_error_label.hide()
+                self.play_button.setEnabled(True)
+                self.stop_button.setEnabled(True)
             except Exception:
                 self.handle_video_error()
         else:
             self.handle_video_error()
+        self.show_related([])
+        # One primary-key lookup of the precomputed list
+        deliver(self.db_async.get_related_lessons(lesson.id), self.show_related, owner=self, tag="related")
+        if self.progress and user_id is not None:
+            self._view = (user_id, lesson.id)
+            deliver(self.progress.load(user_id, lesson.id),
+                    lambda progress, lesson_id=lesson.id: self.resume_from(lesson_id, user_id, progress),
+                    owner=self, tag="progress")
+            
+        self.update_ui_text()
         
     def update_ui_text(self):
+        self.translations.set_language(self.current_language)
         if self.current_language == "ar":
-            self.setWindowTitle('منصة التعليم - تفاصيل الدرس')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText(self.lesson.title_ar)
-                elif widget.objectName() == "descriptionLabel":
-                    widget.setText(self.lesson.description_ar)
-                    
-            # Update buttons
-            for button in self.findChildren(QPushButton):
-                if button.text() == "Back":
-                    button.setText("رجوع")
+            self.title_label.setText(self.lesson.title_ar)
+            self.desc_label.setText(self.lesson.description_ar)
         else:
-            self.setWindowTitle('Educational Platform - Lesson Details')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText(self.lesson.title)
-                elif widget.objectName() == "descriptionLabel":
-                    widget.setText(self.lesson.description)
-                    
-            # Update buttons
-            for button in self.findChildren(QPushButton):
-                if button.text() == "رجوع":
-                    button.setText("Back")
+            self.title_label.setText(self.lesson.title)
+            self.desc_label.setText(self.lesson.description)
+        for button, summary in self.related_buttons:
+            button.setText(summary.title_ar if self.current_language == "ar" else summary.title)
+            
+    def show_related(self, summaries: List[LessonSummary]):
+        for button, _ in self.related_buttons:
+            self.related_layout.removeWidget(button)
+            button.deleteLater()
+        self.related_buttons = []
+        for summary in summaries:
+            button = QPushButton(summary.title_ar if self.current_language == "ar" else summary.title)
+            button.setObjectName("relatedLessonButton")
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            button.clicked.connect(lambda checked, lesson_id=summary.id: self.open_related(lesson_id))
+            # Before the trailing stretch
+            self.related_layout.insertWidget(self.related_layout.count() - 1, button)
+            self.related_buttons.append((button, summary))
+        self.related_section.setVisible(bool(summaries))
+        
+    def open_related(self, lesson_id: int):
+        """Show a related lesson in this window; summaries lack the video path, so fetch it whole."""
+        deliver(self.db_async.get_lesson(lesson_id),
+                lambda lesson: lesson and self.nav_manager.show_lesson_detail(
+                    lesson, self.current_language, self.user_id),
+                owner=self, tag="open_related")
             
     def toggle_playback(self):
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
@@ -235,30 +267,82 @@ class LessonDetailWindow(QMainWindow):
         else:
             self.media_player.play()
             self.play_button.setIcon(QIcon("resources/icons/pause.png"))
+            self._tracking = True
+            self._last_position = self.media_player.position()
+            
+    def stop_playback(self):
+        self._tracking = False
+        self.media_player.stop()
+        self.play_button.setIcon(QIcon("resources/icons/play.png"))
             
     def update_duration(self, duration):
         self.progress_slider.setEnabled(True)
         self.progress_slider.setRange(0, duration)
+        self.apply_resume()
         
     def update_position(self, position):
         self.progress_slider.setValue(position)
+        if self._tracking and self.progress and self.user_id is not None:
+            # Only buffered; the tracker writes it out every few seconds
+            self.progress.record(self.user_id, self.lesson.id, position, self.media_player.duration())
+            if 0 < position - self._last_position <= MAX_PLAYBACK_STEP_MS:
+                self._watched_ms += position - self._last_position
+            self._last_position = position
         
     def set_position(self, position):
         self.media_player.setPosition(position)
+        
+    def end_view(self):
+        """Log the view of the lesson being shown, if any, with the time played."""
+        if self._view is not None:
+            self.progress.log_view(*self._view, self._watched_ms)
+        self._view = None
+        self._watched_ms = 0
+        
+    def resume_from(self, lesson_id: int, user_id: int, progress: Optional[LessonProgress]):
+        if lesson_id != self.lesson.id or user_id != self.user_id:
+            return
+        # Opening a lesson counts as viewing it, even if it is never played
+        self.progress.record(user_id, lesson_id, progress.position_ms if progress else 0,
+                             progress.duration_ms if progress else 0)
+        if progress is not None:
+            self._resume_ms = progress.position_ms
+            self.apply_resume()
+        
+    def apply_resume(self):
+        """Seek to the saved position once both it and the video's duration are known."""
+        duration = self.media_player.duration()
+        if self._resume_ms is None or duration <= 0:
+            return
+        if 0 < self._resume_ms < duration - FINISHED_MARGIN_MS:
+            self.media_player.setPosition(self._resume_ms)
+            self.progress_slider.setValue(self._resume_ms)
+        self._resume_ms = None
             
     def handle_video_error(self):
-        self.video_widget.setStyleSheet("background-color: #313244;")
-        error_label = QLabel("Video not available")
-        error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        error_label.setStyleSheet("color: #f38ba8; font-size: 16px;")
-        self.video_widget.layout().addWidget(error_label)
+        self.media_player.setSource(QUrl())
+        self.release_media()
+        self.video_widget.hide()
+        self.video_error_label.show()
         self.play_button.setEnabled(False)
         self.stop_button.setEnabled(False)
         self.progress_slider.setEnabled(False)
         
     def closeEvent(self, event):
-        self.media_player.stop()
+        # The window is only hidden so it can be reused; release the file
+        self.stop_playback()
+        if self.progress:
+            self.end_view()
+            self.progress.flush()
+        self.media_player.setSource(QUrl())
+        self.release_media()
         event.accept()
+
+    def release_media(self):
+        """Let the media server forget the current video's URL."""
+        if self._media_path is not None:
+            MediaServer().release(self._media_path)
+            self._media_path = None
         
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -3,9 +3,11 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPixmap
-from src.models.database import Database, User, Lesson
+from src.models.database import Database, User, Lesson, MediaInfo
 from src.utils.navigation import NavigationManager
 from src.utils.file_manager import FileManager
+from src.utils.futures import deliver
+from typing import Optional
 import os
 
 class LessonEditWindow(QMainWindow):
@@ -15,6 +17,7 @@ class LessonEditWindow(QMainWindow):
         self.user = user
         self.lesson = lesson
         self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
         self.file_manager = FileManager()
         self.selected_video_path = lesson.video_path
         self.selected_image_path = lesson.image_path
@@ -26,52 +29,7 @@ class LessonEditWindow(QMainWindow):
     def init_ui(self):
         self.setWindowTitle('Educational Platform - Edit Lesson' if self.current_language == "en" else 'منصة التعليم - تعديل الدرس')
         self.setMinimumSize(1000, 800)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-size: 32px;
-                font-weight: bold;
-            }
-            QLineEdit, QTextEdit {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                selection-background-color: #45475a;
-            }
-            QLineEdit:focus, QTextEdit:focus {
-                border: 2px solid #89b4fa;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 12px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 10px;
-            }
-        """)
+        self.setObjectName("lessonEditWindow")
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -128,7 +86,7 @@ class LessonEditWindow(QMainWindow):
         
         self.image_preview = QLabel()
         self.image_preview.setFixedSize(200, 150)
-        self.image_preview.setStyleSheet("border: 2px solid #45475a; border-radius: 6px;")
+        self.image_preview.setObjectName("imagePreview")
         self.update_image_preview()
         
         image_button = QPushButton("Change Image" if self.current_language == "en" else "تغيير الصورة")
@@ -147,7 +105,7 @@ class LessonEditWindow(QMainWindow):
         video_layout.setContentsMargins(0, 0, 0, 0)
         
         self.video_path_label = QLabel(self.lesson.video_path)
-        self.video_path_label.setStyleSheet("color: #89b4fa;")
+        self.video_path_label.setObjectName("fileLabel")
         
         video_button = QPushButton("Change Video" if self.current_language == "en" else "تغيير الفيديو")
         video_button.clicked.connect(self.select_video)
@@ -166,18 +124,11 @@ class LessonEditWindow(QMainWindow):
         button_layout = QHBoxLayout(button_container)
         button_layout.setContentsMargins(0, 0, 0, 0)
         
-        save_button = QPushButton("Save Changes" if self.current_language == "en" else "حفظ التغييرات")
+        self.save_button = save_button = QPushButton("Save Changes" if self.current_language == "en" else "حفظ التغييرات")
         save_button.clicked.connect(self.save_lesson)
         
         cancel_button = QPushButton("Cancel" if self.current_language == "en" else "إلغاء")
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #45475a;
-            }
-            QPushButton:hover {
-                background-color: #585b70;
-            }
-        """)
+        cancel_button.setObjectName("secondaryButton")
         cancel_button.clicked.connect(self.close)
         
         button_layout.addWidget(save_button)
@@ -262,12 +213,27 @@ class LessonEditWindow(QMainWindow):
             created_at=self.lesson.created_at
         )
         
-        if self.db.update_lesson(updated_lesson):
+        # Saved on the writer thread; the button stays disabled until then
+        self.save_button.setEnabled(False)
+        if updated_lesson.video_path != self.lesson.video_path:
+            # A new video: read its duration and size first
+            deliver(self.file_manager.probe_media_in_background(updated_lesson.video_path),
+                    lambda info: self.store_lesson(updated_lesson, info), owner=self)
+        else:
+            self.store_lesson(updated_lesson)
+        
+    def store_lesson(self, lesson: Lesson, media_info: Optional[MediaInfo] = None):
+        deliver(self.db_async.update_lesson(lesson, media_info), self.lesson_saved, owner=self)
+        
+    def lesson_saved(self, updated: bool):
+        self.save_button.setEnabled(True)
+        if updated:
             QMessageBox.information(self, 
                                   "Success" if self.current_language == "en" else "نجاح", 
                                   "Lesson updated successfully" if self.current_language == "en" else "تم تحديث الدرس بنجاح")
             self.close()
             # Refresh the dashboard
+            self.nav_manager.notify_lessons_changed([self.lesson.id])
             self.nav_manager.show_dashboard(self.user)
         else:
             QMessageBox.critical(self, 
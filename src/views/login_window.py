@@ -4,7 +4,10 @@ from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 from src.models.database import Database, User
 from src.utils.navigation import NavigationManager
+from src.utils.futures import deliver
+from typing import Optional
 from src.utils.security import Security
+from src.utils.translations import TranslationCatalog
 
 class LoginWindow(QMainWindow):
     def __init__(self, db: Database):
@@ -12,89 +15,17 @@ class LoginWindow(QMainWindow):
         self.db = db
         self.current_user = None
         self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
         self.current_language = "ar"  # Set Arabic as default
+        self.translations = TranslationCatalog(self.current_language)
         self.init_ui()
         # Set initial language
         self.update_language("العربية")
         
     def init_ui(self):
-        self.setWindowTitle('Educational Platform - Login')
+        self.translations.register(self, "login.window_title", "setWindowTitle")
         self.setMinimumSize(1000, 600)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-size: 32px;
-                font-weight: bold;
-            }
-            QLineEdit {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                selection-background-color: #45475a;
-            }
-            QLineEdit:focus {
-                border: 2px solid #89b4fa;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 12px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QPushButton#linkButton {
-                background-color: transparent;
-                color: #89b4fa;
-                padding: 5px;
-                text-decoration: underline;
-            }
-            QPushButton#linkButton:hover {
-                color: #b4befe;
-            }
-            QComboBox {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QComboBox:hover {
-                border-color: #89b4fa;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-                width: 12px;
-                height: 12px;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 10px;
-            }
-        """)
+        self.setObjectName("loginWindow")
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -116,7 +47,7 @@ class LoginWindow(QMainWindow):
         # Add illustration image
         illustration_label = QLabel()
         illustration_label.setFixedSize(400, 400)
-        illustration_label.setStyleSheet("background-color: transparent;")
+        illustration_label.setObjectName("illustrationLabel")
         try:
             pixmap = QPixmap("resources/images/login_illustration.png")
             if not pixmap.isNull():
@@ -137,70 +68,60 @@ class LoginWindow(QMainWindow):
         form_layout.setContentsMargins(40, 40, 40, 40)
         
         # Title
-        title_label = QLabel("Sign In")
+        title_label = QLabel()
         title_label.setObjectName("titleLabel")
+        self.translations.register(title_label, "login.title")
         title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         form_layout.addWidget(title_label)
         
         # Subtitle
-        subtitle_label = QLabel("Welcome back! Please enter your details.")
+        subtitle_label = QLabel()
+        self.translations.register(subtitle_label, "login.subtitle")
         subtitle_label.setFont(QFont("Segoe UI", 14))
         form_layout.addWidget(subtitle_label)
         
         form_layout.addSpacing(20)
         
         # Username
-        username_label = QLabel("Username")
+        username_label = QLabel()
+        self.translations.register(username_label, "login.username")
         self.username_input = QLineEdit()
-        self.username_input.setPlaceholderText("Enter your username")
+        self.translations.register(self.username_input, "login.username_placeholder", "setPlaceholderText")
         form_layout.addWidget(username_label)
         form_layout.addWidget(self.username_input)
         
         # Password
-        password_label = QLabel("Password")
+        password_label = QLabel()
+        self.translations.register(password_label, "login.password")
         self.password_input = QLineEdit()
-        self.password_input.setPlaceholderText("Enter your password")
+        self.translations.register(self.password_input, "login.password_placeholder", "setPlaceholderText")
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
         form_layout.addWidget(password_label)
         form_layout.addWidget(self.password_input)
         
         # Language selection
-        lang_label = QLabel("Language")
+        lang_label = QLabel()
+        self.translations.register(lang_label, "login.language")
         self.lang_combo = QComboBox()
         self.lang_combo.addItems(["English", "العربية"])
         self.lang_combo.setCurrentText("العربية")  # Set Arabic as default
         self.lang_combo.currentTextChanged.connect(self.update_language)
-        self.lang_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #2d2d2d;
-                color: #ffffff;
-                border: 1px solid #3d3d3d;
-                border-radius: 4px;
-                padding: 5px;
-                min-width: 100px;
-            }
-            QComboBox:hover {
-                border-color: #4d4d4d;
-            }
-            QComboBox:focus {
-                border-color: #0078d4;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-                width: 12px;
-                height: 12px;
-            }
-        """)
+        self.lang_combo.setObjectName("languageCombo")
         form_layout.addWidget(lang_label)
         form_layout.addWidget(self.lang_combo)
         
         form_layout.addSpacing(20)
         
+        # Error message, shown by show_error
+        self.error_label = QLabel()
+        self.error_label.setObjectName("errorLabel")
+        self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.error_label.hide()
+        form_layout.addWidget(self.error_label)
+        
         # Login button
-        self.login_button = QPushButton("Sign In")
+        self.login_button = QPushButton()
+        self.translations.register(self.login_button, "login.sign_in")
         self.login_button.clicked.connect(self.handle_login)
         self.login_button.setFixedWidth(200)
         button_container = QWidget()
@@ -214,8 +135,10 @@ class LoginWindow(QMainWindow):
         register_layout = QHBoxLayout(register_container)
         register_layout.setContentsMargins(0, 0, 0, 0)
         
-        no_account_label = QLabel("Don't have an account?")
-        register_button = QPushButton("Sign Up")
+        no_account_label = QLabel()
+        self.translations.register(no_account_label, "login.no_account")
+        register_button = QPushButton()
+        self.translations.register(register_button, "login.sign_up")
         register_button.setObjectName("linkButton")
         register_button.clicked.connect(self.nav_manager.show_registration)
         
@@ -234,90 +157,38 @@ class LoginWindow(QMainWindow):
         
     def update_language(self, lang: str):
         self.current_language = "ar" if lang == "العربية" else "en"
-        
-        if self.current_language == "ar":
-            self.setWindowTitle('منصة التعليم - تسجيل الدخول')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText("تسجيل الدخول")
-                elif widget.text() == "Welcome back! Please enter your details.":
-                    widget.setText("مرحباً بعودتك! الرجاء إدخال بياناتك.")
-                elif widget.text() == "Username":
-                    widget.setText("اسم المستخدم")
-                elif widget.text() == "Password":
-                    widget.setText("كلمة المرور")
-                elif widget.text() == "Language":
-                    widget.setText("اللغة")
-                elif widget.text() == "Don't have an account?":
-                    widget.setText("ليس لديك حساب؟")
-                    
-            # Update input placeholders
-            self.username_input.setPlaceholderText("أدخل اسم المستخدم")
-            self.password_input.setPlaceholderText("أدخل كلمة المرور")
-            
-            # Update buttons
-            self.login_button.setText("تسجيل الدخول")
-            for button in self.findChildren(QPushButton):
-                if button.objectName() == "linkButton":
-                    button.setText("إنشاء حساب")
-        else:
-            self.setWindowTitle('Educational Platform - Login')
-            # Update all text elements
-            for widget in self.findChildren(QLabel):
-                if widget.objectName() == "titleLabel":
-                    widget.setText("Sign In")
-                elif widget.text() == "مرحباً بعودتك! الرجاء إدخال بياناتك.":
-                    widget.setText("Welcome back! Please enter your details.")
-                elif widget.text() == "اسم المستخدم":
-                    widget.setText("Username")
-                elif widget.text() == "كلمة المرور":
-                    widget.setText("Password")
-                elif widget.text() == "اللغة":
-                    widget.setText("Language")
-                elif widget.text() == "ليس لديك حساب؟":
-                    widget.setText("Don't have an account?")
-                    
-            # Update input placeholders
-            self.username_input.setPlaceholderText("Enter your username")
-            self.password_input.setPlaceholderText("Enter your password")
-            
-            # Update buttons
-            self.login_button.setText("Sign In")
-            for button in self.findChildren(QPushButton):
-                if button.objectName() == "linkButton":
-                    button.setText("Sign Up")
+        self.translations.set_language(self.current_language)
                 
         # Update user's language preference if logged in
         if self.current_user:
-            self.db.update_user_language(self.current_user.id, self.current_language)
+            self.db_async.update_user_language(self.current_user.id, self.current_language)
+        
+    def refresh(self):
+        """Reset the form when navigation brings the cached window back."""
+        self.current_user = None
+        self.password_input.clear()
+        self.error_label.hide()
         
     def handle_login(self):
         username = self.username_input.text()
         password = self.password_input.text()
         
         if not username or not password:
-            self.show_error("يجب ملء جميع الحقول" if self.lang_combo.currentText() == "العربية" else "Please fill in all fields")
+            self.show_error("login.fill_all_fields")
             return
             
-        user = self.db.verify_user(username, password)
+        self.login_button.setEnabled(False)
+        deliver(self.db_async.verify_user(username, password), self.login_finished, owner=self, tag="login")
+        
+    def login_finished(self, user: Optional[User]):
+        self.login_button.setEnabled(True)
         if user:
             self.current_user = user
             self.nav_manager.show_dashboard(user)
         else:
-            self.show_error("اسم المستخدم أو كلمة المرور غير صحيحة" if self.lang_combo.currentText() == "العربية" else "Invalid username or password")
+            self.show_error("login.invalid_credentials")
             
-    def show_error(self, message: str):
-        error_label = QLabel(message)
-        error_label.setStyleSheet("color: #f38ba8; font-size: 14px;")
-        error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Find and remove any existing error label
-        for widget in self.findChildren(QLabel):
-            if widget.styleSheet().startswith("color: #f38ba8"):
-                widget.deleteLater()
-                
-        # Add the new error label to the form layout
-        form_frame = self.findChild(QFrame)
-        if form_frame:
-            form_frame.layout().insertWidget(form_frame.layout().count() - 2, error_label) 
\ No newline at end of file
+    def show_error(self, key: str):
+        """Show a catalog message in the error label; it follows language switches."""
+        self.translations.register(self.error_label, key)
+        self.error_label.show()
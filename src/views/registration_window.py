@@ -4,6 +4,8 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 from src.models.database import Database, User
 from src.utils.navigation import NavigationManager
+from src.utils.futures import deliver
+from typing import Optional
 from src.utils.security import Security
 
 class RegistrationWindow(QMainWindow):
@@ -11,6 +13,7 @@ class RegistrationWindow(QMainWindow):
         super().__init__()
         self.db = db
         self.nav_manager = NavigationManager()
+        self.db_async = self.nav_manager.get_async_database()
         self.current_language = "ar"  # Set Arabic as default
         self.init_ui()
         # Set initial language
@@ -19,81 +22,7 @@ class RegistrationWindow(QMainWindow):
     def init_ui(self):
         self.setWindowTitle('Educational Platform - Registration')
         self.setMinimumSize(1000, 600)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e2e;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-size: 14px;
-            }
-            QLabel#titleLabel {
-                color: #89b4fa;
-                font-size: 32px;
-                font-weight: bold;
-            }
-            QLineEdit {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                selection-background-color: #45475a;
-            }
-            QLineEdit:focus {
-                border: 2px solid #89b4fa;
-            }
-            QPushButton {
-                background-color: #89b4fa;
-                color: #1e1e2e;
-                border: none;
-                padding: 12px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #b4befe;
-            }
-            QPushButton:pressed {
-                background-color: #74c7ec;
-            }
-            QPushButton#linkButton {
-                background-color: transparent;
-                color: #89b4fa;
-                padding: 5px;
-                text-decoration: underline;
-            }
-            QPushButton#linkButton:hover {
-                color: #b4befe;
-            }
-            QComboBox {
-                padding: 12px;
-                border: 2px solid #313244;
-                border-radius: 6px;
-                background-color: #313244;
-                color: #cdd6f4;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QComboBox:hover {
-                border-color: #89b4fa;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-                width: 12px;
-                height: 12px;
-            }
-            QFrame {
-                background-color: #313244;
-                border-radius: 10px;
-            }
-        """)
+        self.setObjectName("registrationWindow")
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -115,7 +44,7 @@ class RegistrationWindow(QMainWindow):
         # Add illustration image
         illustration_label = QLabel()
         illustration_label.setFixedSize(400, 400)
-        illustration_label.setStyleSheet("background-color: transparent;")
+        illustration_label.setObjectName("illustrationLabel")
         try:
             pixmap = QPixmap("resources/images/register_illustration.png")
             if not pixmap.isNull():
@@ -177,35 +106,19 @@ class RegistrationWindow(QMainWindow):
         self.lang_combo.addItems(["English", "العربية"])
         self.lang_combo.setCurrentText("العربية")  # Set Arabic as default
         self.lang_combo.currentTextChanged.connect(self.update_language)
-        self.lang_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #2d2d2d;
-                color: #ffffff;
-                border: 1px solid #3d3d3d;
-                border-radius: 4px;
-                padding: 5px;
-                min-width: 100px;
-            }
-            QComboBox:hover {
-                border-color: #4d4d4d;
-            }
-            QComboBox:focus {
-                border-color: #0078d4;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown.png);
-                width: 12px;
-                height: 12px;
-            }
-        """)
+        self.lang_combo.setObjectName("languageCombo")
         form_layout.addWidget(self.lang_label)
         form_layout.addWidget(self.lang_combo)
         
         form_layout.addSpacing(20)
         
+        # Error message, shown by show_error
+        self.error_label = QLabel()
+        self.error_label.setObjectName("errorLabel")
+        self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.error_label.hide()
+        form_layout.addWidget(self.error_label)
+        
         # Register button
         self.register_button = QPushButton("Create Account")
         self.register_button.clicked.connect(self.handle_register)
@@ -271,6 +184,13 @@ class RegistrationWindow(QMainWindow):
             self.have_account_label.setText("Already have an account?")
             self.login_button.setText("Sign In")
             
+    def refresh(self):
+        """Reset the form when navigation brings the cached window back."""
+        self.username_input.clear()
+        self.password_input.clear()
+        self.confirm_password_input.clear()
+        self.error_label.hide()
+            
     def handle_register(self):
         username = self.username_input.text().strip()
         password = self.password_input.text().strip()
@@ -285,29 +205,19 @@ class RegistrationWindow(QMainWindow):
             self.show_error("Passwords do not match" if self.current_language == "en" else "كلمات المرور غير متطابقة")
             return
             
-        # Check if username exists
-        if self.db.get_user_by_username(username):
-            self.show_error("Username already exists" if self.current_language == "en" else "اسم المستخدم موجود بالفعل")
-            return
-            
-        # Create user with selected language
-        user = self.db.add_user(username, password, "student", self.current_language)
+        # Create the user with the selected language on the writer thread. add_user
+        # checks the username itself (a catalog server only lets admins look users up)
+        self.register_button.setEnabled(False)
+        deliver(self.db_async.add_user(username, password, "student", self.current_language),
+                self.registration_finished, owner=self)
+        
+    def registration_finished(self, user: Optional[User]):
+        self.register_button.setEnabled(True)
         if user:
             self.nav_manager.show_login()
         else:
-            self.show_error("Failed to create account" if self.current_language == "en" else "فشل إنشاء الحساب")
+            self.show_error("Username already exists" if self.current_language == "en" else "اسم المستخدم موجود بالفعل")
             
     def show_error(self, message: str):
-        error_label = QLabel(message)
-        error_label.setStyleSheet("color: #f38ba8; font-size: 14px;")
-        error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Find and remove any existing error label
-        for widget in self.findChildren(QLabel):
-            if widget.styleSheet().startswith("color: #f38ba8"):
-                widget.deleteLater()
-                
-        # Add the new error label to the form layout
-        form_frame = self.findChild(QFrame)
-        if form_frame:
-            form_frame.layout().insertWidget(form_frame.layout().count() - 2, error_label) 
\ No newline at end of file
+        self.error_label.setText(message)
+        self.error_label.show()